@@ -0,0 +1,94 @@
+import inspect
+import time
+from functools import wraps
+
+from wiederverwendbar.before_after_wrap import WrappedClass, wrap
+
+CALLS = 200000
+REPEATS = 3
+
+
+def legacy_wrap(func, before_methods, after_methods):
+    """
+    before_after_wrap wrapper before the precompiled call plans, binds every signature on every call, for comparison.
+    """
+
+    signatures = {method: inspect.signature(method) for method in [func, *before_methods, *after_methods]}
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        kwargs["__ba_before_result__"] = None
+        kwargs["__ba_result__"] = None
+        kwargs["__ba_after_result__"] = None
+
+        def bind(s: inspect.Signature) -> dict:
+            for key in ("__ba_before_result__", "__ba_result__", "__ba_after_result__"):
+                if key in kwargs and key not in s.parameters:
+                    del kwargs[key]
+            return s.bind(*args, **kwargs).arguments
+
+        for bm in before_methods:
+            kwargs["__ba_before_result__"] = bm(**bind(signatures[bm]))
+        result = func(**bind(signatures[func]))
+        kwargs["__ba_result__"] = result
+        for am in after_methods:
+            kwargs["__ba_after_result__"] = am(**bind(signatures[am]))
+        return result
+
+    return wrapper
+
+
+class Plain:
+    def before(self, value):
+        ...
+
+    def method(self, value):
+        return value
+
+    def after(self, value, __ba_result__):
+        ...
+
+
+class Wrapped(metaclass=WrappedClass):
+    def before(self, value):
+        ...
+
+    @wrap(before=before, after="after")
+    def method(self, value):
+        return value
+
+    def after(self, value, __ba_result__):
+        ...
+
+
+class Legacy(Plain):
+    method = legacy_wrap(Plain.method, [Plain.before], [Plain.after])
+
+
+class HandWritten(Plain):
+    def method(self, value):
+        self.before(value)
+        result = super().method(value)
+        self.after(value, __ba_result__=result)
+        return result
+
+
+def measure(obj) -> float:
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for i in range(CALLS):
+            obj.method(i)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return CALLS / best
+
+
+if __name__ == '__main__':
+    print(f"{'method':<26} {'calls/s':>12}")
+    for name, obj in {"plain, no hooks": Plain(),
+                      "hand written hooks": HandWritten(),
+                      "wrap": Wrapped(),
+                      "legacy wrap": Legacy()}.items():
+        print(f"{name:<26} {measure(obj):>12.0f}")
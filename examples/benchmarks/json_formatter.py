@@ -0,0 +1,38 @@
+import logging
+import time
+
+from wiederverwendbar.logger.formatters import JSON_FIELDS, JsonFormatter
+from wiederverwendbar.logger.formatters.json_formatter import orjson, msgspec
+
+RECORDS = 200000
+REPEATS = 3
+
+
+def measure(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return len(records) / best
+
+
+if __name__ == '__main__':
+    logger = logging.getLogger("benchmark.json_formatter")
+    plain_records = [logger.makeRecord(logger.name, logging.INFO, __file__, 1, "Processed item %d", (i,), None, "main")
+                     for i in range(RECORDS)]
+    extra_records = [logger.makeRecord(logger.name, logging.INFO, __file__, 1, "Processed item %d", (i,), None, "main", extra={"item": i})
+                     for i in range(RECORDS)]
+    formatters = {"text": logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"),
+                  "json (json)": JsonFormatter(encoder="json")}
+    if orjson is not None:
+        formatters["json (orjson)"] = JsonFormatter(encoder="orjson")
+    if msgspec is not None:
+        formatters["json (msgspec)"] = JsonFormatter(encoder="msgspec")
+    formatters["json, all fields"] = JsonFormatter(fields=list(JSON_FIELDS))
+    print(f"{'formatter':<20} {'records/s':>12} {'records/s (extra)':>18}")
+    for name, formatter in formatters.items():
+        print(f"{name:<20} {measure(formatter, plain_records):>12.0f} {measure(formatter, extra_records):>18.0f}")
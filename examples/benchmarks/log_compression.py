@@ -0,0 +1,45 @@
+import logging
+import time
+
+from bson import encode
+
+from wiederverwendbar.mongoengine import MongoengineLogFormatter, encode_log_entries, decode_log_entries
+from wiederverwendbar.mongoengine.logger.codec import zstd
+
+BATCH_SIZE = 100
+ROUNDS = 200
+
+
+def create_entries() -> list[dict]:
+    formatter = MongoengineLogFormatter()
+    logger = logging.getLogger("benchmark.log_compression")
+    entries = []
+    for i in range(BATCH_SIZE):
+        record = logger.makeRecord(logger.name, logging.INFO, __file__, i, "Processed item %d of %d", (i, BATCH_SIZE), None, "create_entries")
+        entries.append(formatter.format(record))
+    return entries
+
+
+def measure(compression: str, entries: list[dict]) -> tuple[float, float, float]:
+    blob = encode_log_entries(entries, compression=compression)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        blob = encode_log_entries(entries, compression=compression)
+    encode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decode_log_entries(blob)
+    decode_time = time.perf_counter() - start
+    return len(blob) / len(entries), ROUNDS * len(entries) / encode_time, ROUNDS * len(entries) / decode_time
+
+
+if __name__ == '__main__':
+    entries = create_entries()
+    print(f"plain BSON entries: {len(encode({'entries': entries})) / len(entries):.1f} bytes/entry")
+    print(f"{'codec':<6} {'bytes/entry':>12} {'encode entries/s':>17} {'decode entries/s':>17}")
+    for compression in ("none", "zlib", "lzma", "zstd"):
+        if compression == "zstd" and zstd is None:
+            print(f"{compression:<6} not available")
+            continue
+        bytes_per_entry, encode_rate, decode_rate = measure(compression, entries)
+        print(f"{compression:<6} {bytes_per_entry:>12.1f} {encode_rate:>17.0f} {decode_rate:>17.0f}")
@@ -0,0 +1,42 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from wiederverwendbar.logger import LoggingContext
+
+RECORDS = 20000
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def measure(logger: logging.Logger) -> float:
+    start = time.perf_counter()
+    for i in range(RECORDS):
+        logger.debug("Record %d", i)
+    return RECORDS / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    logger = logging.getLogger("benchmark.logging_context")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(CountingHandler())
+
+    print(f"{'contexts':<9} {'records/s':>12}")
+    print(f"{0:<9} {measure(logger):>12.0f}")
+    for depth in range(1, 6):
+        with ExitStack() as stack:
+            for i in range(depth):
+                context_logger = logging.getLogger(f"benchmark.logging_context.context_{i}")
+                context_logger.setLevel(logging.DEBUG)
+                context_logger.propagate = False
+                context_logger.addHandler(CountingHandler())
+                stack.enter_context(LoggingContext(context_logger, handle_origin_logger=False))
+            print(f"{depth:<9} {measure(logger):>12.0f}")
@@ -0,0 +1,156 @@
+import logging
+import os
+import tempfile
+import time
+from contextlib import ExitStack, redirect_stdout
+from pathlib import Path
+from typing import Callable, Optional
+
+from wiederverwendbar.console import OutFiles
+from wiederverwendbar.logger import (LoggingContext,
+                                     RichConsoleHandler,
+                                     StreamConsoleHandler,
+                                     TarRotatingFileHandler,
+                                     BufferedFileHandler,
+                                     redirect_level)
+
+RECORDS = 20000
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def new_logger(name: str, *handlers: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"benchmark.logging_suite.{name}")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for handler in handlers:
+        logger.addHandler(handler)
+    return logger
+
+
+def measure(name: str, log: Callable[[int], None], records: int = RECORDS, finish: Optional[Callable[[], None]] = None) -> str:
+    """
+    Measure the latency of every log call and return a line with records/s and latency percentiles in microseconds.
+    The records/s include the finish call, for example waiting for a writer thread.
+    """
+
+    latencies = [0] * records
+    perf_counter_ns = time.perf_counter_ns
+    start = perf_counter_ns()
+    for i in range(records):
+        call_start = perf_counter_ns()
+        log(i)
+        latencies[i] = perf_counter_ns() - call_start
+    if finish is not None:
+        finish()
+    duration = (perf_counter_ns() - start) / 1e9
+    latencies.sort()
+    percentiles = [latencies[min(int(records * percentile / 100), records - 1)] / 1000 for percentile in PERCENTILES]
+    return f"{name:<44} {records / duration:>10.0f} " + " ".join(f"{value:>9.1f}" for value in percentiles) + f" {latencies[-1] / 1000:>9.1f}"
+
+
+def print_header(title: str) -> None:
+    print()
+    print(title)
+    print(f"{'':<44} {'records/s':>10} " + " ".join(f"{'p' + str(percentile):>9}" for percentile in PERCENTILES) + f" {'max':>9}")
+
+
+def bench_console() -> None:
+    print_header("Logger console handlers (latency in us, output to devnull)")
+    handlers = {"StreamConsoleHandler": lambda: StreamConsoleHandler(name="stream", console_outfile=OutFiles.STDOUT)}
+    if RichConsoleHandler is not None:
+        handlers["RichConsoleHandler"] = lambda: RichConsoleHandler(name="rich", console_outfile=OutFiles.STDOUT, console_width=120)
+    for name, create in handlers.items():
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            handler = create()
+            handler.setFormatter(logging.Formatter("%(name)s - %(message)s"))
+            logger = new_logger(name, handler)
+            result = measure(name, lambda i: logger.info("Processed item %d", i), records=RECORDS // 4)
+            handler.close()
+        print(result)
+
+
+def bench_file() -> None:
+    print_header("File handlers with rotation every 256 KiB (latency in us)")
+    directory = Path(tempfile.mkdtemp(prefix="logging_suite_"))
+    variants = {"TarRotatingFileHandler (foreground archive)": lambda path: TarRotatingFileHandler(name="tar", filename=path, max_bytes=256 * 1024, backup_count=3,
+                                                                                                   archive_backup_count=100, archive_in_background=False),
+                "TarRotatingFileHandler (background archive)": lambda path: TarRotatingFileHandler(name="tar", filename=path, max_bytes=256 * 1024, backup_count=3,
+                                                                                                   archive_backup_count=100, archive_in_background=True),
+                "BufferedFileHandler": lambda path: BufferedFileHandler(name="buffered", filename=path, max_bytes=256 * 1024, backup_count=3,
+                                                                        archive_backup_count=100)}
+    for index, (name, create) in enumerate(variants.items()):
+        handler = create(directory / f"file_{index}.log")
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        logger = new_logger(f"file_{index}", handler)
+        print(measure(name, lambda i: logger.info("Processed item %d", i), records=RECORDS * 5, finish=handler.flush))
+        handler.close()
+
+
+def bench_logging_context() -> None:
+    print_header("LoggingContext nesting depth (latency in us)")
+    logger = new_logger("context", CountingHandler())
+    print(measure("depth 0", lambda i: logger.debug("Record %d", i)))
+    for depth in range(1, 6):
+        with ExitStack() as stack:
+            for i in range(depth):
+                context_logger = new_logger(f"context.context_{i}", CountingHandler())
+                stack.enter_context(LoggingContext(context_logger, handle_origin_logger=False))
+            print(measure(f"depth {depth}", lambda i: logger.debug("Record %d", i)))
+
+
+def bench_redirect_level() -> None:
+    print_header("redirect_level (latency in us)")
+    plain_logger = new_logger("plain", CountingHandler())
+    print(measure("plain", lambda i: plain_logger.info("Record %d", i)))
+    redirected_logger = new_logger("redirected", CountingHandler())
+    redirect_level(redirected_logger, logging.DEBUG, lte=logging.INFO)
+    print(measure("redirect_level INFO -> DEBUG", lambda i: redirected_logger.info("Record %d", i)))
+
+
+def bench_mongoengine() -> None:
+    print_header("MongoengineLogHandler against mongomock (latency in us)")
+    try:
+        import mongomock
+        from mongoengine import connect, disconnect, StringField
+        from wiederverwendbar.mongoengine import MongoengineLogHandler, MongoengineLogDocument
+    except ModuleNotFoundError as e:
+        print(f"skipped, {e.name} is not installed")
+        return
+
+    connect("logging_suite", alias="default", mongo_client_class=mongomock.MongoClient)
+
+    class BenchmarkLogDocument(MongoengineLogDocument):
+        meta = {"collection": "benchmark.log"}
+        benchmark = StringField(required=True)
+
+    variants = {"synchronous, buffer 1": dict(buffer_size=1),
+                "synchronous, buffer 100": dict(buffer_size=100),
+                "asynchronous, buffer 100": dict(buffer_size=100, asynchronous=True),
+                "asynchronous, bucketed": dict(buffer_size=100, asynchronous=True, bucket_max_entries=1000),
+                "asynchronous, zlib": dict(buffer_size=100, asynchronous=True, compression="zlib")}
+    for index, (name, kwargs) in enumerate(variants.items()):
+        BenchmarkLogDocument.objects.delete()
+        handler = MongoengineLogHandler(document=BenchmarkLogDocument, document_kwargs={"benchmark": name}, **kwargs)
+        logger = new_logger(f"mongoengine_{index}", handler)
+        print(measure(name, lambda i: logger.info("Processed item %d", i), records=RECORDS // 4, finish=handler.flush))
+        handler.close()
+    disconnect()
+
+
+if __name__ == '__main__':
+    bench_console()
+    bench_file()
+    bench_logging_context()
+    bench_redirect_level()
+    bench_mongoengine()
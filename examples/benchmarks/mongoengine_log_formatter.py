@@ -0,0 +1,70 @@
+import logging
+import time
+
+from wiederverwendbar.mongoengine import MongoengineLogFormatter
+
+RECORDS = 200000
+REPEATS = 3
+
+
+class LegacyMongoengineLogFormatter(logging.Formatter):
+    """
+    MongoengineLogFormatter before the precompiled field plan, for comparison.
+    """
+
+    DEFAULT_PROPERTIES = logging.LogRecord('', 0, '', 0, '', (), (None, None, None), '').__dict__.keys()
+
+    def format(self, record) -> dict:
+        entry = {
+            'timestamp': record.created,
+            'level': record.levelname,
+            'thread': record.thread,
+            'thread_name': record.threadName,
+            'message': record.getMessage(),
+            'logger_name': record.name,
+            'file_name': record.pathname,
+            'module': record.module,
+            'method': record.funcName,
+            'line_number': record.lineno
+        }
+        if record.exc_info is not None:
+            entry.update({
+                'exception': {
+                    'message': str(record.exc_info[1]),
+                    'code': 0,
+                    'stack_trace': self.formatException(record.exc_info)
+                }
+            })
+        if len(self.DEFAULT_PROPERTIES) != len(record.__dict__):
+            contextual_extra = set(record.__dict__).difference(set(self.DEFAULT_PROPERTIES))
+            if contextual_extra:
+                for key in contextual_extra:
+                    entry[key] = record.__dict__[key]
+        return entry
+
+
+def measure(formatter: logging.Formatter, records: list[logging.LogRecord]) -> float:
+    best = None
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return len(records) / best
+
+
+if __name__ == '__main__':
+    logger = logging.getLogger("benchmark.mongoengine_log_formatter")
+    plain_records = [logger.makeRecord(logger.name, logging.INFO, __file__, 1, "Processed item %d", (i,), None, "main")
+                     for i in range(RECORDS)]
+    extra_records = [logger.makeRecord(logger.name, logging.INFO, __file__, 1, "Processed item %d", (i,), None, "main", extra={"item": i})
+                     for i in range(RECORDS)]
+    formatters = {"legacy": LegacyMongoengineLogFormatter(),
+                  "default": MongoengineLogFormatter(),
+                  "interning": MongoengineLogFormatter(intern_strings=True),
+                  "message, level, timestamp": MongoengineLogFormatter(fields=["timestamp", "level", "message"])}
+    print(f"{'formatter':<26} {'records/s':>12} {'records/s (extra)':>18}")
+    for name, formatter in formatters.items():
+        print(f"{name:<26} {measure(formatter, plain_records):>12.0f} {measure(formatter, extra_records):>18.0f}")
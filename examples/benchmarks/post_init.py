@@ -0,0 +1,41 @@
+import time
+
+from wiederverwendbar.post_init import PostInit
+
+INSTANCES = 100000
+BATCH = 10000
+# the last batch may be this much slower than the first one, for timer noise
+MAX_SLOWDOWN = 2.0
+
+
+class Parent(PostInit):
+    def __init__(self, value: int):
+        super().__init__()
+        self.value = value
+
+    def __post_init__(self):
+        self.post_init_count = getattr(self, "post_init_count", 0) + 1
+
+
+class Child(Parent):
+    def __init__(self, value: int):
+        super().__init__(value)
+        self.child_value = value
+
+
+if __name__ == '__main__':
+    print(f"{'instances':<12} {'instances/s':>12}")
+    batch_durations = []
+    for batch_start in range(0, INSTANCES, BATCH):
+        start = time.perf_counter()
+        for i in range(batch_start, batch_start + BATCH):
+            instance = Child(i)
+            # __post_init__ runs exactly once per instance
+            assert instance.post_init_count == 1
+        batch_durations.append(time.perf_counter() - start)
+        print(f"{batch_start + BATCH:<12} {BATCH / batch_durations[-1]:>12.0f}")
+
+    # cost per instance stays constant, it doesn't grow with the number of created instances
+    slowdown = batch_durations[-1] / batch_durations[0]
+    assert slowdown < MAX_SLOWDOWN, f"Last batch is {slowdown:.1f} times slower than the first one."
+    print(f"slowdown of the last batch: {slowdown:.2f}")
@@ -1,5 +1,4 @@
 import asyncio
-import inspect
 import json
 import logging
 import string
@@ -125,7 +124,7 @@ class FormCommand(_SubLoggerCommand):
     def get_logger(cls, logger: Union["ActionLogger", "ActionSubLogger", logging.Logger]) -> Union["ActionLogger", "ActionSubLogger"]:
         if isinstance(logger, ActionLogger) or isinstance(logger, ActionSubLogger):
             return logger
-        action_sub_loggers = ActionSubLoggerContext.get_from_stack(inspect.stack())
+        action_sub_loggers = ActionSubLoggerContext.get_active()
         action_sub_logger_context: Optional[ActionSubLoggerContext] = None
         for action_sub_logger_context in action_sub_loggers:
             if isinstance(action_sub_logger_context, ActionSubLoggerContext):
@@ -526,7 +525,7 @@ class ActionSubLogger(logging.Logger):
                 self._error_occurred = not success
                 self._finalize_msg = values["on_success_msg"] if success else values["on_error_msg"]
                 self._finalize_msg_simple = values["on_error_msg_simple"]
-                contexts = ActionSubLoggerContext.get_from_stack(inspect.stack())
+                contexts = ActionSubLoggerContext.get_active()
                 current_context: Union[None, ActionSubLoggerContext, LoggingContext] = None
                 if len(contexts) > 0:
                     current_context = contexts[-1]
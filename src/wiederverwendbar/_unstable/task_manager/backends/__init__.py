@@ -0,0 +1,14 @@
+from wiederverwendbar._unstable.task_manager.backends.base import (LOG_OWNER_ANNOTATION,
+                                                                  BackendDoesNotExist,
+                                                                  BackendValidationError,
+                                                                  BaseBackend,
+                                                                  BackendLogHandler,
+                                                                  BackendLogStreamer,
+                                                                  backend_log_stream_print)
+from wiederverwendbar._unstable.task_manager.backends.memory import (MemoryBackend)
+from wiederverwendbar._unstable.task_manager.backends.sqlite import (SqliteBackend)
+
+try:
+    from wiederverwendbar._unstable.task_manager.backends.mongoengine import (MongoengineBackend)
+except ModuleNotFoundError:
+    MongoengineBackend = None
@@ -0,0 +1,422 @@
+import logging as _logging
+import threading as _threading
+import time as _time
+from abc import ABC as _ABC, abstractmethod as _abstractmethod
+from collections import deque as _deque
+from datetime import datetime as _datetime
+from typing import Any as _Any, Literal as _Literal, Optional as _Optional
+
+from wiederverwendbar.functions.datetime import local_now as _local_now
+
+LOG_OWNER_ANNOTATION = _Literal["worker", "task"]
+
+
+class BackendDoesNotExist(LookupError):
+    """
+    Exception raised if a requested worker or task does not exist in the backend.
+    """
+
+    ...
+
+
+class BackendValidationError(ValueError):
+    """
+    Exception raised if a value can't be stored by the backend.
+    """
+
+    ...
+
+
+class BaseBackend(_ABC):
+    """
+    Storage backend of the task manager.
+
+    Workers and tasks are exchanged as plain dicts (records). References to other records are stored as ids.
+
+    Worker record keys: id, name, manager, state, started_at, last_seen, delay, current_task, signals
+    Task record keys: id, name, manager, state, worker, log_level, created_at, due_at, started_at, ended_at, params, result
+
+    Backends may keep additional keys in a record, for example to load a stored result lazily with load_result.
+    """
+
+    # --- worker ---
+
+    @_abstractmethod
+    def get_worker(self, worker_id: _Any) -> dict[str, _Any]:
+        """
+        Get a worker record.
+
+        :param worker_id: ID of the worker.
+        :return: Worker record.
+        """
+
+        ...
+
+    @_abstractmethod
+    def find_worker(self, manager: str, name: str) -> _Optional[dict[str, _Any]]:
+        """
+        Find a worker record by manager and name.
+
+        :param manager: Name of the manager.
+        :param name: Name of the worker.
+        :return: Worker record or None if not found.
+        """
+
+        ...
+
+    @_abstractmethod
+    def create_worker(self, **fields) -> _Any:
+        """
+        Create a worker record.
+
+        :param fields: Fields of the worker record.
+        :return: ID of the created worker.
+        """
+
+        ...
+
+    @_abstractmethod
+    def update_worker(self, worker_id: _Any, **fields) -> None:
+        """
+        Update fields of a worker record.
+
+        :param worker_id: ID of the worker.
+        :param fields: Fields to update.
+        :return: None
+        """
+
+        ...
+
+    # --- task ---
+
+    @_abstractmethod
+    def get_task(self, task_id: _Any) -> dict[str, _Any]:
+        """
+        Get a task record.
+
+        :param task_id: ID of the task.
+        :return: Task record.
+        """
+
+        ...
+
+    @_abstractmethod
+    def create_task(self, **fields) -> _Any:
+        """
+        Create a task record.
+
+        :param fields: Fields of the task record.
+        :return: ID of the created task.
+        """
+
+        ...
+
+    @_abstractmethod
+    def update_task(self, task_id: _Any, **fields) -> None:
+        """
+        Update fields of a task record.
+
+        :param task_id: ID of the task.
+        :param fields: Fields to update.
+        :return: None
+        """
+
+        ...
+
+    def load_result(self, record: dict[str, _Any]) -> _Optional[dict[str, _Any]]:
+        """
+        Load the result of a task record.
+
+        :param record: Task record.
+        :return: Task result.
+        """
+
+        return record["result"]
+
+    @_abstractmethod
+    def claim_task(self, manager: str, worker_id: _Any, now: _datetime, task_id: _Optional[_Any] = None) -> _Optional[dict[str, _Any]]:
+        """
+        Atomically claim the next due task of a manager for a worker.
+        The claimed task is set to running, assigned to the worker and its start time is set to now.
+
+        :param manager: Name of the manager.
+        :param worker_id: ID of the claiming worker.
+        :param now: Current time.
+        :param task_id: Claim only this task, regardless of its due time.
+        :return: Claimed task record or None if no task is due or the given task was already claimed.
+        """
+
+        ...
+
+    @_abstractmethod
+    def cancel_worker_tasks(self, worker_id: _Any, ended_at: _datetime, result: dict[str, _Any]) -> list[str]:
+        """
+        Cancel all running tasks of a worker.
+
+        :param worker_id: ID of the worker.
+        :param ended_at: End time of the canceled tasks.
+        :param result: Result of the canceled tasks.
+        :return: Names of the canceled tasks.
+        """
+
+        ...
+
+    # --- log ---
+
+    @_abstractmethod
+    def push_log(self, owner_type: LOG_OWNER_ANNOTATION, owner_id: _Any, timestamp: _datetime, entries: list[dict[str, _Any]]) -> None:
+        """
+        Store a batch of log entries.
+
+        :param owner_type: Type of the log owner.
+        :param owner_id: ID of the log owner.
+        :param timestamp: Timestamp of the batch.
+        :param entries: Log entries.
+        :return: None
+        """
+
+        ...
+
+    @_abstractmethod
+    def fetch_log(self, owner_type: LOG_OWNER_ANNOTATION, owner_id: _Any, begin: _datetime, after: _Optional[_Any] = None) -> list[tuple[_Any, list[dict[str, _Any]]]]:
+        """
+        Fetch batches of log entries in insertion order.
+
+        :param owner_type: Type of the log owner.
+        :param owner_id: ID of the log owner.
+        :param begin: Only batches with a timestamp after begin are returned.
+        :param after: Only batches after this batch ID are returned.
+        :return: List of (batch ID, entries).
+        """
+
+        ...
+
+    def create_log_handler(self,
+                           owner_type: LOG_OWNER_ANNOTATION,
+                           owner_id: _Any,
+                           buffer_size: _Optional[int] = None,
+                           buffer_periodical_flush_timing: _Optional[float] = None) -> _logging.Handler:
+        """
+        Create a log handler which stores log records for the given owner.
+
+        :param owner_type: Type of the log owner.
+        :param owner_id: ID of the log owner.
+        :param buffer_size: Maximum number of buffered records.
+        :param buffer_periodical_flush_timing: Maximum time in seconds a record is buffered.
+        :return: Log handler.
+        """
+
+        return BackendLogHandler(backend=self,
+                                 owner_type=owner_type,
+                                 owner_id=owner_id,
+                                 buffer_size=buffer_size,
+                                 buffer_periodical_flush_timing=buffer_periodical_flush_timing)
+
+    def create_log_streamer(self,
+                            owner_type: LOG_OWNER_ANNOTATION,
+                            owner_id: _Any,
+                            to: _Optional[callable] = None,
+                            name: _Optional[str] = None,
+                            begin: _Optional[_datetime] = None,
+                            stream_rate: _Optional[float] = None) -> _threading.Thread:
+        """
+        Create a log streamer for the given owner.
+
+        :param owner_type: Type of the log owner.
+        :param owner_id: ID of the log owner.
+        :param to: Callable which receives every streamed entry.
+        :param name: Name of the streamer thread.
+        :param begin: Stream entries after this time.
+        :param stream_rate: Time in seconds between two fetches.
+        :return: Log streamer thread.
+        """
+
+        return BackendLogStreamer(backend=self,
+                                  owner_type=owner_type,
+                                  owner_id=owner_id,
+                                  to=to,
+                                  name=name,
+                                  begin=begin,
+                                  stream_rate=stream_rate)
+
+    @classmethod
+    def dump_id(cls, record_id: _Any) -> _Any:
+        """
+        Convert a record ID into a JSON serializable value.
+
+        :param record_id: Record ID.
+        :return: JSON serializable value.
+        """
+
+        return record_id
+
+    @classmethod
+    def load_id(cls, value: _Any) -> _Any:
+        """
+        Convert a value created by dump_id back into a record ID.
+
+        :param value: JSON serializable value.
+        :return: Record ID.
+        """
+
+        return value
+
+    @classmethod
+    def validate_result(cls, result: _Any) -> None:
+        """
+        Check if a task result can be stored.
+
+        :param result: Task result.
+        :return: None
+        """
+
+        if result is not None and not isinstance(result, dict):
+            raise BackendValidationError(f"Task result must be a 'dict' or None, not '{type(result)}'.")
+
+
+class BackendLogHandler(_logging.Handler):
+    """
+    Log handler which stores buffered log records through a backend.
+    The buffer is flushed if it is full, if a record reaches the early flush level,
+    if the oldest buffered record is older than the periodical flush timing or if the handler is closed.
+    """
+
+    def __init__(self,
+                 backend: BaseBackend,
+                 owner_type: LOG_OWNER_ANNOTATION,
+                 owner_id: _Any,
+                 level=_logging.NOTSET,
+                 buffer_size: _Optional[int] = None,
+                 buffer_periodical_flush_timing: _Optional[float] = None,
+                 buffer_early_flush_level: _Optional[int] = None):
+        super().__init__(level=level)
+        self._backend: BaseBackend = backend
+        self._owner_type: LOG_OWNER_ANNOTATION = owner_type
+        self._owner_id: _Any = owner_id
+        self._buffer: list[dict[str, _Any]] = []
+        if buffer_size is None:
+            buffer_size = 100
+        self._buffer_size: int = buffer_size
+        if buffer_periodical_flush_timing is None:
+            buffer_periodical_flush_timing = 5.0
+        self._buffer_periodical_flush_timing: float = buffer_periodical_flush_timing
+        if buffer_early_flush_level is None:
+            buffer_early_flush_level = _logging.CRITICAL
+        self._buffer_early_flush_level: int = buffer_early_flush_level
+        self._buffer_lock: _threading.Lock = _threading.Lock()
+        self._last_flush: float = _time.perf_counter()
+
+    def format_entry(self, record: _logging.LogRecord) -> dict[str, _Any]:
+        entry = {
+            "timestamp": record.created,
+            "level": record.levelname,
+            "thread": record.thread,
+            "thread_name": record.threadName,
+            "message": record.getMessage(),
+            "logger_name": record.name,
+            "file_name": record.pathname,
+            "module": record.module,
+            "method": record.funcName,
+            "line_number": record.lineno
+        }
+        if record.exc_info is not None:
+            entry["exception"] = {"message": str(record.exc_info[1]),
+                                  "code": 0,
+                                  "stack_trace": (self.formatter or _logging.Formatter()).formatException(record.exc_info)}
+        return entry
+
+    def emit(self, record: _logging.LogRecord) -> None:
+        try:
+            entry = self.format_entry(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            flush = len(self._buffer) >= self._buffer_size \
+                    or record.levelno >= self._buffer_early_flush_level \
+                    or _time.perf_counter() - self._last_flush >= self._buffer_periodical_flush_timing
+        if flush:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._buffer_lock:
+            self._last_flush = _time.perf_counter()
+            if len(self._buffer) == 0:
+                return
+            entries = self._buffer
+            self._buffer = []
+            self._backend.push_log(owner_type=self._owner_type, owner_id=self._owner_id, timestamp=_local_now(), entries=entries)
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class BackendLogStreamer(_threading.Thread):
+    """
+    Thread which streams log entries of an owner from a backend.
+    """
+
+    def __init__(self,
+                 backend: BaseBackend,
+                 owner_type: LOG_OWNER_ANNOTATION,
+                 owner_id: _Any,
+                 to: _Optional[callable] = None,
+                 name: _Optional[str] = None,
+                 begin: _Optional[_datetime] = None,
+                 stream_rate: _Optional[float] = None):
+        if name is None:
+            name = self.__class__.__name__
+        super().__init__(name=name, daemon=True)
+        self._backend: BaseBackend = backend
+        self._owner_type: LOG_OWNER_ANNOTATION = owner_type
+        self._owner_id: _Any = owner_id
+        if to is None:
+            to = backend_log_stream_print
+        if not callable(to):
+            raise TypeError(f"Expected 'callable', got '{type(to)}'.")
+        self._to = to
+        if begin is None:
+            begin = _local_now()
+        self._begin: _datetime = begin
+        if stream_rate is None:
+            stream_rate = 0.001
+        self._stream_rate: float = stream_rate
+        self._after: _Optional[_Any] = None
+        self._buffer: _deque[dict[str, _Any]] = _deque()
+        self._stopper = _threading.Event()
+
+    def __enter__(self) -> "BackendLogStreamer":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _fetch(self) -> bool:
+        for batch_id, entries in self._backend.fetch_log(owner_type=self._owner_type, owner_id=self._owner_id, begin=self._begin, after=self._after):
+            self._buffer.extend(entries)
+            self._after = batch_id
+        return bool(self._buffer)
+
+    def _stream(self) -> None:
+        while self._buffer:
+            self._to(self._buffer.popleft())
+
+    def run(self) -> None:
+        while not self._stopper.wait(self._stream_rate):
+            self._fetch()
+            self._stream()
+        if self._fetch():  # fetch the last entries
+            self._stream()
+
+    def close(self) -> None:
+        self._stopper.set()
+
+
+def backend_log_stream_print(entry: dict):
+    if "message" in entry:
+        print(entry["message"])
+    else:
+        raise ValueError(f"Expected 'message' in '{entry}'.")
@@ -0,0 +1,137 @@
+from bisect import bisect_right as _bisect_right
+from datetime import datetime as _datetime
+from heapq import heappop as _heappop, heappush as _heappush
+from itertools import count as _count
+from typing import Any as _Any, Optional as _Optional
+
+from wiederverwendbar._unstable.task_manager.backends.base import BaseBackend as _BaseBackend, BackendDoesNotExist as _BackendDoesNotExist, \
+    LOG_OWNER_ANNOTATION as _LOG_OWNER_ANNOTATION
+from wiederverwendbar._unstable.task_manager.states import TaskState as _TaskState
+
+
+class MemoryBackend(_BaseBackend):
+    """
+    In-memory backend for single process use.
+
+    The backend doesn't use locks. All mutations are single operations on builtin containers, which are atomic under the GIL.
+    Due tasks are kept in a heap per manager. A claim is only valid if the worker could insert its token into the claim map first,
+    so only one worker can own a task.
+    """
+
+    def __init__(self):
+        self._id_counter = _count(1).__next__
+        self._workers: dict[int, dict[str, _Any]] = {}
+        self._tasks: dict[int, dict[str, _Any]] = {}
+        self._queues: dict[str, list[tuple[_datetime, int]]] = {}
+        self._claims: dict[int, object] = {}
+        self._logs: dict[tuple[str, _Any], list[tuple[int, _datetime, list[dict[str, _Any]]]]] = {}
+
+    # --- worker ---
+
+    def get_worker(self, worker_id: int) -> dict[str, _Any]:
+        worker = self._workers.get(worker_id)
+        if worker is None:
+            raise _BackendDoesNotExist(f"Worker with id '{worker_id}' does not exist.")
+        return dict(worker)
+
+    def find_worker(self, manager: str, name: str) -> _Optional[dict[str, _Any]]:
+        for worker in list(self._workers.values()):
+            if worker["manager"] == manager and worker["name"] == name:
+                return dict(worker)
+        return None
+
+    def create_worker(self, **fields) -> int:
+        worker_id = self._id_counter()
+        worker = {"started_at": None,
+                  "last_seen": None,
+                  "delay": None,
+                  "current_task": None,
+                  "signals": []}
+        worker.update(fields)
+        worker["id"] = worker_id
+        self._workers[worker_id] = worker
+        return worker_id
+
+    def update_worker(self, worker_id: int, **fields) -> None:
+        worker = self._workers.get(worker_id)
+        if worker is None:
+            raise _BackendDoesNotExist(f"Worker with id '{worker_id}' does not exist.")
+        worker.update(fields)
+
+    # --- task ---
+
+    def get_task(self, task_id: int) -> dict[str, _Any]:
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise _BackendDoesNotExist(f"Task with id '{task_id}' does not exist.")
+        return dict(task)
+
+    def create_task(self, **fields) -> int:
+        task_id = self._id_counter()
+        task = {"worker": None,
+                "started_at": None,
+                "ended_at": None,
+                "result": None}
+        task.update(fields)
+        task["id"] = task_id
+        self._tasks[task_id] = task
+        _heappush(self._queues.setdefault(task["manager"], []), (task["due_at"], task_id))
+        return task_id
+
+    def update_task(self, task_id: int, **fields) -> None:
+        task = self._tasks.get(task_id)
+        if task is None:
+            raise _BackendDoesNotExist(f"Task with id '{task_id}' does not exist.")
+        if "result" in fields:
+            self.validate_result(fields["result"])
+        task.update(fields)
+
+    def _claim(self, task_id: int, worker_id: int, now: _datetime) -> _Optional[dict[str, _Any]]:
+        task = self._tasks.get(task_id)
+        if task is None or task["state"] != _TaskState.NEW or task["worker"] is not None:
+            return None
+        token = object()
+        if self._claims.setdefault(task_id, token) is not token:
+            return None
+        task.update(state=_TaskState.RUNNING, worker=worker_id, started_at=now)
+        return dict(task)
+
+    def claim_task(self, manager: str, worker_id: int, now: _datetime, task_id: _Optional[int] = None) -> _Optional[dict[str, _Any]]:
+        if task_id is not None:
+            return self._claim(task_id, worker_id, now)
+        queue = self._queues.get(manager)
+        if not queue:
+            return None
+        while True:
+            try:
+                due_at, task_id = _heappop(queue)
+            except IndexError:
+                return None
+            if due_at > now:
+                # not due yet -> give it back
+                _heappush(queue, (due_at, task_id))
+                return None
+            task = self._claim(task_id, worker_id, now)
+            if task is not None:
+                return task
+
+    def cancel_worker_tasks(self, worker_id: int, ended_at: _datetime, result: dict[str, _Any]) -> list[str]:
+        canceled = []
+        for task in list(self._tasks.values()):
+            if task["worker"] != worker_id or task["state"] not in _TaskState.running_states():
+                continue
+            task.update(state=_TaskState.CANCELED, ended_at=ended_at, result=result)
+            canceled.append(task["name"])
+        return canceled
+
+    # --- log ---
+
+    def push_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: int, timestamp: _datetime, entries: list[dict[str, _Any]]) -> None:
+        self._logs.setdefault((owner_type, owner_id), []).append((self._id_counter(), timestamp, entries))
+
+    def fetch_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: int, begin: _datetime, after: _Optional[int] = None) -> list[tuple[int, list[dict[str, _Any]]]]:
+        batches = self._logs.get((owner_type, owner_id))
+        if not batches:
+            return []
+        start = 0 if after is None else _bisect_right(batches, after, key=lambda batch: batch[0])
+        return [(batch_id, entries) for batch_id, timestamp, entries in batches[start:] if timestamp > begin]
@@ -0,0 +1,346 @@
+import zlib as _zlib
+from datetime import datetime as _datetime
+from typing import Any as _Any, Literal as _Literal, Optional as _Optional
+
+from bson import ObjectId as _ObjectId, DBRef as _DBRef, encode as _bson_encode, decode as _bson_decode
+from bson.errors import InvalidDocument as _InvalidDocument
+from gridfs import GridFS as _GridFS
+from mongoengine import DoesNotExist as _DoesNotExist, ValidationError as _ValidationError, Document as _Document, EmbeddedDocument as _EmbeddedDocument, \
+    EnumField as _EnumField, DateTimeField as _DateTimeField, DictField as _DictField, StringField as _StringField, ReferenceField as _ReferenceField, \
+    FloatField as _FloatField, IntField as _IntField, EmbeddedDocumentListField as _EmbeddedDocumentListField, ObjectIdField as _ObjectIdField
+
+try:
+    from compression import zstd as _zstd  # Python >= 3.14
+except ModuleNotFoundError:
+    try:
+        import zstandard as _zstd
+    except ModuleNotFoundError:
+        _zstd = None
+
+from wiederverwendbar.functions.datetime import to_local as _to_local
+from wiederverwendbar.mongoengine.logger.streamer import MongoengineLogStreamer as _MongoengineLogStreamer
+from wiederverwendbar.mongoengine.logger.documets import MongoengineLogDocument as _MongoengineLogDocument
+from wiederverwendbar.mongoengine.logger.handlers import MongoengineLogHandler as _MongoengineLogHandler
+from wiederverwendbar._unstable.task_manager.backends.base import BaseBackend as _BaseBackend, BackendDoesNotExist as _BackendDoesNotExist, \
+    BackendValidationError as _BackendValidationError, LOG_OWNER_ANNOTATION as _LOG_OWNER_ANNOTATION
+from wiederverwendbar._unstable.task_manager.states import WorkerSignalType, WorkerState, TaskState
+
+MODULE_NAME = "task_manager"
+WORKER_NAMESPACE_NAME = f"{MODULE_NAME}.worker"
+TASK_NAMESPACE_NAME = f"{MODULE_NAME}.task"
+RESULT_COMPRESSION_ANNOTATION = _Literal["zlib", "zstd"]
+
+
+class _WorkerSignal(_EmbeddedDocument):
+    type: WorkerSignalType = _EnumField(WorkerSignalType, required=True)
+    send_at: _datetime = _DateTimeField(required=True)
+    content: dict[_Any, _Any] = _DictField()
+
+
+class _WorkerDocument(_Document):
+    meta = {"collection": WORKER_NAMESPACE_NAME}
+
+    name: str = _StringField(required=True, unique_with="manager")
+    manager: str = _StringField(required=True)
+    state: WorkerState = _EnumField(WorkerState, required=True)
+    started_at: _Optional[_datetime] = _DateTimeField()
+    last_seen: _Optional[_datetime] = _DateTimeField()
+    delay: _Optional[float] = _FloatField()
+    current_task: _Optional["_TaskDocument"] = _ReferenceField("_TaskDocument")
+    signals: list[_WorkerSignal] = _EmbeddedDocumentListField(_WorkerSignal)
+
+
+class _WorkerLogDocument(_MongoengineLogDocument):
+    meta = {"collection": f"{WORKER_NAMESPACE_NAME}.log",
+            "indexes": ["owner"]}
+    owner: _WorkerDocument = _ReferenceField(_WorkerDocument, required=True)
+
+
+class _TaskDocument(_Document):
+    meta = {"collection": TASK_NAMESPACE_NAME,
+            "indexes": [("manager", "state", "due_at")]}
+
+    name: str = _StringField(required=True)
+    manager: str = _StringField(required=True)
+    state: TaskState = _EnumField(TaskState, required=True)
+    worker: _Optional[_WorkerDocument] = _ReferenceField(_WorkerDocument)
+    log_level: int = _IntField(required=True)
+    created_at: _datetime = _DateTimeField(required=True)
+    due_at: _datetime = _DateTimeField(required=True)
+    started_at: _Optional[_datetime] = _DateTimeField()
+    ended_at: _Optional[_datetime] = _DateTimeField()
+    params: dict[str, _Any] = _DictField(required=True)
+    result: _Optional[dict[str, _Any]] = _DictField()
+    result_file: _Optional[_ObjectId] = _ObjectIdField()
+    result_compression: _Optional[str] = _StringField()
+
+
+class _TaskLogDocument(_MongoengineLogDocument):
+    meta = {"collection": f"{TASK_NAMESPACE_NAME}.log",
+            "indexes": ["owner"]}
+    owner: _TaskDocument = _ReferenceField(_TaskDocument, required=True)
+
+
+def _local(value: _Optional[_datetime]) -> _Optional[_datetime]:
+    if value is None:
+        return None
+    return _to_local(value)
+
+
+def _reference_id(document: _Document, field: str) -> _Optional[_ObjectId]:
+    # read the raw value, accessing the field would dereference it
+    value = document._data.get(field)
+    if isinstance(value, (_DBRef, _Document)):
+        return value.id
+    return value
+
+
+def _compressor(compression: _Optional[str]):
+    if compression is None:
+        return None
+    if compression == "zlib":
+        return _zlib
+    if compression == "zstd":
+        if _zstd is None:
+            raise RuntimeError("Result compression 'zstd' requires Python >= 3.14 or the 'zstandard' package.")
+        return _zstd
+    raise ValueError(f"Unknown result compression '{compression}'.")
+
+
+class MongoengineBackend(_BaseBackend):
+    """
+    MongoDB backend using mongoengine documents. The database connection must be initialized before.
+
+    Task results which are larger than the offload threshold (BSON encoded) are stored in GridFS.
+    The task document only keeps a reference to the file, so it stays small. Offloaded results are loaded with load_result.
+    """
+
+    log_documents: dict[str, type[_MongoengineLogDocument]] = {"worker": _WorkerLogDocument,
+                                                                "task": _TaskLogDocument}
+    result_collection_name: str = f"{TASK_NAMESPACE_NAME}.result"
+
+    def __init__(self,
+                 result_offload_threshold: _Optional[int] = 64 * 1024,
+                 result_compression: _Optional[RESULT_COMPRESSION_ANNOTATION] = None):
+        """
+        Create a new MongoengineBackend.
+
+        :param result_offload_threshold: Size in bytes above a result is stored in GridFS. None disables offloading.
+        :param result_compression: Compression of offloaded results.
+        """
+
+        self._result_offload_threshold: _Optional[int] = result_offload_threshold
+        _compressor(result_compression)  # check compression
+        self._result_compression: _Optional[RESULT_COMPRESSION_ANNOTATION] = result_compression
+        self._result_fs: _Optional[_GridFS] = None
+
+    @property
+    def result_offload_threshold(self) -> _Optional[int]:
+        return self._result_offload_threshold
+
+    @property
+    def result_compression(self) -> _Optional[RESULT_COMPRESSION_ANNOTATION]:
+        return self._result_compression
+
+    @property
+    def result_fs(self) -> _GridFS:
+        if self._result_fs is None:
+            self._result_fs = _GridFS(_TaskDocument._get_db(), collection=self.result_collection_name)
+        return self._result_fs
+
+    # --- converting ---
+
+    @classmethod
+    def dump_id(cls, record_id: _ObjectId) -> str:
+        return str(record_id)
+
+    @classmethod
+    def load_id(cls, value: str) -> _ObjectId:
+        return _ObjectId(value)
+
+    @classmethod
+    def _worker_record(cls, document: _WorkerDocument) -> dict[str, _Any]:
+        return {"id": document.id,
+                "name": document.name,
+                "manager": document.manager,
+                "state": document.state,
+                "started_at": _local(document.started_at),
+                "last_seen": _local(document.last_seen),
+                "delay": document.delay,
+                "current_task": _reference_id(document, "current_task"),
+                "signals": [{"type": signal.type,
+                             "send_at": _local(signal.send_at),
+                             "content": signal.content} for signal in document.signals]}
+
+    @classmethod
+    def _task_record(cls, document: _TaskDocument) -> dict[str, _Any]:
+        return {"id": document.id,
+                "name": document.name,
+                "manager": document.manager,
+                "state": document.state,
+                "worker": _reference_id(document, "worker"),
+                "log_level": document.log_level,
+                "created_at": _local(document.created_at),
+                "due_at": _local(document.due_at),
+                "started_at": _local(document.started_at),
+                "ended_at": _local(document.ended_at),
+                "params": document.params,
+                "result": document.result,
+                "result_file": document.result_file,
+                "result_compression": document.result_compression}
+
+    @classmethod
+    def _update(cls, document_cls: type[_Document], record_id: _ObjectId, fields: dict[str, _Any]) -> None:
+        if not fields:
+            return
+        updates = {}
+        for field, value in fields.items():
+            if field == "signals":
+                value = [_WorkerSignal(**signal) for signal in value]
+            updates[f"set__{field}"] = value
+        if document_cls.objects(id=record_id).update_one(**updates) == 0:
+            raise _BackendDoesNotExist(f"{document_cls.__name__} with id '{record_id}' does not exist.")
+
+    # --- worker ---
+
+    def get_worker(self, worker_id: _ObjectId) -> dict[str, _Any]:
+        try:
+            return self._worker_record(_WorkerDocument.objects.get(id=worker_id))
+        except _DoesNotExist as e:
+            raise _BackendDoesNotExist(f"Worker with id '{worker_id}' does not exist.") from e
+
+    def find_worker(self, manager: str, name: str) -> _Optional[dict[str, _Any]]:
+        document = _WorkerDocument.objects(manager=manager, name=name).first()
+        if document is None:
+            return None
+        return self._worker_record(document)
+
+    def create_worker(self, **fields) -> _ObjectId:
+        document = _WorkerDocument(**fields)
+        document.save()
+        return document.id
+
+    def update_worker(self, worker_id: _ObjectId, **fields) -> None:
+        self._update(_WorkerDocument, worker_id, fields)
+
+    # --- task ---
+
+    def get_task(self, task_id: _ObjectId) -> dict[str, _Any]:
+        try:
+            return self._task_record(_TaskDocument.objects.get(id=task_id))
+        except _DoesNotExist as e:
+            raise _BackendDoesNotExist(f"Task with id '{task_id}' does not exist.") from e
+
+    def create_task(self, **fields) -> _ObjectId:
+        document = _TaskDocument(**fields)
+        document.save()
+        return document.id
+
+    def update_task(self, task_id: _ObjectId, **fields) -> None:
+        if "result" not in fields:
+            self._update(_TaskDocument, task_id, fields)
+            return
+        result = fields["result"]
+        self.validate_result(result)
+        try:
+            _TaskDocument._fields["result"].validate(result)
+            encoded = None if result is None else _bson_encode(result)
+        except (_ValidationError, _InvalidDocument) as e:
+            raise _BackendValidationError(str(e)) from e
+
+        # offload large results
+        fields["result_file"] = None
+        fields["result_compression"] = None
+        if encoded is not None and self.result_offload_threshold is not None and len(encoded) > self.result_offload_threshold:
+            compressor = _compressor(self.result_compression)
+            if compressor is not None:
+                encoded = compressor.compress(encoded)
+            fields["result"] = None
+            fields["result_file"] = self.result_fs.put(encoded, task=task_id)
+            fields["result_compression"] = self.result_compression
+
+        # update task and remove the file of a replaced result
+        updates = {f"set__{field}": value for field, value in fields.items()}
+        old_document = _TaskDocument.objects(id=task_id).only("result_file").modify(new=False, **updates)
+        if old_document is None:
+            if fields["result_file"] is not None:
+                self.result_fs.delete(fields["result_file"])
+            raise _BackendDoesNotExist(f"{_TaskDocument.__name__} with id '{task_id}' does not exist.")
+        if old_document.result_file is not None:
+            self.result_fs.delete(old_document.result_file)
+
+    def load_result(self, record: dict[str, _Any]) -> _Optional[dict[str, _Any]]:
+        if record.get("result_file") is None:
+            return record["result"]
+        data = self.result_fs.get(record["result_file"]).read()
+        compressor = _compressor(record.get("result_compression"))
+        if compressor is not None:
+            data = compressor.decompress(data)
+        return _bson_decode(data)
+
+    def claim_task(self, manager: str, worker_id: _ObjectId, now: _datetime, task_id: _Optional[_ObjectId] = None) -> _Optional[dict[str, _Any]]:
+        if task_id is None:
+            queryset = _TaskDocument.objects(manager=manager,
+                                             due_at__lte=now,
+                                             state=TaskState.NEW,
+                                             worker=None).order_by("due_at")
+        else:
+            queryset = _TaskDocument.objects(id=task_id,
+                                             state=TaskState.NEW,
+                                             worker=None)
+        document = queryset.modify(new=True,
+                                   set__state=TaskState.RUNNING,
+                                   set__worker=worker_id,
+                                   set__started_at=now)
+        if document is None:
+            return None
+        return self._task_record(document)
+
+    def cancel_worker_tasks(self, worker_id: _ObjectId, ended_at: _datetime, result: dict[str, _Any]) -> list[str]:
+        canceled = []
+        for running_task in _TaskDocument.objects(worker=worker_id,
+                                                  state__in=TaskState.running_states()):
+            # set task attributes
+            running_task.state = TaskState.CANCELED
+            running_task.ended_at = ended_at
+            running_task.result = result
+
+            # save task
+            running_task.save()
+            canceled.append(running_task.name)
+        return canceled
+
+    # --- log ---
+
+    def push_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: _ObjectId, timestamp: _datetime, entries: list[dict[str, _Any]]) -> None:
+        self.log_documents[owner_type](timestamp=timestamp, entries=entries, owner=owner_id).save()
+
+    def fetch_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: _ObjectId, begin: _datetime, after: _Optional[_ObjectId] = None) -> list[tuple[_ObjectId, list[dict[str, _Any]]]]:
+        query = {"owner": owner_id, "timestamp__gt": begin}
+        if after is not None:
+            query["id__gt"] = after
+        return [(document.id, document.get_entries()) for document in self.log_documents[owner_type].objects(**query).order_by("id")]
+
+    def create_log_handler(self,
+                           owner_type: _LOG_OWNER_ANNOTATION,
+                           owner_id: _ObjectId,
+                           buffer_size: _Optional[int] = None,
+                           buffer_periodical_flush_timing: _Optional[float] = None) -> _MongoengineLogHandler:
+        return _MongoengineLogHandler(document=self.log_documents[owner_type],
+                                      document_kwargs={"owner": owner_id},
+                                      buffer_size=buffer_size,
+                                      buffer_periodical_flush_timing=buffer_periodical_flush_timing)
+
+    def create_log_streamer(self,
+                            owner_type: _LOG_OWNER_ANNOTATION,
+                            owner_id: _ObjectId,
+                            to: _Optional[callable] = None,
+                            name: _Optional[str] = None,
+                            begin: _Optional[_datetime] = None,
+                            stream_rate: _Optional[float] = None) -> _MongoengineLogStreamer:
+        return _MongoengineLogStreamer(log_document=self.log_documents[owner_type],
+                                       search={"owner": owner_id},
+                                       to=to,
+                                       name=name,
+                                       begin=begin,
+                                       stream_rate=stream_rate)
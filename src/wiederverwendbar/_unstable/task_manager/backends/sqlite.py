@@ -0,0 +1,220 @@
+import json as _json
+import sqlite3 as _sqlite3
+import threading as _threading
+from datetime import datetime as _datetime
+from pathlib import Path as _Path
+from typing import Any as _Any, Optional as _Optional, Union as _Union
+
+from wiederverwendbar.functions.datetime import local_now as _local_now
+from wiederverwendbar._unstable.task_manager.backends.base import BaseBackend as _BaseBackend, BackendDoesNotExist as _BackendDoesNotExist, \
+    BackendValidationError as _BackendValidationError, LOG_OWNER_ANNOTATION as _LOG_OWNER_ANNOTATION
+from wiederverwendbar._unstable.task_manager.states import WorkerSignalType as _WorkerSignalType, WorkerState as _WorkerState, TaskState as _TaskState
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS worker (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    state TEXT NOT NULL,
+    started_at REAL,
+    last_seen REAL,
+    delay REAL,
+    current_task INTEGER,
+    signals TEXT NOT NULL DEFAULT '[]',
+    UNIQUE (name, manager)
+);
+CREATE TABLE IF NOT EXISTS task (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    manager TEXT NOT NULL,
+    state TEXT NOT NULL,
+    worker INTEGER,
+    log_level INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    due_at REAL NOT NULL,
+    started_at REAL,
+    ended_at REAL,
+    params TEXT NOT NULL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS task_claim ON task (manager, state, due_at);
+CREATE INDEX IF NOT EXISTS task_worker ON task (worker, state);
+CREATE TABLE IF NOT EXISTS log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner_type TEXT NOT NULL,
+    owner INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    entries TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS log_owner ON log (owner_type, owner, id);
+"""
+
+_DATETIME_FIELDS = ("started_at", "last_seen", "created_at", "due_at", "ended_at")
+_JSON_FIELDS = ("params", "result")
+
+
+class SqliteBackend(_BaseBackend):
+    """
+    SQLite backend for multiple threads or processes on the same host.
+
+    The database runs in WAL mode. Tasks are claimed with a single 'UPDATE ... RETURNING' statement,
+    so concurrent workers never claim the same task. Every thread uses its own connection.
+    """
+
+    def __init__(self, path: _Union[str, _Path], timeout: _Optional[float] = None):
+        path = str(path)
+        if path == ":memory:" or path == "":
+            raise ValueError(f"{self.__class__.__name__} needs a database file, use 'MemoryBackend' for in-memory storage.")
+        if _sqlite3.sqlite_version_info < (3, 35, 0):
+            raise RuntimeError(f"{self.__class__.__name__} needs SQLite >= 3.35.0, got '{_sqlite3.sqlite_version}'.")
+        self._path: str = path
+        if timeout is None:
+            timeout = 30.0
+        self._timeout: float = timeout
+        self._local = _threading.local()
+
+        # create schema
+        self._connection.executescript(_SCHEMA)
+
+    @property
+    def _connection(self) -> _sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = _sqlite3.connect(self._path, timeout=self._timeout, isolation_level=None, check_same_thread=False)
+            connection.row_factory = _sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    # --- converting ---
+
+    @classmethod
+    def _encode(cls, field: str, value: _Any) -> _Any:
+        if value is None:
+            return None
+        if field in _DATETIME_FIELDS:
+            return value.timestamp()
+        if field in _JSON_FIELDS:
+            try:
+                return _json.dumps(value)
+            except (TypeError, ValueError) as e:
+                raise _BackendValidationError(f"Field '{field}' is not JSON serializable: {e}") from e
+        if field == "state":
+            return value.value
+        if field == "signals":
+            return _json.dumps([{"type": signal["type"].value,
+                                 "send_at": signal["send_at"].timestamp(),
+                                 "content": signal.get("content", {})} for signal in value])
+        return value
+
+    @classmethod
+    def _decode(cls, row: _sqlite3.Row, state_cls: type) -> dict[str, _Any]:
+        record = dict(row)
+        tz = _local_now().tzinfo
+        for field in _DATETIME_FIELDS:
+            if record.get(field) is not None:
+                record[field] = _datetime.fromtimestamp(record[field], tz=tz)
+        for field in _JSON_FIELDS:
+            if record.get(field) is not None:
+                record[field] = _json.loads(record[field])
+        record["state"] = state_cls(record["state"])
+        if "signals" in record:
+            record["signals"] = [{"type": _WorkerSignalType(signal["type"]),
+                                  "send_at": _datetime.fromtimestamp(signal["send_at"], tz=tz),
+                                  "content": signal["content"]} for signal in _json.loads(record["signals"])]
+        return record
+
+    def _insert(self, table: str, fields: dict[str, _Any]) -> int:
+        columns = ", ".join(fields)
+        placeholders = ", ".join("?" for _ in fields)
+        cursor = self._connection.execute(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})",
+                                          [self._encode(field, value) for field, value in fields.items()])
+        return cursor.lastrowid
+
+    def _update(self, table: str, record_id: int, fields: dict[str, _Any]) -> None:
+        if not fields:
+            return
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        cursor = self._connection.execute(f"UPDATE {table} SET {assignments} WHERE id = ?",
+                                          [*(self._encode(field, value) for field, value in fields.items()), record_id])
+        if cursor.rowcount == 0:
+            raise _BackendDoesNotExist(f"{table.capitalize()} with id '{record_id}' does not exist.")
+
+    # --- worker ---
+
+    def get_worker(self, worker_id: int) -> dict[str, _Any]:
+        row = self._connection.execute("SELECT * FROM worker WHERE id = ?", (worker_id,)).fetchone()
+        if row is None:
+            raise _BackendDoesNotExist(f"Worker with id '{worker_id}' does not exist.")
+        return self._decode(row, _WorkerState)
+
+    def find_worker(self, manager: str, name: str) -> _Optional[dict[str, _Any]]:
+        row = self._connection.execute("SELECT * FROM worker WHERE manager = ? AND name = ?", (manager, name)).fetchone()
+        if row is None:
+            return None
+        return self._decode(row, _WorkerState)
+
+    def create_worker(self, **fields) -> int:
+        return self._insert("worker", fields)
+
+    def update_worker(self, worker_id: int, **fields) -> None:
+        self._update("worker", worker_id, fields)
+
+    # --- task ---
+
+    def get_task(self, task_id: int) -> dict[str, _Any]:
+        row = self._connection.execute("SELECT * FROM task WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            raise _BackendDoesNotExist(f"Task with id '{task_id}' does not exist.")
+        return self._decode(row, _TaskState)
+
+    def create_task(self, **fields) -> int:
+        return self._insert("task", fields)
+
+    def update_task(self, task_id: int, **fields) -> None:
+        if "result" in fields:
+            self.validate_result(fields["result"])
+        self._update("task", task_id, fields)
+
+    def claim_task(self, manager: str, worker_id: int, now: _datetime, task_id: _Optional[int] = None) -> _Optional[dict[str, _Any]]:
+        if task_id is not None:
+            rows = self._connection.execute("UPDATE task SET state = ?, worker = ?, started_at = ? "
+                                            "WHERE id = ? AND state = ? AND worker IS NULL "
+                                            "RETURNING *",
+                                            (_TaskState.RUNNING.value, worker_id, now.timestamp(),
+                                             task_id, _TaskState.NEW.value)).fetchall()
+            if not rows:
+                return None
+            return self._decode(rows[0], _TaskState)
+        rows = self._connection.execute("UPDATE task SET state = ?, worker = ?, started_at = ? "
+                                       "WHERE id = (SELECT id FROM task WHERE manager = ? AND state = ? AND worker IS NULL AND due_at <= ? "
+                                       "ORDER BY due_at LIMIT 1) "
+                                       "AND state = ? AND worker IS NULL "
+                                       "RETURNING *",
+                                       (_TaskState.RUNNING.value, worker_id, now.timestamp(),
+                                        manager, _TaskState.NEW.value, now.timestamp(),
+                                        _TaskState.NEW.value)).fetchall()  # fetch all rows to finish the statement and release the write lock
+        if not rows:
+            return None
+        return self._decode(rows[0], _TaskState)
+
+    def cancel_worker_tasks(self, worker_id: int, ended_at: _datetime, result: dict[str, _Any]) -> list[str]:
+        running_states = [state.value for state in _TaskState.running_states()]
+        rows = self._connection.execute(f"UPDATE task SET state = ?, ended_at = ?, result = ? "
+                                        f"WHERE worker = ? AND state IN ({', '.join('?' for _ in running_states)}) "
+                                        f"RETURNING name",
+                                        (_TaskState.CANCELED.value, ended_at.timestamp(), self._encode("result", result),
+                                         worker_id, *running_states)).fetchall()
+        return [row["name"] for row in rows]
+
+    # --- log ---
+
+    def push_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: int, timestamp: _datetime, entries: list[dict[str, _Any]]) -> None:
+        self._connection.execute("INSERT INTO log (owner_type, owner, timestamp, entries) VALUES (?, ?, ?, ?)",
+                                 (owner_type, owner_id, timestamp.timestamp(), _json.dumps(entries, default=str)))
+
+    def fetch_log(self, owner_type: _LOG_OWNER_ANNOTATION, owner_id: int, begin: _datetime, after: _Optional[int] = None) -> list[tuple[int, list[dict[str, _Any]]]]:
+        rows = self._connection.execute("SELECT id, entries FROM log WHERE owner_type = ? AND owner = ? AND id > ? AND timestamp > ? ORDER BY id",
+                                        (owner_type, owner_id, after or 0, begin.timestamp())).fetchall()
+        return [(row["id"], _json.loads(row["entries"])) for row in rows]
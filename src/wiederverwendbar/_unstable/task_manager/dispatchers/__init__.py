@@ -0,0 +1,11 @@
+from wiederverwendbar._unstable.task_manager.dispatchers.base import (BaseDispatcher,
+                                                                     BaseReceiver)
+from wiederverwendbar._unstable.task_manager.dispatchers.polling import (PollingDispatcher,
+                                                                        PollingReceiver)
+
+try:
+    from wiederverwendbar._unstable.task_manager.dispatchers.kombu import (KombuDispatcher,
+                                                                          KombuReceiver)
+except ModuleNotFoundError:
+    KombuDispatcher = None
+    KombuReceiver = None
@@ -0,0 +1,86 @@
+from abc import ABC as _ABC, abstractmethod as _abstractmethod
+from datetime import datetime as _datetime
+from typing import Any as _Any, Optional as _Optional, TYPE_CHECKING as _TYPE_CHECKING
+
+if _TYPE_CHECKING:
+    from wiederverwendbar._unstable.task_manager.task_manager import Manager
+
+
+class BaseReceiver(_ABC):
+    """
+    Receiver of a single worker. It's created and used inside the worker thread.
+    """
+
+    def __init__(self, manager: "Manager", worker_id: _Any):
+        self._manager: "Manager" = manager
+        self._worker_id: _Any = worker_id
+
+    @_abstractmethod
+    def receive(self, timeout: _Optional[float] = None) -> _Optional[dict[str, _Any]]:
+        """
+        Receive and claim the next task for the worker.
+
+        :param timeout: Maximum time in seconds to wait for a task.
+        :return: Claimed task record or None if no task was received.
+        """
+
+        ...
+
+    def done(self, task: dict[str, _Any]) -> None:
+        """
+        Called after a received task has ended and its record is saved.
+
+        :param task: Task record.
+        :return: None
+        """
+
+        ...
+
+    def close(self) -> None:
+        """
+        Close the receiver.
+
+        :return: None
+        """
+
+        ...
+
+
+class BaseDispatcher(_ABC):
+    """
+    Distributes scheduled tasks of a manager to its workers.
+    """
+
+    @_abstractmethod
+    def publish(self, manager: "Manager", task_id: _Any, due_at: _datetime) -> None:
+        """
+        Publish a new task. Called after the task record was created.
+
+        :param manager: Manager of the task.
+        :param task_id: ID of the task.
+        :param due_at: Due time of the task.
+        :return: None
+        """
+
+        ...
+
+    @_abstractmethod
+    def create_receiver(self, manager: "Manager", worker_id: _Any) -> BaseReceiver:
+        """
+        Create a receiver for a worker.
+
+        :param manager: Manager of the worker.
+        :param worker_id: ID of the worker.
+        :return: Receiver.
+        """
+
+        ...
+
+    def close(self) -> None:
+        """
+        Close the dispatcher.
+
+        :return: None
+        """
+
+        ...
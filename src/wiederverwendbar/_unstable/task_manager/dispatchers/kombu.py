@@ -0,0 +1,195 @@
+import logging as _logging
+import threading as _threading
+import time as _time
+from collections import deque as _deque
+from datetime import datetime as _datetime
+from heapq import heappop as _heappop, heappush as _heappush
+from itertools import count as _count
+from socket import timeout as _socket_timeout
+from typing import Any as _Any, Optional as _Optional, TYPE_CHECKING as _TYPE_CHECKING
+
+from kombu import Connection as _Connection, Exchange as _Exchange, Queue as _Queue, Message as _Message, Producer as _Producer
+
+from wiederverwendbar.functions.datetime import local_now as _local_now
+from wiederverwendbar._unstable.task_manager.dispatchers.base import BaseDispatcher as _BaseDispatcher, BaseReceiver as _BaseReceiver
+
+if _TYPE_CHECKING:
+    from wiederverwendbar._unstable.task_manager.task_manager import Manager
+
+DEFAULT_EXCHANGE_NAME = "task_manager"
+DEFAULT_RECOVERY_INTERVAL = 60.0
+
+logger = _logging.getLogger(__name__)
+
+
+class KombuReceiver(_BaseReceiver):
+    def __init__(self, manager: "Manager", worker_id: _Any, dispatcher: "KombuDispatcher"):
+        super().__init__(manager=manager, worker_id=worker_id)
+        self._connection: _Connection = dispatcher.connection.clone()
+        self._messages: _deque[tuple[dict[str, _Any], _Message]] = _deque()
+        self._unacked: dict[_Any, _Message] = {}
+        self._consumer = self._connection.Consumer([dispatcher.get_queue(manager)], callbacks=[self._on_message], accept=["json"])
+        self._consumer.qos(prefetch_count=dispatcher.prefetch_count)
+        self._consumer.consume()
+        self._recovery_interval: float = dispatcher.recovery_interval
+        self._next_recovery: float = _time.monotonic()
+
+    def _on_message(self, body: dict[str, _Any], message: _Message) -> None:
+        self._messages.append((body, message))
+
+    def receive(self, timeout: _Optional[float] = None) -> _Optional[dict[str, _Any]]:
+        if timeout is None:
+            timeout = 1.0
+
+        # claim due tasks without a message, their message was lost or never published
+        if not self._messages and self._recovery_interval > 0 and _time.monotonic() >= self._next_recovery:
+            self._next_recovery = _time.monotonic() + self._recovery_interval
+            task = self._manager.backend.claim_task(manager=self._manager.name,
+                                                    worker_id=self._worker_id,
+                                                    now=_local_now())
+            if task is not None:
+                self._next_recovery = _time.monotonic()
+                return task
+
+        if not self._messages:
+            try:
+                self._connection.drain_events(timeout=timeout)
+            except _socket_timeout:
+                return None
+
+        backend = self._manager.backend
+        while self._messages:
+            body, message = self._messages.popleft()
+            task = backend.claim_task(manager=self._manager.name,
+                                      worker_id=self._worker_id,
+                                      now=_local_now(),
+                                      task_id=backend.load_id(body["task_id"]))
+            if task is None:
+                # task was already claimed by another worker -> drop message
+                message.ack()
+                continue
+            self._unacked[task["id"]] = message
+            return task
+        return None
+
+    def done(self, task: dict[str, _Any]) -> None:
+        message = self._unacked.pop(task["id"], None)
+        if message is not None:
+            message.ack()
+
+    def close(self) -> None:
+        self._consumer.cancel()
+        self._connection.release()
+
+
+class KombuDispatcher(_BaseDispatcher):
+    """
+    Dispatcher which publishes every task to a kombu exchange. Workers consume the messages with a prefetch limit and ack them after the task has ended.
+    The backend is only used to store the task state and result. Use Connection("memory://") for local testing,
+    virtual transports poll with their "polling_interval" transport option, lower it for a smaller latency.
+
+    Tasks with a due time in the future are held by this dispatcher and published when they are due.
+    Tasks without a message, because the scheduling process ended before they were due or publishing failed, stay new in the backend.
+    Every receiver claims them directly from the backend when it starts and then every recovery_interval seconds.
+    A message of a task, which was claimed this way, is dropped by the receiver.
+    """
+
+    def __init__(self,
+                 connection: _Connection,
+                 exchange_name: _Optional[str] = None,
+                 prefetch_count: _Optional[int] = None,
+                 recovery_interval: _Optional[float] = None):
+        self._connection: _Connection = connection
+        if exchange_name is None:
+            exchange_name = DEFAULT_EXCHANGE_NAME
+        self._exchange: _Exchange = _Exchange(exchange_name, "direct", durable=True)
+        if prefetch_count is None:
+            prefetch_count = 1
+        self._prefetch_count: int = prefetch_count
+        if recovery_interval is None:
+            recovery_interval = DEFAULT_RECOVERY_INTERVAL
+        self._recovery_interval: float = recovery_interval
+
+        # producer
+        self._producer_lock = _threading.Lock()
+        self._producer_connection: _Connection = connection.clone()
+        self._producer: _Optional[_Producer] = None
+
+        # delayed tasks
+        self._delayed_condition = _threading.Condition()
+        self._delayed: list[tuple[_datetime, int, "Manager", _Any]] = []
+        self._delayed_counter = _count().__next__
+        self._delayed_thread: _Optional[_threading.Thread] = None
+        self._closed: bool = False
+
+    @property
+    def connection(self) -> _Connection:
+        return self._connection
+
+    @property
+    def exchange(self) -> _Exchange:
+        return self._exchange
+
+    @property
+    def prefetch_count(self) -> int:
+        return self._prefetch_count
+
+    @property
+    def recovery_interval(self) -> float:
+        return self._recovery_interval
+
+    def get_queue(self, manager: "Manager") -> _Queue:
+        return _Queue(f"{self._exchange.name}.{manager.name}", exchange=self._exchange, routing_key=manager.name, durable=True)
+
+    def _publish(self, manager: "Manager", task_id: _Any) -> None:
+        with self._producer_lock:
+            if self._producer is None:
+                self._producer = self._producer_connection.Producer(serializer="json")
+            self._producer.publish({"task_id": manager.backend.dump_id(task_id)},
+                                   exchange=self._exchange,
+                                   routing_key=manager.name,
+                                   declare=[self.get_queue(manager)],
+                                   retry=True)
+
+    def _delayed_loop(self) -> None:
+        while True:
+            with self._delayed_condition:
+                if self._closed:
+                    return
+                if not self._delayed:
+                    self._delayed_condition.wait()
+                    continue
+                due_at, _, manager, task_id = self._delayed[0]
+                delay = (due_at - _local_now()).total_seconds()
+                if delay > 0:
+                    self._delayed_condition.wait(delay)
+                    continue
+                _heappop(self._delayed)
+
+            # publish without holding the condition, publish() must not wait for the broker
+            try:
+                self._publish(manager, task_id)
+            except Exception:
+                logger.exception(f"Could not publish task '{task_id}' of manager '{manager.name}', it's recovered by the receivers.")
+
+    def publish(self, manager: "Manager", task_id: _Any, due_at: _datetime) -> None:
+        if due_at <= _local_now():
+            self._publish(manager, task_id)
+            return
+
+        with self._delayed_condition:
+            _heappush(self._delayed, (due_at, self._delayed_counter(), manager, task_id))
+            if self._delayed_thread is None:
+                self._delayed_thread = _threading.Thread(name=f"{self.__class__.__name__}.delayed", target=self._delayed_loop, daemon=True)
+                self._delayed_thread.start()
+            self._delayed_condition.notify()
+
+    def create_receiver(self, manager: "Manager", worker_id: _Any) -> KombuReceiver:
+        return KombuReceiver(manager=manager, worker_id=worker_id, dispatcher=self)
+
+    def close(self) -> None:
+        with self._delayed_condition:
+            self._closed = True
+            self._delayed_condition.notify()
+        with self._producer_lock:
+            self._producer_connection.release()
@@ -0,0 +1,27 @@
+from datetime import datetime as _datetime
+from typing import Any as _Any, Optional as _Optional, TYPE_CHECKING as _TYPE_CHECKING
+
+from wiederverwendbar.functions.datetime import local_now as _local_now
+from wiederverwendbar._unstable.task_manager.dispatchers.base import BaseDispatcher as _BaseDispatcher, BaseReceiver as _BaseReceiver
+
+if _TYPE_CHECKING:
+    from wiederverwendbar._unstable.task_manager.task_manager import Manager
+
+
+class PollingReceiver(_BaseReceiver):
+    def receive(self, timeout: _Optional[float] = None) -> _Optional[dict[str, _Any]]:
+        return self._manager.backend.claim_task(manager=self._manager.name,
+                                                worker_id=self._worker_id,
+                                                now=_local_now())
+
+
+class PollingDispatcher(_BaseDispatcher):
+    """
+    Dispatcher where every worker polls the backend for the next due task once per loop.
+    """
+
+    def publish(self, manager: "Manager", task_id: _Any, due_at: _datetime) -> None:
+        ...
+
+    def create_receiver(self, manager: "Manager", worker_id: _Any) -> PollingReceiver:
+        return PollingReceiver(manager=manager, worker_id=worker_id)
@@ -0,0 +1,36 @@
+from enum import Enum as _Enum
+
+
+class WorkerSignalType(_Enum):
+    STOP = "stop"
+    CANCEL = "cancel"
+
+
+class WorkerState(_Enum):
+    BUSY = "busy"
+    IDLE = "idle"
+    QUIT = "quit"
+
+
+class TaskState(_Enum):
+    NEW = "new"
+    RUNNING = "running"  # running states
+    CANCELED = "canceled"  # final states
+    FINISHED = "finished"  # final states
+    FAILED = "failed"  # final states
+
+    @classmethod
+    def waiting_states(cls) -> list["TaskState"]:
+        return [cls.NEW]
+
+    @classmethod
+    def running_states(cls) -> list["TaskState"]:
+        return [cls.RUNNING]
+
+    @classmethod
+    def failed_states(cls) -> list["TaskState"]:
+        return [cls.CANCELED, cls.FAILED]
+
+    @classmethod
+    def final_states(cls) -> list["TaskState"]:
+        return [cls.FINISHED] + cls.failed_states()
@@ -3,26 +3,22 @@ import inspect as _inspect
 
 import threading as _threading
 import time as _time
+from contextvars import ContextVar as _ContextVar
 from itertools import count as _count
 from typing import Any as _Any, Optional as _Optional, Union as _Union
 from datetime import datetime as _datetime, timedelta as _timedelta
-from enum import Enum as _Enum
 
-from bson import ObjectId as _ObjectId
-from mongoengine import DoesNotExist as _DoesNotExist, ValidationError as _ValidationError, Document as _Document, EmbeddedDocument as _EmbeddedDocument, EnumField as _EnumField, \
-    DateTimeField as _DateTimeField, \
-    DictField as _DictField, StringField as _StringField, ReferenceField as _ReferenceField, FloatField as _FloatField, IntField as _IntField, \
-    EmbeddedDocumentListField as _EmbeddedDocumentListField
-
-from wiederverwendbar.functions.datetime import local_now as _local_now, to_local as _to_local
+from wiederverwendbar.functions.datetime import local_now as _local_now
 from wiederverwendbar.logger.helper import remove_logger as _remove_logger
 from wiederverwendbar.logger.context import LoggingContext as _LoggingContext
 from wiederverwendbar.logger.singleton import SubLogger as _SubLogger
-from wiederverwendbar.mongoengine.logger.streamer import MongoengineLogStreamer as _MongoengineLogStreamer
-from wiederverwendbar.mongoengine.logger.documets import MongoengineLogDocument as _MongoengineLogDocument
-from wiederverwendbar.mongoengine.logger.handlers import MongoengineLogHandler as _MongoengineLogHandler
 from wiederverwendbar.threading import ExtendedThread as _ExtendedThread, handle_exception as _handle_exception, ThreadLoopContinue as _ThreadLoopContinue, \
     ThreadStop as _ThreadStop
+from wiederverwendbar._unstable.task_manager.backends import BaseBackend as _BaseBackend, BackendValidationError as _BackendValidationError, \
+    BackendDoesNotExist as _BackendDoesNotExist, LOG_OWNER_ANNOTATION as _LOG_OWNER_ANNOTATION, MongoengineBackend as _MongoengineBackend
+from wiederverwendbar._unstable.task_manager.dispatchers import BaseDispatcher as _BaseDispatcher, BaseReceiver as _BaseReceiver, \
+    PollingDispatcher as _PollingDispatcher
+from wiederverwendbar._unstable.task_manager.states import WorkerSignalType, WorkerState, TaskState
 
 MODULE_NAME = "task_manager"
 DEFAULT_LOG_LEVEL = _logging.INFO
@@ -31,141 +27,71 @@ WORKER_NAMESPACE_NAME = f"{MODULE_NAME}.worker"
 TASK_NAMESPACE_NAME = f"{MODULE_NAME}.task"
 
 
-class WorkerSignalType(_Enum):
-    STOP = "stop"
-    CANCEL = "cancel"
-
-
-class _WorkerSignal(_EmbeddedDocument):
-    type: WorkerSignalType = _EnumField(WorkerSignalType, required=True)
-    send_at: _datetime = _DateTimeField(required=True)
-    content: dict[_Any, _Any] = _DictField()
-
-
-class WorkerState(_Enum):
-    BUSY = "busy"
-    IDLE = "idle"
-    QUIT = "quit"
-
-
-class _WorkerDocument(_Document):
-    meta = {"collection": WORKER_NAMESPACE_NAME}
-
-    name: str = _StringField(required=True, unique_with="manager")
-    manager: str = _StringField(required=True)
-    state: WorkerState = _EnumField(WorkerState, required=True)
-    started_at: _Optional[_datetime] = _DateTimeField()
-    last_seen: _Optional[_datetime] = _DateTimeField()
-    delay: _Optional[float] = _FloatField()
-    current_task: _Optional["_TaskDocument"] = _ReferenceField("_TaskDocument")
-    signals: list[_WorkerSignal] = _EmbeddedDocumentListField(_WorkerSignal)
-
-
-class _WorkerLogDocument(_MongoengineLogDocument):
-    meta = {"collection": f"{WORKER_NAMESPACE_NAME}.log",
-            "indexes": ["owner"]}
-    owner: _WorkerDocument = _ReferenceField(_WorkerDocument, required=True)
-
-
-class TaskState(_Enum):
-    NEW = "new"
-    RUNNING = "running"  # running states
-    CANCELED = "canceled"  # final states
-    FINISHED = "finished"  # final states
-    FAILED = "failed"  # final states
-
-    @classmethod
-    def waiting_states(cls) -> list["TaskState"]:
-        return [cls.NEW]
-
-    @classmethod
-    def running_states(cls) -> list["TaskState"]:
-        return [cls.RUNNING]
-
-    @classmethod
-    def failed_states(cls) -> list["TaskState"]:
-        return [cls.CANCELED, cls.FAILED]
-
-    @classmethod
-    def final_states(cls) -> list["TaskState"]:
-        return [cls.FINISHED] + cls.failed_states()
-
-
 class _TaskCancelSignal(_ThreadLoopContinue):
     ...
 
 
-class _TaskDocument(_Document):
-    meta = {"collection": TASK_NAMESPACE_NAME}
-
-    name: str = _StringField(required=True)
-    manager: str = _StringField(required=True)
-    state: TaskState = _EnumField(TaskState, required=True)
-    worker: _Optional[_WorkerDocument] = _ReferenceField(_WorkerDocument)
-    log_level: int = _IntField(required=True)
-    created_at: _datetime = _DateTimeField(required=True)
-    due_at: _datetime = _DateTimeField(required=True)
-    started_at: _Optional[_datetime] = _DateTimeField()
-    ended_at: _Optional[_datetime] = _DateTimeField()
-    params: dict[str, _Any] = _DictField(required=True)
-    result: _Optional[dict[str, _Any]] = _DictField()
-
-
-class _TaskLogDocument(_MongoengineLogDocument):
-    meta = {"collection": f"{TASK_NAMESPACE_NAME}.log",
-            "indexes": ["owner"]}
-    owner: _TaskDocument = _ReferenceField(_TaskDocument, required=True)
+# worker thread which is running the current task, set by _WorkerThread.task()
+_current_worker_thread: _ContextVar[_Optional["_WorkerThread"]] = _ContextVar("_current_worker_thread", default=None)
 
 
 class _BaseProxy:
-    proxy_document_cls: _Union[type[_WorkerDocument], type[_TaskDocument]] = None
-    log_document_cls: _Union[type[_WorkerLogDocument], type[_WorkerLogDocument]] = None
+    owner_type: _LOG_OWNER_ANNOTATION = None
 
-    def __init__(self, object_id: _ObjectId = None):
-        self._proxy_document: _Union[_WorkerDocument, _TaskDocument] = self.proxy_document_cls.objects.get(id=object_id)
+    def __init__(self, object_id: _Any = None, manager: _Optional["Manager"] = None):
+        if manager is None:
+            manager = Manager.get_manager_of(self._get_record, object_id)
+        self._manager: "Manager" = manager
+        self._object_id: _Any = object_id
+        self._record: dict[str, _Any] = {}
+        self.reload()
 
     def __str__(self):
         return f"{self.__class__.__name__}(name={self.name}, manager={self.manager}, state={self.state})"
 
     @property
-    def id(self) -> _ObjectId:
-        return self._proxy_document.id
+    def id(self) -> _Any:
+        return self._object_id
 
     @property
     def name(self) -> str:
-        return self._proxy_document.name
+        return self._record["name"]
 
     @property
     def manager(self) -> "Manager":
-        return Manager.get_manager(self._proxy_document.manager)
+        return self._manager
 
     @property
     def state(self) -> _Union[WorkerState, TaskState]:
         self.reload()
-        return self._proxy_document.state
+        return self._record["state"]
 
     @property
     def started_at(self) -> _Optional[_datetime]:
         self.reload()
-        return self._proxy_document.started_at
+        return self._record["started_at"]
+
+    @classmethod
+    def _get_record(cls, backend: _BaseBackend, object_id: _Any) -> dict[str, _Any]:
+        raise NotImplementedError
 
     def reload(self) -> None:
-        self._proxy_document.reload()
+        self._record = self._get_record(self.manager.backend, self.id)
 
     def log_streamer(self,
                      to: _Optional[callable] = None,
                      begin: _Optional[_datetime] = None,
-                     log_stream_rate: _Optional[float] = None) -> _MongoengineLogStreamer:
+                     log_stream_rate: _Optional[float] = None) -> _threading.Thread:
         if begin is None:
             begin = self.started_at
         if log_stream_rate is None:
             log_stream_rate = self.manager.log_stream_rate
-        return _MongoengineLogStreamer(log_document=self.log_document_cls,
-                                       search={"owner": self._proxy_document},
-                                       to=to,
-                                       name=f"{self.name}.log_streamer",
-                                       begin=begin,
-                                       stream_rate=log_stream_rate)
+        return self.manager.backend.create_log_streamer(owner_type=self.owner_type,
+                                                        owner_id=self.id,
+                                                        to=to,
+                                                        name=f"{self.name}.log_streamer",
+                                                        begin=begin,
+                                                        stream_rate=log_stream_rate)
 
     def wait_for_state(self, *states: _Union[WorkerState, TaskState], timeout: _Optional[float] = None) -> None:
         start_time = _time.perf_counter()
@@ -176,22 +102,16 @@ class _BaseProxy:
 
 
 class Worker(_BaseProxy):
-    proxy_document_cls = _WorkerDocument
-    log_document_cls = _WorkerLogDocument
+    owner_type = "worker"
 
-    def __init__(self, object_id: _ObjectId = None):
+    def __init__(self, object_id: _Any = None, manager: _Optional["Manager"] = None):
         if object_id is None:
-            stack = _inspect.stack()
-            for frame_info in stack[1:]:
-                for f_local_name, f_local in dict(frame_info.frame.f_locals).items():
-                    if isinstance(f_local, _WorkerThread):
-                        object_id = f_local.worker_document.id
-                        break
-                if object_id is not None:
-                    break
-            if object_id is None:
-                raise ValueError("No worker found in stack")
-        super().__init__(object_id=object_id)
+            worker_thread = _current_worker_thread.get()
+            if worker_thread is None:
+                raise ValueError("No worker found in current context")
+            object_id = worker_thread.worker_id
+            manager = worker_thread.manager
+        super().__init__(object_id=object_id, manager=manager)
 
     @property
     def state(self) -> WorkerState:
@@ -200,19 +120,23 @@ class Worker(_BaseProxy):
     @property
     def last_seen(self) -> _datetime:
         self.reload()
-        return self._proxy_document.last_seen
+        return self._record["last_seen"]
 
     @property
     def delay(self) -> float:
         self.reload()
-        return self._proxy_document.delay
+        return self._record["delay"]
 
     @property
     def current_task(self) -> _Optional["ScheduledTask"]:
         self.reload()
-        if self._proxy_document.current_task is None:
+        if self._record["current_task"] is None:
             return None
-        return ScheduledTask(object_id=self._proxy_document.current_task.id)
+        return ScheduledTask(object_id=self._record["current_task"], manager=self.manager)
+
+    @classmethod
+    def _get_record(cls, backend: _BaseBackend, object_id: _Any) -> dict[str, _Any]:
+        return backend.get_worker(object_id)
 
     def wait_for_state(self, *states: WorkerState, timeout: _Optional[float] = None) -> None:
         super().wait_for_state(*states, timeout=timeout)
@@ -228,29 +152,22 @@ class Worker(_BaseProxy):
     #         return
     #     elif self.state == WorkerState.QUIT:
     #         raise ValueError(f"Worker '{self.name}' is already quitting")
-    #     self._proxy_document.state = WorkerState.TERMINATE
-    #     self._proxy_document.save()
+    #     self.manager.backend.update_worker(self.id, state=WorkerState.TERMINATE)
     #     if wait:
     #         self.wait_for_state(WorkerState.TERMINATE, timeout=timeout)
 
 
 class ScheduledTask(_BaseProxy):
-    proxy_document_cls = _TaskDocument
-    log_document_cls = _TaskLogDocument
+    owner_type = "task"
 
-    def __init__(self, object_id: _ObjectId = None):
+    def __init__(self, object_id: _Any = None, manager: _Optional["Manager"] = None):
         if object_id is None:
-            stack = _inspect.stack()
-            for frame_info in stack[1:]:
-                for f_local_name, f_local in dict(frame_info.frame.f_locals).items():
-                    if isinstance(f_local, _WorkerThread):
-                        object_id = f_local.current_task.id
-                        break
-                if object_id is not None:
-                    break
-            if object_id is None:
-                raise ValueError("No task found in stack")
-        super().__init__(object_id=object_id)
+            worker_thread = _current_worker_thread.get()
+            if worker_thread is None or worker_thread.current_task is None:
+                raise ValueError("No task found in current context")
+            object_id = worker_thread.current_task["id"]
+            manager = worker_thread.manager
+        super().__init__(object_id=object_id, manager=manager)
 
     @property
     def state(self) -> TaskState:
@@ -259,45 +176,50 @@ class ScheduledTask(_BaseProxy):
     @property
     def worker(self) -> _Optional[Worker]:
         self.reload()
-        if self._proxy_document.worker is None:
+        if self._record["worker"] is None:
             return None
-        return Worker(object_id=self._proxy_document.worker.id)
+        return Worker(object_id=self._record["worker"], manager=self.manager)
 
     @property
     def created_at(self) -> _datetime:
-        return self._proxy_document.created_at
+        return self._record["created_at"]
 
     @property
     def due_at(self) -> _datetime:
-        return self._proxy_document.due_at
+        return self._record["due_at"]
 
     @property
     def ended_at(self) -> _Optional[_datetime]:
         self.reload()
-        return self._proxy_document.ended_at
+        return self._record["ended_at"]
 
     @property
     def params(self) -> dict[str, _Any]:
-        return self._proxy_document.params.copy()
+        return self._record["params"].copy()
 
     @property
     def result(self) -> _Optional[dict[str, _Any]]:
         self.reload()
-        if self._proxy_document.result is None:
+        result = self.manager.backend.load_result(self._record)
+        if result is None:
             return None
-        return self._proxy_document.result.copy()
+        return result.copy()
 
     @property
     def duration(self) -> _Optional[float]:
         self.reload()
-        if self._proxy_document.started_at is None or self._proxy_document.ended_at is None:
+        if self._record["started_at"] is None or self._record["ended_at"] is None:
             return None
-        return (self._proxy_document.ended_at - self._proxy_document.started_at).total_seconds()
+        return (self._record["ended_at"] - self._record["started_at"]).total_seconds()
 
     @property
     def is_running(self) -> bool:
         return self.state in TaskState.running_states()
 
+    @classmethod
+    def _get_record(cls, backend: _BaseBackend, object_id: _Any) -> dict[str, _Any]:
+        return backend.get_task(object_id)
+
     def wait_for_state(self, *states: TaskState, timeout: _Optional[float] = None) -> None:
         super().wait_for_state(*states, timeout=timeout)
 
@@ -306,17 +228,16 @@ class ScheduledTask(_BaseProxy):
 
     # def cancel(self, wait: bool = False, timeout: _Optional[float] = None) -> None:
     #     self.reload()
-    #     if self._proxy_document.state == TaskState.CANCELING:
+    #     if self._record["state"] == TaskState.CANCELING:
     #         return
-    #     if self._proxy_document.state == TaskState.CANCELED:
+    #     if self._record["state"] == TaskState.CANCELED:
     #         raise ValueError(f"Task '{self.name}' is already canceled")
-    #     elif self._proxy_document.state == TaskState.FINISHED:
+    #     elif self._record["state"] == TaskState.FINISHED:
     #         raise ValueError(f"Task '{self.name}' is already finished")
-    #     elif self._proxy_document.state == TaskState.FAILED:
+    #     elif self._record["state"] == TaskState.FAILED:
     #         raise ValueError(f"Task '{self.name}' is already failed")
     #
-    #     self._proxy_document.state = TaskState.CANCELING
-    #     self._proxy_document.save()
+    #     self.manager.backend.update_task(self.id, state=TaskState.CANCELING)
     #
     #     if wait:
     #         self.wait_for_state(TaskState.CANCELED, timeout=timeout)
@@ -330,7 +251,7 @@ class _WorkerThread(_ExtendedThread):
     def __init__(self,
                  name: str,
                  manager: "Manager",
-                 document: _WorkerDocument,
+                 worker_id: _Any,
                  log_level: int,
                  log_push_rate: _Optional[float] = None,
                  log_push_max_entries: _Optional[int] = None,
@@ -341,19 +262,20 @@ class _WorkerThread(_ExtendedThread):
 
         self._manager: "Manager" = manager
 
-        # define document attributes
+        # define record attributes
         self._state: WorkerState = WorkerState.BUSY
         self._last_seen: _datetime = _local_now()
-        self._current_task: _Optional[_TaskDocument] = None
+        self._current_task: _Optional[dict[str, _Any]] = None
 
         # define worker attributes
         self._log_level: int = log_level
-        self._logger_handler: _Optional[_MongoengineLogHandler] = None
-        self._worker_document: _WorkerDocument = document
+        self._logger_handler: _Optional[_logging.Handler] = None
+        self._receiver: _Optional[_BaseReceiver] = None
+        self._worker_id: _Any = worker_id
         self._log_push_rate: _Optional[float] = log_push_rate
         self._log_push_max_entries: _Optional[int] = log_push_max_entries
         self._task_logger: _Optional[_logging.Logger] = None
-        self._task_logger_handler: _Optional[_MongoengineLogHandler] = None
+        self._task_logger_handler: _Optional[_logging.Handler] = None
         if task_ignore_loggers_equal is None:
             task_ignore_loggers_equal = []
         self._task_ignore_loggers_equal: list[str] = task_ignore_loggers_equal
@@ -362,6 +284,8 @@ class _WorkerThread(_ExtendedThread):
         self._task_ignore_loggers_like: list[str] = task_ignore_loggers_like
         self._task_result: _Optional[dict[str, _Any]] = None
         self._task_state: _Optional[TaskState] = None
+        if logger is None:
+            logger = _logging.getLogger(name)
 
         super().__init__(name=name,
                          cls_name=name,
@@ -382,8 +306,7 @@ class _WorkerThread(_ExtendedThread):
             return False
 
         # check if worker signal
-        thread.worker_document.reload()
-        for signal in thread.worker_document.signals:
+        for signal in thread.backend.get_worker(thread.worker_id)["signals"]:
             print(signal)
 
         return True
@@ -391,9 +314,17 @@ class _WorkerThread(_ExtendedThread):
     # --- properties ---
 
     @property
-    def worker_document(self) -> _WorkerDocument:
+    def manager(self) -> "Manager":
+        return self._manager
+
+    @property
+    def backend(self) -> _BaseBackend:
+        return self._manager.backend
+
+    @property
+    def worker_id(self) -> _Any:
         with self.lock:
-            return self._worker_document
+            return self._worker_id
 
     @property
     def state(self) -> WorkerState:
@@ -407,8 +338,7 @@ class _WorkerThread(_ExtendedThread):
                 return
             self._logger.debug(f"Worker state changed from '{self._state}' to '{value}'")
             self._state = value
-            self._worker_document.state = self._state
-            self._worker_document.save()
+            self.backend.update_worker(self._worker_id, state=self._state)
 
     @property
     def last_seen(self) -> _datetime:
@@ -419,20 +349,18 @@ class _WorkerThread(_ExtendedThread):
     def last_seen(self, value: _datetime) -> None:
         with self.lock:
             self._last_seen = value
-            self._worker_document.last_seen = self._last_seen
-            self._worker_document.save()
+            self.backend.update_worker(self._worker_id, last_seen=self._last_seen)
 
     @property
-    def current_task(self) -> _Optional[_TaskDocument]:
+    def current_task(self) -> _Optional[dict[str, _Any]]:
         with self.lock:
             return self._current_task
 
     @current_task.setter
-    def current_task(self, value: _Optional[_TaskDocument]) -> None:
+    def current_task(self, value: _Optional[dict[str, _Any]]) -> None:
         with self.lock:
             self._current_task = value
-            self._worker_document.current_task = self._current_task
-            self._worker_document.save()
+            self.backend.update_worker(self._worker_id, current_task=None if self._current_task is None else self._current_task["id"])
 
     @property
     def log_push_rate(self) -> float:
@@ -499,10 +427,10 @@ class _WorkerThread(_ExtendedThread):
 
     def on_start(self) -> None:
         # create worker logger handler
-        self._logger_handler = _MongoengineLogHandler(document=_WorkerLogDocument,
-                                                      document_kwargs={"owner": self.worker_document},
-                                                      buffer_size=self._manager.log_push_max_entries,
-                                                      buffer_periodical_flush_timing=self._manager.log_push_rate)
+        self._logger_handler = self.backend.create_log_handler(owner_type="worker",
+                                                               owner_id=self.worker_id,
+                                                               buffer_size=self._manager.log_push_max_entries,
+                                                               buffer_periodical_flush_timing=self._manager.log_push_rate)
 
         # configure logger
         if not isinstance(self._logger, _SubLogger):
@@ -513,23 +441,18 @@ class _WorkerThread(_ExtendedThread):
                 self._logger.setLevel(self._log_level)
                 self._logger.addHandler(self._logger_handler)
 
-        # set all running tasks for this worker to failed
-
-        for running_task in _TaskDocument.objects(worker=self.worker_document,
-                                                  state__in=TaskState.running_states()):
-            self.logger.debug(f"Setting task '{running_task.name}' to state '{TaskState.CANCELED}'")
-
-            # set task attributes
-            running_task.state = TaskState.CANCELED
-            running_task.ended_at = _local_now()
-            running_task.result = {"error": "Worker restarted"}
+        # set all running tasks for this worker to canceled
+        for task_name in self.backend.cancel_worker_tasks(worker_id=self.worker_id,
+                                                          ended_at=_local_now(),
+                                                          result={"error": "Worker restarted"}):
+            self.logger.debug(f"Task '{task_name}' set to state '{TaskState.CANCELED}'")
 
-            # save task
-            running_task.save()
         with self.lock:
             self._started_at = _local_now()
-            self._worker_document.started_at = self._started_at
-            self._worker_document.save()
+            self.backend.update_worker(self._worker_id, started_at=self._started_at)
+
+        # create task receiver
+        self._receiver = self._manager.dispatcher.create_receiver(manager=self._manager, worker_id=self.worker_id)
 
     def on_loop_start(self) -> None:
         # set state to idle
@@ -537,69 +460,70 @@ class _WorkerThread(_ExtendedThread):
 
         with self.lock:
             # set last seen and delay
-            self._worker_document.last_seen = _local_now()
-            self._worker_document.delay = self._loop_delay
-            self._worker_document.save()
+            self._last_seen = _local_now()
+            self.backend.update_worker(self._worker_id, last_seen=self._last_seen, delay=self._loop_delay)
 
     def loop(self) -> None:
-        # get next due task
-        self.current_task: _TaskDocument = _TaskDocument.objects(manager=self._manager.name,
-                                                                 due_at__lte=_local_now(),
-                                                                 state=TaskState.NEW,
-                                                                 worker=None).order_by("due_at").first()
-        if self.current_task is not None:
-            self.on_task_start()
-
-            # run task
-            raise_at_end = None
-            try:
-                self.task()
-            except (_ThreadLoopContinue, _ThreadStop) as e:
-                if isinstance(e, _ThreadStop):
-                    self._task_result = {"error": "Worker stopped"}
-                elif isinstance(e, _ThreadLoopContinue):
-                    self._task_result = {"error": "Worker continued"}
-                self._task_state = TaskState.CANCELED
-                raise_at_end = e
-            except Exception as e:
-                self._task_result = {"error": str(e)}
-                self._task_state = TaskState.FAILED
-                _handle_exception(msg=f"Error while running task '{self.current_task.name}'", e=e, logger=self._logger)
-
-            self.on_task_end()
+        # receive next due task
+        task = self._receiver.receive(timeout=self.loop_sleep_time)
+        while task is not None:
+            self.current_task = task
+            self.run_task()
+            self._receiver.done(task)
 
             # set current task to None
             self.current_task = None
 
-            if raise_at_end is not None:
-                raise raise_at_end
+            # take the next task right away instead of sleeping until the next loop
+            self.on_loop_start()
+            task = self._receiver.receive(timeout=0)
 
-    def on_task_start(self) -> None:
-        # start task
-        self.current_task.state = TaskState.RUNNING
-        self.current_task.worker = self.worker_document
-        self.current_task.started_at = _local_now()
-        self.current_task.save()
+    def run_task(self) -> None:
+        self.on_task_start()
 
+        # run task
+        raise_at_end = None
+        try:
+            self.task()
+        except (_ThreadLoopContinue, _ThreadStop) as e:
+            if isinstance(e, _ThreadStop):
+                self._task_result = {"error": "Worker stopped"}
+            elif isinstance(e, _ThreadLoopContinue):
+                self._task_result = {"error": "Worker continued"}
+            self._task_state = TaskState.CANCELED
+            raise_at_end = e
+        except Exception as e:
+            self._task_result = {"error": str(e)}
+            self._task_state = TaskState.FAILED
+            _handle_exception(msg=f"Error while running task '{self.current_task['name']}'", e=e, logger=self._logger)
+
+        self.on_task_end()
+
+        if raise_at_end is not None:
+            self._receiver.done(self.current_task)
+            self.current_task = None
+            raise raise_at_end
+
+    def on_task_start(self) -> None:
         # set state to busy
         self.state = WorkerState.BUSY
 
-        self._logger.info(f"Running task '{self.current_task.name}'")
+        self._logger.info(f"Running task '{self.current_task['name']}'")
 
         # create logger
-        self._task_logger = _logging.getLogger(f"{TASK_NAMESPACE_NAME}.{self.current_task.name}")
+        self._task_logger = _logging.getLogger(f"{TASK_NAMESPACE_NAME}.{self.current_task['name']}")
 
         # add logger handler
-        self._task_logger_handler = _MongoengineLogHandler(document=_TaskLogDocument,
-                                                           document_kwargs={"owner": self.current_task},
-                                                           buffer_size=self.log_push_max_entries,
-                                                           buffer_periodical_flush_timing=self.log_push_rate)
+        self._task_logger_handler = self.backend.create_log_handler(owner_type="task",
+                                                                    owner_id=self.current_task["id"],
+                                                                    buffer_size=self.log_push_max_entries,
+                                                                    buffer_periodical_flush_timing=self.log_push_rate)
         if not isinstance(self._task_logger, _SubLogger):
-            self._task_logger.setLevel(self.current_task.log_level)
+            self._task_logger.setLevel(self.current_task["log_level"])
             self._task_logger.addHandler(self._task_logger_handler)
         else:
             with self._task_logger.reconfigure():
-                self._task_logger.setLevel(self.current_task.log_level)
+                self._task_logger.setLevel(self.current_task["log_level"])
                 self._task_logger.addHandler(self._task_logger_handler)
 
         self._task_result = None
@@ -609,8 +533,12 @@ class _WorkerThread(_ExtendedThread):
         with _LoggingContext(context_logger=self._task_logger,
                              ignore_loggers_equal=self.task_ignore_loggers_equal,
                              ignore_loggers_like=self.task_ignore_loggers_like):
-            task_func = self._manager.get_task_func(self.current_task.name)
-            self._task_result = task_func(**self.current_task.params)
+            task_func = self._manager.get_task_func(self.current_task["name"])
+            token = _current_worker_thread.set(self)
+            try:
+                self._task_result = task_func(**self.current_task["params"])
+            finally:
+                _current_worker_thread.reset(token)
             self._task_state = TaskState.FINISHED
 
     def on_task_end(self) -> None:
@@ -625,20 +553,20 @@ class _WorkerThread(_ExtendedThread):
         # remove logger
         _remove_logger(self._task_logger)
 
-        self._logger.info(f"Finishing task '{self.current_task.name}'")
+        self._logger.info(f"Finishing task '{self.current_task['name']}'")
 
         try:
-            # set task attributes
-            self.current_task.state = self._task_state
-            self.current_task.ended_at = _local_now()
-            self.current_task.result = self._task_result
-
             # save task
-            self.current_task.save()
-        except _ValidationError as e:
-            self.current_task.state = TaskState.FAILED
-            self.current_task.result = {"error": _handle_exception(msg=f"Validation error while saving task '{self.current_task.name}'", e=e, logger=self._logger)}
-            self.current_task.save()
+            self.backend.update_task(self.current_task["id"],
+                                     state=self._task_state,
+                                     ended_at=_local_now(),
+                                     result=self._task_result)
+        except _BackendValidationError as e:
+            self.backend.update_task(self.current_task["id"],
+                                     state=TaskState.FAILED,
+                                     ended_at=_local_now(),
+                                     result={"error": _handle_exception(msg=f"Validation error while saving task '{self.current_task['name']}'", e=e,
+                                                                        logger=self._logger)})
 
     def on_loop_end(self) -> None:
         ...
@@ -648,6 +576,10 @@ class _WorkerThread(_ExtendedThread):
         self.state = WorkerState.QUIT
 
     def on_end(self) -> None:
+        # close task receiver
+        if self._receiver is not None:
+            self._receiver.close()
+
         # close logger handler and remove it
         self._logger_handler.close()
         if not isinstance(self._logger, _SubLogger):
@@ -673,13 +605,29 @@ class Manager:
                  minimum_last_seen_time_for_other_worker: _Optional[int] = None,
                  worker_loop_sleep_time: _Optional[float] = None,
                  task_ignore_loggers_equal: _Optional[list[str]] = None,
-                 task_ignore_loggers_like: _Optional[list[str]] = None, ):
+                 task_ignore_loggers_like: _Optional[list[str]] = None,
+                 backend: _Optional[_BaseBackend] = None,
+                 dispatcher: _Optional[_BaseDispatcher] = None):
         self._lock = _threading.Lock()
 
         if name is None:
             name = "default"
         self._name: str = name
 
+        if backend is None:
+            if _MongoengineBackend is None:
+                raise RuntimeError("No backend given and mongoengine is not installed")
+            backend = _MongoengineBackend()
+        if not isinstance(backend, _BaseBackend):
+            raise TypeError(f"Argument 'backend' must be a '{_BaseBackend.__name__}' not '{type(backend)}'")
+        self._backend: _BaseBackend = backend
+
+        if dispatcher is None:
+            dispatcher = _PollingDispatcher()
+        if not isinstance(dispatcher, _BaseDispatcher):
+            raise TypeError(f"Argument 'dispatcher' must be a '{_BaseDispatcher.__name__}' not '{type(dispatcher)}'")
+        self._dispatcher: _BaseDispatcher = dispatcher
+
         self._logger = _logging.getLogger(f"{MANAGER_NAMESPACE_NAME}.{self.name}")
         if log_level is None:
             if self._logger.level == _logging.NOTSET:
@@ -708,7 +656,7 @@ class Manager:
             minimum_last_seen_time_for_other_worker = 10
         self._minimum_last_seen_time_for_other_worker: int = minimum_last_seen_time_for_other_worker
 
-        self._workers: dict[str, _ObjectId] = {}
+        self._workers: dict[str, _Any] = {}
 
         if worker_loop_sleep_time is None:
             worker_loop_sleep_time = 1
@@ -744,11 +692,50 @@ class Manager:
                 raise ValueError(f"No manager with name '{name}' found")
             return cls.managers[name]
 
+    @classmethod
+    def get_single_manager(cls) -> "Manager":
+        with cls._manager_lock:
+            if len(cls.managers) != 1:
+                raise ValueError(f"Expected exactly one manager, found {len(cls.managers)}. Pass the manager explicitly")
+            return next(iter(cls.managers.values()))
+
+    @classmethod
+    def get_manager_of(cls, get_record: callable, object_id: _Any) -> "Manager":
+        # resolve the manager from the 'manager' field of the stored record
+        with cls._manager_lock:
+            managers = list(cls.managers.values())
+        if len(managers) == 1:
+            return managers[0]
+        backends = []
+        for manager in managers:
+            if any(manager.backend is backend for backend in backends):
+                continue
+            backends.append(manager.backend)
+            try:
+                record = get_record(manager.backend, object_id)
+            except _BackendDoesNotExist:
+                continue
+            record_manager = cls.managers.get(record["manager"])
+            # ids of different backends may collide, the record counts only for a manager of this backend
+            if record_manager is not None and record_manager.backend is manager.backend:
+                return record_manager
+        raise ValueError(f"No manager found for object with id '{object_id}'. Pass the manager explicitly")
+
     @property
     def name(self) -> str:
         with self._lock:
             return self._name
 
+    @property
+    def backend(self) -> _BaseBackend:
+        with self._lock:
+            return self._backend
+
+    @property
+    def dispatcher(self) -> _BaseDispatcher:
+        with self._lock:
+            return self._dispatcher
+
     @property
     def log_level(self) -> int:
         return self._logger.level
@@ -827,7 +814,8 @@ class Manager:
     @property
     def workers(self) -> list[Worker]:
         with self._lock:
-            return [Worker(object_id=worker_id) for worker_id in self._workers.values()]
+            worker_ids = list(self._workers.values())
+        return [Worker(object_id=worker_id, manager=self) for worker_id in worker_ids]
 
     def create_worker(self,
                       name: _Optional[str] = None,
@@ -853,32 +841,31 @@ class Manager:
         if log_level is None:
             log_level = self._logger.level
 
-        # get worker document or create it
-        try:
-            worker_document = _WorkerDocument.objects.get(name=name,
-                                                          manager=self.name)
-            # check if other worker is running on this document
-            if worker_document.state != WorkerState.QUIT:
-                last_seen = _to_local(worker_document.last_seen)
-                last_seen_delta_for_other_worker = _local_now() - last_seen
+        # get worker record or create it
+        worker = self.backend.find_worker(manager=self.name, name=name)
+        if worker is not None:
+            # check if other worker is running on this record
+            if worker["state"] != WorkerState.QUIT and worker["last_seen"] is not None:
+                last_seen_delta_for_other_worker = _local_now() - worker["last_seen"]
                 if last_seen_delta_for_other_worker < _timedelta(seconds=self.minimum_last_seen_time_for_other_worker):
                     raise ValueError(f"Worker '{self.name}' already exists and was last seen {last_seen_delta_for_other_worker.total_seconds()} ago")
-            worker_document.state = WorkerState.QUIT
-            worker_document.started_at = None
-            worker_document.last_seen = None
-            worker_document.delay = None
-            worker_document.current_task = None
-            worker_document.signals = []
-        except _DoesNotExist:
-            worker_document = _WorkerDocument(name=name,
-                                              manager=self.name,
-                                              state=WorkerState.QUIT)
-        worker_document.save()
+            worker_id = worker["id"]
+            self.backend.update_worker(worker_id,
+                                       state=WorkerState.QUIT,
+                                       started_at=None,
+                                       last_seen=None,
+                                       delay=None,
+                                       current_task=None,
+                                       signals=[])
+        else:
+            worker_id = self.backend.create_worker(name=name,
+                                                   manager=self.name,
+                                                   state=WorkerState.QUIT)
 
         # create worker
         _WorkerThread(name=name,
                       manager=self,
-                      document=worker_document,
+                      worker_id=worker_id,
                       log_level=log_level,
                       log_push_rate=log_push_rate,
                       log_push_max_entries=log_push_max_entries,
@@ -888,9 +875,9 @@ class Manager:
 
         with self._lock:
             # add worker name and id to workers
-            self._workers[name] = worker_document.id
+            self._workers[name] = worker_id
 
-        return Worker(object_id=worker_document.id)
+        return Worker(object_id=worker_id, manager=self)
 
     # --- task management ---
 
@@ -991,15 +978,16 @@ class Manager:
                 raise ValueError(f"Parameter '{param_name}' for task '{name}' must be of type '{task_params[param_name]}'")
 
         # create new task
-        task = _TaskDocument(
-            name=name,
-            manager=self.name,
-            state=TaskState.NEW,
-            log_level=log_level,
-            created_at=_local_now(),
-            due_at=due or _local_now(),
-            params=given_task_params
-        )
-        task.save()
-
-        return ScheduledTask(object_id=task.id)
+        due_at = due or _local_now()
+        task_id = self.backend.create_task(name=name,
+                                           manager=self.name,
+                                           state=TaskState.NEW,
+                                           log_level=log_level,
+                                           created_at=_local_now(),
+                                           due_at=due_at,
+                                           params=given_task_params)
+
+        # hand task over to the workers
+        self.dispatcher.publish(manager=self, task_id=task_id, due_at=due_at)
+
+        return ScheduledTask(object_id=task_id, manager=self)
@@ -70,125 +70,106 @@ def _get_methods(method_names: list[str], attrs: dict[str, callable], bases: lis
     return methods
 
 
-def _get_signatures(func: callable, before_methods: list[callable], after_methods: list[callable]) -> tuple[inspect.Signature, list[inspect.Signature], list[inspect.Signature]]:
-    # get before method signatures
-    before_method_signatures = []
-    for before_method in before_methods:
-        if not callable(before_method):
-            raise ValueError("before_method must be a callable.")
-
-        logger.debug(f"Gather before_method '{before_method.__name__}' signature.")
-        before_method_signatures.append(inspect.signature(before_method))
-
-    # get after method signatures
-    after_method_signatures = []
-    for after_method in after_methods:
-        if not callable(after_method):
-            raise ValueError("after_method must be a callable.")
-
-        logger.debug(f"Gather after_method '{after_method.__name__}' signature.")
-        after_method_signatures.append(inspect.signature(after_method))
-
-    # get func signature
-    func_signature = inspect.signature(func)
-
-    return func_signature, before_method_signatures, after_method_signatures
-
-
-def _wrapper(*args,
-             func: callable,
-             before_methods: list[callable],
-             after_methods: list[callable],
-             func_signature: inspect.Signature,
-             before_method_signatures: list[inspect.Signature],
-             after_method_signatures: list[inspect.Signature],
-             **kwargs):
-    # add before_result to kwargs
-    if "__ba_before_result__" in kwargs:
-        raise ValueError("__ba_before_result__ is a reserved keyword.")
-    kwargs["__ba_before_result__"] = None
-    if "__ba_result__" in kwargs:
-        raise ValueError("__ba_result__ is a reserved keyword.")
-    kwargs["__ba_result__"] = None
-    if "__ba_after_result__" in kwargs:
-        raise ValueError("__ba_after_result__ is a reserved keyword.")
-    kwargs["__ba_after_result__"] = None
-
-    def bind(s: inspect.Signature) -> dict[str, any]:
-        if "__ba_before_result__" in kwargs:
-            if "__ba_before_result__" not in s.parameters:
-                del kwargs["__ba_before_result__"]
-        if "__ba_result__" in kwargs:
-            if "__ba_result__" not in s.parameters:
-                del kwargs["__ba_result__"]
-        if "__ba_after_result__" in kwargs:
-            if "__ba_after_result__" not in s.parameters:
-                del kwargs["__ba_after_result__"]
-
-        return s.bind(*args, **kwargs).arguments
-
-    # get __ba_use__ flag
-    __ba_use__ = kwargs.pop("__ba_use__", True)
-    if not __ba_use__:
-        mapped_params = bind(func_signature)
-        return func(**mapped_params)
-
-    # get __ba_use_before__ flag
-    __ba_use_before__ = kwargs.pop("__ba_use_before__", True)
-
-    # get __ba_use_after__ flag
-    __ba_use_after__ = kwargs.pop("__ba_use_after__", True)
-
-    # call before_methods
-    if __ba_use_before__:
-        for bm in before_methods:
-            # get before_method_signature
-            bms = before_method_signatures[before_methods.index(bm)]
-
-            # map args and kwargs to before_method_signature
-            mapped_params = bind(bms)
-
-            # call before_method
-            logger.debug(f"Call before_method '{bm.__name__}'")
-            kwargs["__ba_before_result__"] = bm(**mapped_params)
-
-    # map args and kwargs to func_signature
-    mapped_params = bind(func_signature)
-
-    # call func
-    logger.debug(f"Call function '{func.__name__}'")
-    __ba_result__ = func(**mapped_params)
-    kwargs["__ba_result__"] = __ba_result__
-
-    # call after_methods
-    if __ba_use_after__:
-        for am in after_methods:
-            # get after_method_signature
-            ams = after_method_signatures[after_methods.index(am)]
-
-            # map args and kwargs to after_method_signature
-            mapped_params = bind(ams)
-
-            # call after_method
-            logger.debug(f"Call after_method '{am.__name__}'")
-            kwargs["__ba_after_result__"] = am(**mapped_params)
-
-    return __ba_result__
+# results passed to the hooks and the function if they have a parameter of this name
+_RESULT_PARAMETERS = {"__ba_before_result__": "before_result",
+                      "__ba_result__": "result",
+                      "__ba_after_result__": "after_result"}
+# flags of a call, they select a variant of the wrapper
+_FLAG_PARAMETERS = ("__ba_use__", "__ba_use_before__", "__ba_use_after__")
+_SPECIAL_PARAMETERS = frozenset([*_RESULT_PARAMETERS, *_FLAG_PARAMETERS])
+
+
+def _get_result_parameters(method: callable) -> list[str]:
+    # which results the method accepts, gathered once instead of binding its signature on every call
+    parameters = inspect.signature(method).parameters
+    return [name for name in _RESULT_PARAMETERS if name in parameters]
+
+
+def _compile_call(name: str, method: callable, is_async: bool) -> str:
+    call = f"{name}(*args, **kwargs"
+    for parameter in _get_result_parameters(method):
+        call += f", {parameter}={_RESULT_PARAMETERS[parameter]}"
+    call += ")"
+    if inspect.iscoroutinefunction(method):
+        if not is_async:
+            raise ValueError(f"Async method '{method.__name__}' can only wrap async functions.")
+        call = f"await {call}"
+    return call
+
+
+def _compile_wrapper_factory(func: callable,
+                             before_methods: list[callable],
+                             after_methods: list[callable],
+                             use_before: bool = True,
+                             use_after: bool = True,
+                             with_dispatch: bool = False) -> callable:
+    # generate a factory of wrappers which call the hooks and the function directly, python binds the arguments
+    # the hooks are arguments of the factory, so the code is reused for other hooks with the same code
+    is_async = inspect.iscoroutinefunction(func)
+    parameters = ["_func", "_dispatch"]
+    body = []
+    if with_dispatch:
+        body += ["    if kwargs and not _special_parameters.isdisjoint(kwargs):",
+                 f"        return {'await ' if is_async else ''}_dispatch(args, kwargs)"]
+    body.append("    before_result = result = after_result = None")
+    for methods, kind, variable, use in ((before_methods, "before", "before_result", use_before),
+                                         (after_methods, "after", "after_result", use_after)):
+        if kind == "after":
+            body.append(f"    result = {_compile_call('_func', func, is_async)}")
+        for index, method in enumerate(methods):
+            if not callable(method):
+                raise ValueError(f"{kind}_method must be a callable.")
+            parameters.append(f"_{kind}_{index}")
+            if not use:
+                continue
+            logger.debug(f"Gather {kind}_method '{method.__name__}' signature.")
+            body.append(f"    {variable} = {_compile_call(f'_{kind}_{index}', method, is_async)}")
+    body.append("    return result")
+    lines = [f"def factory({', '.join(parameters)}):",
+             f"    {'async ' if is_async else ''}def wrapper(*args, **kwargs):",
+             *(f"    {line}" for line in body),
+             "    return wrapper"]
+    namespace = {"_special_parameters": _SPECIAL_PARAMETERS}
+    exec("\n".join(lines) + "\n", namespace)
+    return namespace["factory"]
+
+
+def _method_key(method: callable):
+    # methods with the same code get the same generated code, unless their signature doesn't follow the code
+    code = getattr(method, "__code__", None)
+    if code is None or hasattr(method, "__wrapped__") or hasattr(method, "__signature__"):
+        return method
+    return code
+
+
+def _create_wrapper(func: callable,
+                    before_methods: list[callable],
+                    after_methods: list[callable],
+                    factories: dict,
+                    key=None) -> callable:
+    # factories are cached by key and flags, key identifies the code of the hooks
+    def dispatch(args: tuple, kwargs: dict):
+        # slow path for calls with flags or reserved keywords
+        for parameter in _RESULT_PARAMETERS:
+            if parameter in kwargs:
+                raise ValueError(f"{parameter} is a reserved keyword.")
+        use = kwargs.pop("__ba_use__", True)
+        use_before = kwargs.pop("__ba_use_before__", True) and use
+        use_after = kwargs.pop("__ba_use_after__", True) and use
+        variant_factory = factories.get((key, use_before, use_after))
+        if variant_factory is None:
+            variant_factory = factories[(key, use_before, use_after)] = _compile_wrapper_factory(func, before_methods, after_methods, use_before, use_after)
+        return variant_factory(func, None, *before_methods, *after_methods)(*args, **kwargs)
+
+    factory = factories.get(key)
+    if factory is None:
+        factory = factories[key] = _compile_wrapper_factory(func, before_methods, after_methods, with_dispatch=True)
+    return factory(func, dispatch, *before_methods, *after_methods)
 
 
 def _wrap(before_methods: list[callable], after_methods: list[callable]):
     def decorator(func):
-        # get signatures
-        func_signature, before_method_signatures, after_method_signatures = _get_signatures(func, before_methods, after_methods)
-
-        return wraps(func)(lambda *args, **kwargs: _wrapper(*args,
-                                                            func=func,
-                                                            before_methods=before_methods,
-                                                            after_methods=after_methods,
-                                                            func_signature=func_signature,
-                                                            before_method_signatures=before_method_signatures,
-                                                            after_method_signatures=after_method_signatures,
-                                                            **kwargs))
+        return wraps(func)(_create_wrapper(func, before_methods, after_methods, {}))
 
     return decorator
 
@@ -245,25 +226,26 @@ def wrap(before=None, after=None, include_base=True, include_inherited=True):
 
         # check if function is a class method
         if "." not in func.__qualname__:
-            @wraps(func)
-            def _module_wrap(*args, **kwargs):
-                # get attrs from calling function
-                attrs = inspect.currentframe().f_back.f_locals
+            factories = {}
 
+            def _get_wrapper(attrs: dict[str, callable]) -> callable:
                 before_methods = _get_methods(before_names, attrs)
                 after_methods = _get_methods(after_names, attrs)
 
-                # get signatures
-                func_signature, before_method_signatures, after_method_signatures = _get_signatures(func, before_methods, after_methods)
-
-                return _wrapper(*args,
-                                func=func,
-                                before_methods=before_methods,
-                                after_methods=after_methods,
-                                func_signature=func_signature,
-                                before_method_signatures=before_method_signatures,
-                                after_method_signatures=after_method_signatures,
-                                **kwargs)
+                # compile once per code of the found methods, hooks defined in the calling function are new objects on every call
+                key = (*map(_method_key, before_methods), None, *map(_method_key, after_methods))
+                return _create_wrapper(func, before_methods, after_methods, factories, key)
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def _module_wrap(*args, **kwargs):
+                    # get attrs from calling function
+                    return await _get_wrapper(inspect.currentframe().f_back.f_locals)(*args, **kwargs)
+            else:
+                @wraps(func)
+                def _module_wrap(*args, **kwargs):
+                    # get attrs from calling function
+                    return _get_wrapper(inspect.currentframe().f_back.f_locals)(*args, **kwargs)
 
             return _module_wrap
 
@@ -1,12 +1,26 @@
 from wiederverwendbar.logger.handlers import (StreamConsoleHandler,
                                               RichConsoleHandler,
-                                              TarRotatingFileHandler)
+                                              TarRotatingFileHandler,
+                                              BufferedFileHandler,
+                                              BoundedQueueHandler)
+from wiederverwendbar.logger.archive_codecs import (ArchiveCodecs)
 from wiederverwendbar.logger.context import LoggingContext
 from wiederverwendbar.logger.file_modes import (FileModes)
+from wiederverwendbar.logger.filters import (BaseFilter,
+                                             RateLimitFilter,
+                                             SamplingFilter,
+                                             DuplicateFilter,
+                                             FilterChain)
+from wiederverwendbar.logger.formatters import (JSON_FIELDS,
+                                                JsonFormatter)
 from wiederverwendbar.logger.helper import (logger_exists,
                                             remove_logger)
+from wiederverwendbar.logger.log_formats import (LogFormats)
 from wiederverwendbar.logger.log_levels import (LogLevels)
 from wiederverwendbar.logger.logger import (Logger)
+from wiederverwendbar.logger.overflow_policies import (OverflowPolicies)
+from wiederverwendbar.logger.process_bridge import (ProcessLogListener,
+                                                   init_process_logging)
 from wiederverwendbar.logger.redirect_level import (redirect_level)
 from wiederverwendbar.logger.settings import (LoggerSettings)
 from wiederverwendbar.logger.singleton import (LoggerSingleton)
@@ -0,0 +1,49 @@
+from enum import Enum
+from typing import Optional
+
+
+class ArchiveCodecs(str, Enum):
+    """
+    Compression codecs of log archives
+    """
+
+    GZ = "gz"
+    XZ = "xz"
+    BZ2 = "bz2"
+    NONE = "none"
+
+    @property
+    def extension(self) -> str:
+        if self == ArchiveCodecs.NONE:
+            return "tar"
+        return f"tar.{self.value}"
+
+    @property
+    def tar_mode(self) -> str:
+        if self == ArchiveCodecs.NONE:
+            return "w"
+        return f"w:{self.value}"
+
+    @property
+    def compression_levels(self) -> range:
+        if self == ArchiveCodecs.NONE:
+            return range(0)
+        if self == ArchiveCodecs.BZ2:
+            return range(1, 10)
+        return range(0, 10)
+
+    def check_compression_level(self, level: Optional[int]) -> None:
+        """
+        Check if the compression level is supported by this codec.
+
+        :param level: Compression level, None for the codec default.
+        :return: None
+        """
+
+        if level is None:
+            return
+        levels = self.compression_levels
+        if level not in levels:
+            if len(levels) == 0:
+                raise ValueError(f"Archive codec '{self.value}' has no compression level, got '{level}'.")
+            raise ValueError(f"Compression level of archive codec '{self.value}' must be between {levels[0]} and {levels[-1]}, got '{level}'.")
@@ -1,11 +1,16 @@
 import inspect
 import logging
+from contextvars import ContextVar
 from typing import Union, Optional
 
 from wiederverwendbar.logger.helper import remove_logger
 from wiederverwendbar.logger.singleton import SubLogger
 
 
+# active logging contexts of the current thread or asyncio task, innermost first
+_active_logging_contexts: ContextVar[tuple["LoggingContext", ...]] = ContextVar("_active_logging_contexts", default=())
+
+
 class LoggingContext:
     class WrappedHandle:
         def __init__(self, saved_handle_method: callable, saved_level):
@@ -14,11 +19,9 @@ class LoggingContext:
             self.contexts = []
 
         def __call__(self, logger, *args, **kwargs) -> None:
-            # get all LoggingContexts in stack
-            logging_contexts = LoggingContext.get_from_stack(inspect.stack()[3:])
-
-            # filter out LoggingContexts that are not in self.contexts
-            logging_contexts = [logging_context for logging_context in logging_contexts if logging_context in self.contexts]
+            # get all active LoggingContexts which are in self.contexts
+            logging_contexts = [logging_context for logging_context in _active_logging_contexts.get()
+                                if logging_context in self.contexts and not logging_context.exited]
 
             # check if some LoggingContexts need update
             for logging_context in logging_contexts:
@@ -49,19 +52,12 @@ class LoggingContext:
 
         @classmethod
         def handle(cls, handle_method: callable, *args, **kwargs) -> None:
-            # get signature of logger.handle
-            signature = inspect.signature(handle_method)
-
-            # bind signature to logger.handle
-            bound_signature = signature.bind(*args, **kwargs)
-
-            # handle with bound signature
-            handle_method(**bound_signature.arguments)
+            handle_method(*args, **kwargs)
 
     class ContextLogger(logging.Logger):
         def __new__(cls, *args, **kwargs):
             # get logging_contexts
-            logging_contexts = LoggingContext.get_from_stack(inspect.stack())
+            logging_contexts = LoggingContext.get_active()
 
             # get logger class before context
             logger_class_before_context = None
@@ -133,6 +129,8 @@ class LoggingContext:
         self.handle_origin_logger = handle_origin_logger
         self._exited = False
         self._wrapped_loggers: Union[tuple, tuple[logging.Logger]] = ()
+        self._known_logger_count = -1
+        self._tokens = []
 
         # get all loggers except context logger to prevent that existing loggers are ContextLogger
         self._get_all_loggers()
@@ -145,35 +143,16 @@ class LoggingContext:
     def __enter__(self) -> "LoggingContext":
         self.update()
 
-        # find the frame where the context manager is used
-        context_frame_index = None
-        stack = inspect.stack()
-        for i, frame_info in enumerate(stack):
-            if frame_info.function != "__enter__":
-                context_frame_index = i
-                break
-        if context_frame_index is None:
-            raise RuntimeError("context_frame_index is None")
-
-        # check if the context manager var is defined in the context frame
-        context_var_exist = False
-        for f_local_name, f_local in dict(stack[context_frame_index].frame.f_locals).items():
-            if isinstance(f_local, self.__class__):
-                context_var_exist = True
-                break
-
-        # get random variable name not used in the context frame
-        if not context_var_exist:
-            while True:
-                var_name = f"logging_context_{id(self)}"
-                if var_name not in stack[context_frame_index].frame.f_locals:
-                    break
-
-            stack[context_frame_index].frame.f_locals[var_name] = self
+        # activate context for the current thread or asyncio task
+        self._tokens.append(_active_logging_contexts.set((self,) + _active_logging_contexts.get()))
 
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # deactivate context
+        if self._tokens:
+            _active_logging_contexts.reset(self._tokens.pop())
+
         self.restore()
 
         # restore logger class
@@ -203,16 +182,26 @@ class LoggingContext:
         return all_loggers
 
     @classmethod
-    def get_from_stack(cls, stack: list[inspect.FrameInfo]) -> list["LoggingContext"]:
-        logging_contexts = []
-        for frame_info in stack:
-            frame = frame_info.frame
-            for var in list(frame.f_locals.values()):
-                if isinstance(var, LoggingContext):
-                    if var.exited:
-                        continue
-                    logging_contexts.append(var)
-        return logging_contexts
+    def get_active(cls) -> list["LoggingContext"]:
+        """
+        Get the active LoggingContexts of the current thread or asyncio task, innermost first.
+
+        :return: Active LoggingContexts.
+        """
+
+        return [logging_context for logging_context in _active_logging_contexts.get() if not logging_context.exited]
+
+    @classmethod
+    def get_from_stack(cls, stack: Optional[list[inspect.FrameInfo]] = None) -> list["LoggingContext"]:
+        """
+        Get the active LoggingContexts, innermost first.
+        Contexts are tracked with contextvars, the stack argument is ignored and only kept for compatibility.
+
+        :param stack: Ignored.
+        :return: Active LoggingContexts.
+        """
+
+        return cls.get_active()
 
     @property
     def exited(self) -> bool:
@@ -226,10 +215,9 @@ class LoggingContext:
     def need_update(self) -> bool:
         if self._exited:
             return False
-        # check if all loggers are wrapped
-        for logger in self._get_all_loggers():
-            if logger not in self._wrapped_loggers:
-                return True
+        # check if loggers were added or removed since the last update
+        if len(logging.root.manager.loggerDict) != self._known_logger_count:
+            return True
 
         # check if some loggers have different level
         if self._use_context_logger_level or self._use_context_logger_level_on_not_set:
@@ -246,6 +234,7 @@ class LoggingContext:
             raise RuntimeError(f"{self} is already exited")
 
         # get all loggers except context logger
+        self._known_logger_count = len(logging.root.manager.loggerDict)
         all_loggers = self._get_all_loggers()
 
         # set _log method for all loggers
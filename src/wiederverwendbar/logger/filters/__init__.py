@@ -0,0 +1,5 @@
+from wiederverwendbar.logger.filters.base_filter import BaseFilter
+from wiederverwendbar.logger.filters.rate_limit_filter import RateLimitFilter
+from wiederverwendbar.logger.filters.sampling_filter import SamplingFilter
+from wiederverwendbar.logger.filters.duplicate_filter import DuplicateFilter
+from wiederverwendbar.logger.filters.filter_chain import FilterChain
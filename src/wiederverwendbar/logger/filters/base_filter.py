@@ -0,0 +1,134 @@
+import logging
+import threading
+from typing import Any, Optional
+
+
+class BaseFilter(logging.Filter):
+    """
+    Base of the volume limiting filters
+
+    Only records of the logger 'name' and its children are limited, like logging.Filter. Records with bypass_level or above always pass.
+    One instance can be added to several handlers, a record is only decided once.
+    The number of suppressed records is noted on the record only after it passed, use FilterChain to combine filters.
+    """
+
+    def __init__(self, name: str = "", bypass_level: Optional[int] = None):
+        super().__init__(name)
+        self.bypass_level = bypass_level
+        self.suppressed = 0
+        self._lock = threading.Lock()
+        self._last_record: Optional[logging.LogRecord] = None
+        self._last_result = True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        result = self.check(record)
+        if result:
+            self.apply_suppressed(record)
+        else:
+            self.restore_suppressed(record)
+        return result
+
+    def check(self, record: logging.LogRecord) -> bool:
+        """
+        Check if a record passes, without noting the suppressed records on it.
+
+        :param record: LogRecord instance.
+        :return: True if the record passes.
+        """
+
+        if not logging.Filter.filter(self, record):
+            return True
+        if self.bypass_level is not None and record.levelno >= self.bypass_level:
+            return True
+        with self._lock:
+            # the same record comes again from the next handler
+            if record is self._last_record:
+                return self._last_result
+            result = self.decide(record)
+            if not result:
+                self.suppressed += 1
+            self._last_record = record
+            self._last_result = result
+        return result
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        """
+        Decide if a record passes. Called once per record with the filter lock held.
+
+        :param record: LogRecord instance.
+        :return: True if the record passes.
+        """
+
+        raise NotImplementedError
+
+    @staticmethod
+    def template_key(record: logging.LogRecord) -> tuple[str, Any]:
+        """
+        Key of the message template of a record.
+
+        :param record: LogRecord instance.
+        :return: Logger name and unformatted message.
+        """
+
+        template = record.__dict__.get("template", record.msg)
+        try:
+            hash(template)
+        except TypeError:
+            template = repr(template)
+        return record.name, template
+
+    def add_suppressed(self, record: logging.LogRecord, count: int, key: Any) -> None:
+        """
+        Note the number of suppressed similar records for the record which passes after them.
+        It's applied with apply_suppressed if the record passes all filters, otherwise given back with restore_suppressed.
+
+        :param record: LogRecord instance.
+        :param count: Number of suppressed records.
+        :param key: Key of the suppressed records, passed to restore.
+        :return: None
+        """
+
+        record.__dict__.setdefault("_suppressed_pending", []).append((self, key, count))
+
+    def restore(self, key: Any, count: int) -> None:
+        """
+        Take back the suppressed records of a record, which was dropped by another filter. They are noted on the next passing record.
+
+        :param key: Key given to add_suppressed.
+        :param count: Number of suppressed records.
+        :return: None
+        """
+
+        ...
+
+    @staticmethod
+    def apply_suppressed(record: logging.LogRecord) -> None:
+        """
+        Note the pending number of suppressed records on a passed record.
+        The unformatted message is kept in the attribute template, so other filters still see the same template.
+
+        :param record: LogRecord instance.
+        :return: None
+        """
+
+        pending = record.__dict__.pop("_suppressed_pending", None)
+        if not pending:
+            return
+        template = record.__dict__.setdefault("template", record.msg)
+        record.suppressed = record.__dict__.get("suppressed", 0) + sum(count for _, _, count in pending)
+        record.msg = f"{template} ({record.suppressed} similar messages suppressed)"
+
+    @staticmethod
+    def restore_suppressed(record: logging.LogRecord) -> None:
+        """
+        Give the pending number of suppressed records of a dropped record back to the filters.
+
+        :param record: LogRecord instance.
+        :return: None
+        """
+
+        pending = record.__dict__.pop("_suppressed_pending", None)
+        if not pending:
+            return
+        for fltr, key, count in pending:
+            fltr.restore(key, count)
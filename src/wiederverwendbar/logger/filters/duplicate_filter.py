@@ -0,0 +1,73 @@
+import logging
+import time
+from typing import Any, Optional
+
+from wiederverwendbar.logger.filters.base_filter import BaseFilter
+
+
+class DuplicateFilter(BaseFilter):
+    """
+    Suppresses repeated records within a time window
+
+    Records are similar if logger, level and message template are equal, with compare_args also the arguments.
+    The first record passes and opens the window, similar records within the window are suppressed.
+    The first similar record after the window passes with the number of suppressed records and opens the next window.
+    """
+
+    def __init__(self,
+                 window: float = 60.0,
+                 compare_args: bool = False,
+                 max_keys: int = 10000,
+                 name: str = "",
+                 bypass_level: Optional[int] = None):
+        """
+        Create a new DuplicateFilter.
+
+        :param window: Seconds in which similar records are suppressed.
+        :param compare_args: Compare the message arguments too.
+        :param max_keys: Maximum number of remembered records, the least recently seen is dropped.
+        :param name: Only suppress records of this logger and its children.
+        :param bypass_level: Records with this level or above are not suppressed. None to suppress all records.
+        """
+
+        super().__init__(name=name, bypass_level=bypass_level)
+        if window <= 0:
+            raise ValueError(f"Window must be greater than 0, got '{window}'.")
+        self.window = window
+        self.compare_args = compare_args
+        self.max_keys = max_keys
+        # key -> [window end, suppressed]
+        self._seen: dict[Any, list] = {}
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        key = self.template_key(record) + (record.levelno,)
+        if self.compare_args:
+            args = record.args
+            try:
+                hash(args)
+            except TypeError:
+                args = repr(args)
+            key += (args,)
+        now = time.monotonic()
+        seen = self._seen.pop(key, None)
+        if seen is None:
+            if len(self._seen) >= self.max_keys:
+                del self._seen[next(iter(self._seen))]
+            self._seen[key] = [now + self.window, 0]
+            return True
+        # reinsert as most recently seen
+        self._seen[key] = seen
+        if now < seen[0]:
+            seen[1] += 1
+            return False
+        if seen[1]:
+            self.add_suppressed(record, seen[1], key)
+        seen[0] = now + self.window
+        seen[1] = 0
+        return True
+
+    def restore(self, key: Any, count: int) -> None:
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None:
+                seen[1] += count
@@ -0,0 +1,30 @@
+import logging
+from typing import Sequence
+
+from wiederverwendbar.logger.filters.base_filter import BaseFilter
+
+
+class FilterChain(BaseFilter):
+    """
+    Runs several filters as one
+
+    The number of suppressed records is only noted on a record which passed all filters.
+    If a later filter drops the record, the earlier filters keep their count for the next passing record.
+    """
+
+    def __init__(self, filters: Sequence[BaseFilter], name: str = ""):
+        """
+        Create a new FilterChain.
+
+        :param filters: Filters in the order they are checked.
+        :param name: Only check records of this logger and its children.
+        """
+
+        super().__init__(name=name)
+        self.filters = tuple(filters)
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        for fltr in self.filters:
+            if not fltr.check(record):
+                return False
+        return True
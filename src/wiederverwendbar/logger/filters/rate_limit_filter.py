@@ -0,0 +1,78 @@
+import logging
+import time
+from typing import Any, Literal, Optional
+
+from wiederverwendbar.logger.filters.base_filter import BaseFilter
+
+RATE_LIMIT_PER_ANNOTATION = Literal["logger", "template"]
+
+
+class RateLimitFilter(BaseFilter):
+    """
+    Token bucket rate limit per logger or per message template
+
+    Every bucket holds up to burst tokens and refills with rate tokens per second. A record takes one token, without a token it is suppressed.
+    The next record of the bucket which passes notes how many were suppressed.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 burst: Optional[int] = None,
+                 per: RATE_LIMIT_PER_ANNOTATION = "template",
+                 max_buckets: int = 10000,
+                 name: str = "",
+                 bypass_level: Optional[int] = logging.WARNING):
+        """
+        Create a new RateLimitFilter.
+
+        :param rate: Records per second and bucket.
+        :param burst: Maximum records at once per bucket. Default is rate, at least 1.
+        :param per: One bucket per logger or per message template.
+        :param max_buckets: Maximum number of buckets, the least recently used bucket is dropped.
+        :param name: Only limit records of this logger and its children.
+        :param bypass_level: Records with this level or above are not limited. None to limit all records.
+        """
+
+        super().__init__(name=name, bypass_level=bypass_level)
+        if rate <= 0:
+            raise ValueError(f"Rate must be greater than 0, got '{rate}'.")
+        if burst is None:
+            burst = max(int(rate), 1)
+        if burst < 1:
+            raise ValueError(f"Burst must be greater than 0, got '{burst}'.")
+        if per not in ("logger", "template"):
+            raise ValueError(f"Unknown rate limit key '{per}'.")
+        self.rate = rate
+        self.burst = burst
+        self.per = per
+        self.max_buckets = max_buckets
+        # key -> [tokens, last refill, suppressed]
+        self._buckets: dict[Any, list] = {}
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        key = record.name if self.per == "logger" else self.template_key(record)
+        now = time.monotonic()
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            bucket = [float(self.burst), now, 0]
+            if len(self._buckets) >= self.max_buckets:
+                del self._buckets[next(iter(self._buckets))]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        # reinsert as most recently used
+        self._buckets[key] = bucket
+        if bucket[0] < 1.0:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1.0
+        if bucket[2]:
+            self.add_suppressed(record, bucket[2], key)
+            bucket[2] = 0
+        return True
+
+    def restore(self, key: Any, count: int) -> None:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket[2] += count
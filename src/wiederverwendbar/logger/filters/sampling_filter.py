@@ -0,0 +1,39 @@
+import logging
+import random
+from typing import Optional
+
+from wiederverwendbar.logger.filters.base_filter import BaseFilter
+
+
+class SamplingFilter(BaseFilter):
+    """
+    Passes a random sample of the records
+
+    Passed records get the attribute sample_rate, so log pipelines can scale counts back up.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 name: str = "",
+                 bypass_level: Optional[int] = logging.WARNING,
+                 seed: Optional[int] = None):
+        """
+        Create a new SamplingFilter.
+
+        :param rate: Probability of a record to pass, between 0 and 1.
+        :param name: Only sample records of this logger and its children.
+        :param bypass_level: Records with this level or above are not sampled. None to sample all records.
+        :param seed: Seed of the random generator.
+        """
+
+        super().__init__(name=name, bypass_level=bypass_level)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Rate must be between 0 and 1, got '{rate}'.")
+        self.rate = rate
+        self._random = random.Random(seed).random
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        if self._random() >= self.rate:
+            return False
+        record.sample_rate = self.rate
+        return True
@@ -0,0 +1,2 @@
+from wiederverwendbar.logger.formatters.json_formatter import (JSON_FIELDS,
+                                                               JsonFormatter)
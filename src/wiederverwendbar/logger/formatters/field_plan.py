@@ -0,0 +1,42 @@
+import logging
+from typing import Any, Callable, Optional, Sequence
+
+# attributes of a plain LogRecord, every record has them, the others are extra attributes
+RECORD_PROPERTIES = frozenset(logging.LogRecord('', 0, '', 0, '', (), (None, None, None), '').__dict__.keys())
+
+
+def compile_field_plan(fields: Sequence[tuple[str, str]],
+                       optional_fields: Sequence[tuple[str, str, str]] = (),
+                       extra: bool = False,
+                       ignored_properties: frozenset = frozenset(),
+                       namespace: Optional[dict[str, Any]] = None) -> Callable[[logging.LogRecord], dict[str, Any]]:
+    """
+    Compile a field plan into a function, which builds a dict from a LogRecord.
+    The dict is built with one dict literal, instead of looping over the fields per record.
+
+    :param fields: Key and value expression of each field, the expression can use 'record' and the names of the namespace.
+    :param optional_fields: Key, condition and value expression of fields, which are only added if the condition is true.
+    :param extra: Add the extra attributes of the record.
+    :param ignored_properties: Attributes which aren't added as extra attributes, besides the ones of a plain LogRecord.
+    :param namespace: Names used by the expressions.
+    :return: Format function.
+    """
+
+    items = [f"{key!r}: {value}" for key, value in fields]
+    lines = ["def format(record):",
+             f"    entry = {{{', '.join(items)}}}"]
+    for key, condition, value in optional_fields:
+        lines += [f"    if {condition}:",
+                  f"        entry[{key!r}] = {value}"]
+    if extra:
+        # records without extra attributes only have the attributes of a plain LogRecord
+        lines += ["    record_dict = record.__dict__",
+                  "    if _record_properties_count != len(record_dict):",
+                  "        for key in record_dict.keys() - _ignored_properties:",
+                  "            entry[key] = record_dict[key]"]
+    lines.append("    return entry")
+    namespace = {**(namespace or {}),
+                 "_ignored_properties": RECORD_PROPERTIES | ignored_properties,
+                 "_record_properties_count": len(RECORD_PROPERTIES)}
+    exec("\n".join(lines) + "\n", namespace)
+    return namespace["format"]
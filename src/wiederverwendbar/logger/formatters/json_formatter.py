@@ -0,0 +1,159 @@
+import json
+import logging
+import time
+from typing import Any, Callable, Literal, Optional, Sequence
+
+from wiederverwendbar.logger.formatters.field_plan import RECORD_PROPERTIES, compile_field_plan
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import msgspec
+except ModuleNotFoundError:
+    msgspec = None
+
+JSON_ENCODER_ANNOTATION = Literal["auto", "orjson", "msgspec", "json"]
+
+# json field -> LogRecord attribute, timestamp and message are built by the formatter
+JSON_FIELDS = {
+    'timestamp': None,
+    'level': 'levelname',
+    'logger': 'name',
+    'message': None,
+    'module': 'module',
+    'function': 'funcName',
+    'line': 'lineno',
+    'file': 'pathname',
+    'thread': 'thread',
+    'thread_name': 'threadName',
+    'process': 'process',
+    'process_name': 'processName'
+}
+DEFAULT_JSON_FIELDS = ('timestamp', 'level', 'logger', 'message')
+
+
+def _get_encoder(encoder: str) -> Callable[[dict], str]:
+    if encoder == "auto":
+        encoder = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+    if encoder == "orjson":
+        if orjson is None:
+            raise RuntimeError("JSON encoder 'orjson' requires the 'orjson' package.")
+        dumps = orjson.dumps
+        return lambda entry: dumps(entry, default=str).decode()
+    if encoder == "msgspec":
+        if msgspec is None:
+            raise RuntimeError("JSON encoder 'msgspec' requires the 'msgspec' package.")
+        encode = msgspec.json.Encoder(enc_hook=str).encode
+        return lambda entry: encode(entry).decode()
+    if encoder == "json":
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+    raise ValueError(f"Unknown JSON encoder '{encoder}'.")
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as JSON lines for log pipelines.
+
+    The field plan is compiled once into a format function. Timestamps are ISO 8601 in UTC.
+    """
+
+    # attributes of a plain LogRecord and the ones other formatters add to it
+    DEFAULT_PROPERTIES = RECORD_PROPERTIES | {'message', 'asctime'}
+
+    def __init__(self,
+                 fields: Optional[Sequence[str]] = None,
+                 extra: bool = True,
+                 encoder: JSON_ENCODER_ANNOTATION = "auto",
+                 **kwargs):
+        """
+        Create a new JsonFormatter.
+
+        :param fields: JSON fields to write, see JSON_FIELDS. None for timestamp, level, logger and message.
+        :param extra: Add contextual extra attributes of the record.
+        :param encoder: JSON encoder. 'auto' uses orjson or msgspec if installed, otherwise json.
+        :param kwargs: Keyword arguments of logging.Formatter.
+        """
+
+        super().__init__(**kwargs)
+        if fields is None:
+            fields = DEFAULT_JSON_FIELDS
+        for field in fields:
+            if field not in JSON_FIELDS:
+                raise ValueError(f"Unknown JSON field '{field}'.")
+        self.fields = tuple(fields)
+        self.extra = extra
+        self._encode = _get_encoder(encoder)
+        self._last_second: Optional[int] = None
+        self._last_second_text = ""
+        self._format = self._compile_format()
+
+    def _compile_format(self) -> Callable[[logging.LogRecord], dict[str, Any]]:
+        fields = []
+        for field in self.fields:
+            attribute = JSON_FIELDS[field]
+            if field == 'timestamp':
+                value = "_timestamp(record)"
+            elif field == 'message':
+                value = "record.getMessage()"
+            else:
+                value = f"record.{attribute}"
+            fields.append((field, value))
+        return compile_field_plan(fields=fields,
+                                  optional_fields=[('exception', "record.exc_info", "_exception(record)"),
+                                                   ('stack', "record.stack_info", "_stack(record.stack_info)")],
+                                  extra=self.extra,
+                                  ignored_properties=self.DEFAULT_PROPERTIES,
+                                  namespace={"_timestamp": self.format_timestamp,
+                                             "_exception": self.format_exception,
+                                             "_stack": self.formatStack})
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Formats LogRecord into a JSON line without line break.
+
+        :param record: LogRecord instance.
+        :return: str
+        """
+
+        return self._encode(self._format(record))
+
+    def format_entry(self, record: logging.LogRecord) -> dict[str, Any]:
+        """
+        Formats LogRecord into python dictionary, before JSON encoding.
+
+        :param record: LogRecord instance.
+        :return: dict
+        """
+
+        return self._format(record)
+
+    def format_timestamp(self, record: logging.LogRecord) -> str:
+        """
+        Formats the creation time of a LogRecord as ISO 8601 in UTC.
+
+        :param record: LogRecord instance.
+        :return: str
+        """
+
+        # records mostly arrive in the same second, reuse its text
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second_text = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+            self._last_second = second
+        return f"{self._last_second_text}.{int(record.msecs):03d}Z"
+
+    def format_exception(self, record: logging.LogRecord) -> str:
+        """
+        Formats the exception information of a LogRecord.
+
+        :param record: LogRecord instance with exc_info.
+        :return: str
+        """
+
+        # cache the formatted traceback like logging.Formatter does
+        if not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        return record.exc_text
@@ -6,3 +6,5 @@ except ModuleNotFoundError:
     RichConsoleHandler = None
 
 from wiederverwendbar.logger.handlers.tar_rotating_file_handler import TarRotatingFileHandler
+from wiederverwendbar.logger.handlers.buffered_file_handler import BufferedFileHandler
+from wiederverwendbar.logger.handlers.bounded_queue_handler import BoundedQueueHandler
@@ -0,0 +1,114 @@
+import copy
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from wiederverwendbar.logger.overflow_policies import OverflowPolicies
+
+
+class _BoundedQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # the queue may be full, wait until the sentinel fits
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler with a bounded queue and a listener thread which passes the records to the target handlers.
+    The calling thread only merges the arguments into the message and puts the record into the queue.
+    Exception and stack info are kept, so the target handlers format them like without the queue.
+
+    If the queue is full, the overflow policy decides what happens:
+        - block: wait until the record fits
+        - drop_newest: drop the new record
+        - drop_oldest: drop the oldest queued record
+        - drop_below_level: drop the new record if its level is below overflow_level, otherwise wait
+
+    Closing the handler stops the listener after all queued records are handled and closes the target handlers.
+    """
+
+    def __init__(self,
+                 *handlers: logging.Handler,
+                 name: Optional[str] = None,
+                 queue_size: int = 10000,
+                 overflow_policy: OverflowPolicies = OverflowPolicies.BLOCK,
+                 overflow_level: int = logging.WARNING):
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be greater than 0, got '{queue_size}'.")
+        super().__init__(queue.Queue(maxsize=queue_size))
+        if name is not None:
+            self.set_name(name)
+        self.handlers = handlers
+        self.overflow_policy = OverflowPolicies(overflow_policy)
+        self.overflow_level = overflow_level
+        self.dropped = 0
+        self.listener = _BoundedQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the listener runs in this process, only the arguments may change after the call
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.overflow_policy == OverflowPolicies.BLOCK:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            ...
+        if self.overflow_policy == OverflowPolicies.DROP_NEWEST:
+            self.dropped += 1
+        elif self.overflow_policy == OverflowPolicies.DROP_OLDEST:
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                    self.queue.task_done()
+                except queue.Empty:
+                    ...
+                else:
+                    if item is self.listener._sentinel:
+                        # the listener is stopping, keep the sentinel and drop the new record
+                        self.queue.put_nowait(item)
+                        self.dropped += 1
+                        return
+                    self.dropped += 1
+                try:
+                    self.queue.put_nowait(record)
+                    return
+                except queue.Full:
+                    ...
+        elif record.levelno < self.overflow_level:
+            self.dropped += 1
+        else:
+            self.queue.put(record)
+
+    def flush(self) -> None:
+        """
+        Wait until all queued records are handled and flush the target handlers.
+
+        :return: None
+        """
+
+        if self.listener._thread is not None:
+            self.queue.join()
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        """
+        Stop the listener after all queued records are handled and close the target handlers.
+
+        :return: None
+        """
+
+        if self.listener._thread is not None:
+            self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+        super().close()
@@ -0,0 +1,204 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Union, Optional
+
+from wiederverwendbar.logger.archive_codecs import ArchiveCodecs
+from wiederverwendbar.logger.file_modes import FileModes
+from wiederverwendbar.logger.handlers.tar_rotating_file_handler import TarRotatingFileHandler
+
+
+class BufferedFileHandler(TarRotatingFileHandler):
+    """
+    TarRotatingFileHandler for high log volumes
+
+    The calling thread only formats the record and appends it to an in-memory buffer. A writer thread writes the buffer in big chunks,
+    rotates the file by size between records and archives the backups like TarRotatingFileHandler.
+    The file is synced to disk every fsync_interval seconds and as soon as a record with fsync_level or above was written.
+
+    If the buffer holds more than max_buffer_size characters, the calling thread waits for the writer.
+    """
+
+    def __init__(self,
+                 name: str,
+                 filename: Union[str, Path],
+                 mode: FileModes = FileModes.a,
+                 max_bytes: int = 0,
+                 backup_count: int = 0,
+                 encoding: Optional[str] = None,
+                 delay: bool = False,
+                 archive_backup_count: int = 0,
+                 archive_codec: ArchiveCodecs = ArchiveCodecs.GZ,
+                 archive_compression_level: Optional[int] = None,
+                 archive_in_background: bool = False,
+                 on_archived: Optional[Callable[[Path, float], None]] = None,
+                 buffer_size: int = 1024 * 1024,
+                 max_buffer_size: Optional[int] = None,
+                 flush_interval: float = 1.0,
+                 fsync_interval: Optional[float] = 5.0,
+                 fsync_level: int = logging.ERROR):
+        """
+        Create a new BufferedFileHandler.
+
+        :param buffer_size: Number of buffered characters which wakes up the writer before the flush interval.
+        :param max_buffer_size: Number of buffered characters at which the calling threads wait for the writer. Default is 8 * buffer_size.
+        :param flush_interval: Maximum seconds a record stays in the buffer.
+        :param fsync_interval: Seconds between syncs of the file to disk. None for no periodical sync.
+        :param fsync_level: Records with this level or above are synced to disk immediately.
+        The other parameters are the same as for TarRotatingFileHandler.
+        """
+
+        super().__init__(name=name,
+                         filename=filename,
+                         mode=mode,
+                         max_bytes=max_bytes,
+                         backup_count=backup_count,
+                         encoding=encoding,
+                         delay=delay,
+                         archive_backup_count=archive_backup_count,
+                         archive_codec=archive_codec,
+                         archive_compression_level=archive_compression_level,
+                         archive_in_background=archive_in_background,
+                         on_archived=on_archived)
+        if buffer_size < 1:
+            raise ValueError(f"Buffer size must be greater than 0, got '{buffer_size}'.")
+        if max_buffer_size is None:
+            max_buffer_size = buffer_size * 8
+        if max_buffer_size < buffer_size:
+            raise ValueError(f"Max buffer size must be greater or equal to buffer size, got '{max_buffer_size}'.")
+        self.buffer_size = buffer_size
+        self.max_buffer_size = max_buffer_size
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.fsync_level = fsync_level
+
+        self._buffer: list[str] = []
+        self._buffer_chars = 0
+        self._buffer_condition = threading.Condition()
+        self._fsync_requested = False
+        self._flush_requested = 0
+        self._flushed = 0
+        self._stopping = False
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        self._writer_thread = threading.Thread(name=f"{self.__class__.__name__}-{self.name}-writer", target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_condition:
+            while self._buffer_chars >= self.max_buffer_size and not self._stopping:
+                self._buffer_condition.wait()
+            self._buffer.append(msg)
+            self._buffer_chars += len(msg)
+            if record.levelno >= self.fsync_level:
+                self._fsync_requested = True
+                self._buffer_condition.notify_all()
+            elif self._buffer_chars >= self.buffer_size:
+                self._buffer_condition.notify_all()
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._buffer_condition:
+                self._buffer_condition.wait_for(lambda: (self._buffer_chars >= self.buffer_size
+                                                         or self._fsync_requested
+                                                         or self._flush_requested > self._flushed
+                                                         or self._stopping),
+                                                timeout=self.flush_interval)
+                chunk = self._buffer
+                self._buffer = []
+                self._buffer_chars = 0
+                fsync = self._fsync_requested
+                self._fsync_requested = False
+                flush_requested = self._flush_requested
+                stopping = self._stopping
+                # wake up waiting emitters
+                self._buffer_condition.notify_all()
+
+            try:
+                self._write(chunk, fsync)
+            except Exception:
+                self.handleError(None)
+
+            with self._buffer_condition:
+                self._flushed = flush_requested
+                self._buffer_condition.notify_all()
+            if stopping:
+                return
+
+    def _write(self, chunk: list[str], fsync: bool) -> None:
+        if chunk:
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0:
+                # rotate between records, like RotatingFileHandler.shouldRollover
+                self.stream.seek(0, 2)
+                position = self.stream.tell()
+                part = []
+                for msg in chunk:
+                    if position > 0 and position + len(msg) >= self.maxBytes:
+                        self.stream.write("".join(part))
+                        part = []
+                        self.doRollover()
+                        if self.stream is None:
+                            self.stream = self._open()
+                        position = 0
+                    part.append(msg)
+                    position += len(msg)
+                self.stream.write("".join(part))
+            else:
+                self.stream.write("".join(chunk))
+            self.stream.flush()
+            self._unsynced = True
+
+        if not self._unsynced or self.stream is None:
+            return
+        now = time.monotonic()
+        if fsync or (self.fsync_interval is not None and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self.stream.fileno())
+            self._last_fsync = now
+            self._unsynced = False
+
+    def doRollover(self):
+        # sync the finished file before it gets rotated
+        if self.stream is not None and self._unsynced:
+            self.stream.flush()
+            os.fsync(self.stream.fileno())
+            self._unsynced = False
+        super().doRollover()
+
+    def flush(self) -> None:
+        """
+        Wait until the writer has written all buffered records.
+
+        :return: None
+        """
+
+        if not self._writer_thread.is_alive():
+            return
+        with self._buffer_condition:
+            self._flush_requested += 1
+            target = self._flush_requested
+            self._buffer_condition.notify_all()
+            self._buffer_condition.wait_for(lambda: self._flushed >= target or not self._writer_thread.is_alive())
+
+    def close(self) -> None:
+        """
+        Write all buffered records, sync the file to disk and stop the writer.
+
+        :return: None
+        """
+
+        if self._writer_thread.is_alive():
+            with self._buffer_condition:
+                self._stopping = True
+                self._fsync_requested = True
+                self._buffer_condition.notify_all()
+            self._writer_thread.join()
+        super().close()
@@ -1,17 +1,28 @@
 import os
+import queue
+import re
 import tarfile
+import threading
+import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Union, Optional
+from typing import Callable, Union, Optional
 
+from wiederverwendbar.logger.archive_codecs import ArchiveCodecs
 from wiederverwendbar.logger.file_modes import FileModes
 
 
 class TarRotatingFileHandler(RotatingFileHandler):
     """
-    RotatingFileHandler that archives old log files as tar.gz files
+    RotatingFileHandler that archives old log files as tar files
+
+    If the backup count limit is reached, the backups are renamed to staging files and archived by a background thread,
+    so the logging thread only pays for the renames. Existing archives are indexed once at start, the oldest archives above
+    archive_backup_count are deleted. The duration of the last archive run is stored in last_archive_duration and passed to on_archived.
     """
 
+    STAGING_SUFFIX = ".archiving"
+
     def __init__(self,
                  name: str,
                  filename: Union[str, Path],
@@ -20,11 +31,57 @@ class TarRotatingFileHandler(RotatingFileHandler):
                  backup_count: int = 0,
                  encoding: Optional[str] = None,
                  delay: bool = False,
-                 archive_backup_count: int = 0):
+                 archive_backup_count: int = 0,
+                 archive_codec: ArchiveCodecs = ArchiveCodecs.GZ,
+                 archive_compression_level: Optional[int] = None,
+                 archive_in_background: bool = False,
+                 on_archived: Optional[Callable[[Path, float], None]] = None):
         super().__init__(filename, mode.value, max_bytes, backup_count, encoding, delay)
         self.set_name(name)
         self.archiveBackupCount = archive_backup_count
         self.archiveBaseFilename = self.baseFilename[:self.baseFilename.rfind('.')]
+        self.archiveCodec = ArchiveCodecs(archive_codec)
+        self.archiveCodec.check_compression_level(archive_compression_level)
+        self.archiveCompressionLevel = archive_compression_level
+        self.archiveInBackground = archive_in_background
+        self.onArchived = on_archived
+        self.last_archive_duration: Optional[float] = None
+
+        # index existing backups and archives once
+        backup_log_pattern = self.baseFilename + '.%d'
+        self._backup_logs = sum(1 for i in range(1, self.backupCount + 1) if os.path.exists(backup_log_pattern % i))
+        self._archive_index_lock = threading.Lock()
+        self._archives: list[tuple[int, Path]] = self._find_archives()
+        self._archive_number = self._archives[-1][0] + 1 if self._archives else 0
+
+        # background archiver
+        self._archive_queue: queue.Queue = queue.Queue()
+        self._archive_thread: Optional[threading.Thread] = None
+
+        # archive staging files left by an interrupted archiver
+        staging_files = sorted(Path(self.baseFilename).parent.glob(Path(self.baseFilename).name + '.*' + self.STAGING_SUFFIX))
+        if staging_files:
+            self._submit_archive(staging_files)
+
+    @property
+    def archives(self) -> list[Path]:
+        """
+        Existing archives, oldest first.
+        """
+
+        with self._archive_index_lock:
+            return [path for _, path in self._archives]
+
+    def _find_archives(self) -> list[tuple[int, Path]]:
+        base = Path(self.archiveBaseFilename)
+        pattern = re.compile(re.escape(base.name) + r'_logs\.(\d+)\.tar(\.(gz|xz|bz2))?$')
+        archives = []
+        for path in base.parent.glob(base.name + '_logs.*'):
+            match = pattern.match(path.name)
+            if match is not None:
+                archives.append((int(match.group(1)), path))
+        archives.sort()
+        return archives
 
     def doRollover(self):
         # rotate and delete old log files
@@ -32,29 +89,93 @@ class TarRotatingFileHandler(RotatingFileHandler):
 
         # archive old log files if backupCount limit is reached
         if self.backupCount > 0:
-            backup_log_pattern = self.baseFilename + '.%d'
-            # get all existing backup logs
-            backup_logs = [Path(backup_log_pattern % i) for i in range(1, self.backupCount + 1)]
-            backup_logs = [log for log in backup_logs if log.exists()]
+            self._backup_logs = min(self._backup_logs + 1, self.backupCount)
 
             # check if backup count limit is reached
-            if len(backup_logs) >= self.backupCount:
-                archive_filename_pattern = self.archiveBaseFilename + '_logs.%d.tar.gz'
-                archive_count = 0
-                # add all backup logs to tar archive
-                archive_filename = archive_filename_pattern % archive_count
-                while Path(archive_filename).exists():
-                    archive_count += 1
-                    archive_filename = archive_filename_pattern % archive_count
-
-                    # if archive count limit is reached, delete oldest archive
-                    if archive_count > self.archiveBackupCount:
-                        archive_count = 0
-                        archive_filename = archive_filename_pattern % archive_count
-                        os.remove(archive_filename)
-                        break
-
-                with tarfile.open(archive_filename, 'w:gz') as tar:
-                    for log in backup_logs:
-                        tar.add(log, arcname=log.name)
-                        os.remove(log)
+            if self._backup_logs >= self.backupCount:
+                # move backups out of the way of the next rotations, the archiver works on the staging files
+                number = self._archive_number
+                staging_files = []
+                for i in range(1, self.backupCount + 1):
+                    backup_log = self.baseFilename + '.%d' % i
+                    staging_file = Path(f"{backup_log}.{number}{self.STAGING_SUFFIX}")
+                    try:
+                        os.rename(backup_log, staging_file)
+                    except FileNotFoundError:
+                        continue
+                    staging_files.append(staging_file)
+                self._backup_logs = 0
+                if staging_files:
+                    self._submit_archive(staging_files)
+
+    def _submit_archive(self, staging_files: list[Path]) -> None:
+        with self._archive_index_lock:
+            number = self._archive_number
+            self._archive_number += 1
+        archive_filename = Path(f"{self.archiveBaseFilename}_logs.{number}.{self.archiveCodec.extension}")
+        if not self.archiveInBackground:
+            self._archive(number, archive_filename, staging_files)
+            return
+        if self._archive_thread is None or not self._archive_thread.is_alive():
+            self._archive_thread = threading.Thread(name=f"{self.__class__.__name__}-{self.name}-archiver", target=self._archive_loop, daemon=True)
+            self._archive_thread.start()
+        self._archive_queue.put((number, archive_filename, staging_files))
+
+    def _archive_loop(self) -> None:
+        while True:
+            job = self._archive_queue.get()
+            try:
+                if job is None:
+                    return
+                self._archive(*job)
+            except Exception:
+                self.handleError(None)
+            finally:
+                self._archive_queue.task_done()
+
+    def _archive(self, number: int, archive_filename: Path, staging_files: list[Path]) -> None:
+        start = time.perf_counter()
+        kwargs = {}
+        if self.archiveCompressionLevel is not None:
+            if self.archiveCodec == ArchiveCodecs.XZ:
+                kwargs["preset"] = self.archiveCompressionLevel
+            elif self.archiveCodec != ArchiveCodecs.NONE:
+                kwargs["compresslevel"] = self.archiveCompressionLevel
+        with tarfile.open(archive_filename, self.archiveCodec.tar_mode, **kwargs) as tar:
+            for staging_file in staging_files:
+                tar.add(staging_file, arcname=staging_file.name[:staging_file.name.rfind('.', 0, -len(self.STAGING_SUFFIX))])
+        for staging_file in staging_files:
+            os.remove(staging_file)
+
+        # update index and delete the oldest archives if archive count limit is reached
+        with self._archive_index_lock:
+            self._archives.append((number, archive_filename))
+            self._archives.sort()
+            expired = self._archives[:max(len(self._archives) - (self.archiveBackupCount + 1), 0)]
+            del self._archives[:len(expired)]
+        for _, path in expired:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                ...
+
+        self.last_archive_duration = time.perf_counter() - start
+        if self.onArchived is not None:
+            self.onArchived(archive_filename, self.last_archive_duration)
+
+    def wait_for_archives(self) -> None:
+        """
+        Wait until all submitted archives are written.
+
+        :return: None
+        """
+
+        if self._archive_thread is not None and self._archive_thread.is_alive():
+            self._archive_queue.join()
+
+    def close(self):
+        self.wait_for_archives()
+        if self._archive_thread is not None and self._archive_thread.is_alive():
+            self._archive_queue.put(None)
+            self._archive_thread.join()
+        super().close()
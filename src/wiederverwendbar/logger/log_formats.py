@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class LogFormats(str, Enum):
+    """
+    Log output formats
+    """
+
+    TEXT = "text"
+    JSON = "json"
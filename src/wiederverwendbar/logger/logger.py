@@ -1,6 +1,10 @@
 import logging
+from typing import Optional
 
-from wiederverwendbar.logger.handlers import RichConsoleHandler, StreamConsoleHandler, TarRotatingFileHandler
+from wiederverwendbar.logger.filters import RateLimitFilter, SamplingFilter, DuplicateFilter, FilterChain
+from wiederverwendbar.logger.formatters import JsonFormatter
+from wiederverwendbar.logger.handlers import RichConsoleHandler, StreamConsoleHandler, TarRotatingFileHandler, BufferedFileHandler, BoundedQueueHandler
+from wiederverwendbar.logger.log_formats import LogFormats
 from wiederverwendbar.logger.settings import LoggerSettings
 
 
@@ -16,6 +20,7 @@ class Logger(logging.Logger):
         # add null handler
         null_handler = logging.NullHandler()
         self.addHandler(null_handler)
+        handlers = []
 
         # add console handler
         if self.settings.console:
@@ -36,8 +41,8 @@ class Logger(logging.Logger):
                 )
             if self.settings.console_level is not None:
                 ch.setLevel(self.settings.console_level.value)
-            ch.setFormatter(logging.Formatter(self.settings.console_format))
-            self.addHandler(ch)
+            ch.setFormatter(self.create_formatter(self.settings.console_formatter, self.settings.console_format, self.settings.console_json_fields))
+            handlers.append(ch)
 
         # add file handler
         if self.settings.file:
@@ -49,7 +54,7 @@ class Logger(logging.Logger):
             if not self.settings.file_path.parent.exists():
                 raise FileNotFoundError(f"Log file path parent directory not exist: '{self.settings.file_path.parent}'")
 
-            fh = TarRotatingFileHandler(
+            file_handler_kwargs = dict(
                 name=name,
                 filename=self.settings.file_path,
                 mode=self.settings.file_mode,
@@ -57,12 +62,78 @@ class Logger(logging.Logger):
                 backup_count=self.settings.file_backup_count,
                 encoding=self.settings.file_encoding,
                 delay=self.settings.file_delay,
-                archive_backup_count=self.settings.file_archive_backup_count
+                archive_backup_count=self.settings.file_archive_backup_count,
+                archive_codec=self.settings.file_archive_codec,
+                archive_compression_level=self.settings.file_archive_compression_level,
+                archive_in_background=self.settings.file_archive_in_background
             )
+            if self.settings.file_buffered:
+                fh = BufferedFileHandler(
+                    **file_handler_kwargs,
+                    buffer_size=self.settings.file_buffer_size,
+                    flush_interval=self.settings.file_flush_interval,
+                    fsync_interval=self.settings.file_fsync_interval,
+                    fsync_level=self.settings.file_fsync_level.get_level_number()
+                )
+            else:
+                fh = TarRotatingFileHandler(**file_handler_kwargs)
             if self.settings.file_level is not None:
                 fh.setLevel(self.settings.file_level.value)
-            fh.setFormatter(logging.Formatter(self.settings.file_format))
-            self.addHandler(fh)
+            fh.setFormatter(self.create_formatter(self.settings.file_formatter, self.settings.file_format, self.settings.file_json_fields))
+            handlers.append(fh)
+
+        # add handlers, through a queue if enabled
+        if self.settings.queue and handlers:
+            qh = BoundedQueueHandler(
+                *handlers,
+                name=name,
+                queue_size=self.settings.queue_size,
+                overflow_policy=self.settings.queue_overflow_policy,
+                overflow_level=self.settings.queue_overflow_level.get_level_number()
+            )
+            handlers = [qh]
+        # filters are on the handlers, so they also see the records of the child loggers
+        filters = self.create_filters()
+        for handler in handlers:
+            for fltr in filters:
+                handler.addFilter(fltr)
+            self.addHandler(handler)
 
         # log first message
         self.debug(f"Logger '{name}' initialized.")
+
+    def create_filters(self) -> list[logging.Filter]:
+        """
+        Create the volume limiting filters of the settings. They are combined in one FilterChain, which is shared by all handlers.
+
+        :return: list of logging.Filter
+        """
+
+        filters = []
+        bypass_level = self.settings.filter_bypass_level.get_level_number()
+        if self.settings.filter_duplicate_window is not None:
+            filters.append(DuplicateFilter(window=self.settings.filter_duplicate_window, bypass_level=bypass_level))
+        if self.settings.filter_rate_limit is not None:
+            filters.append(RateLimitFilter(rate=self.settings.filter_rate_limit,
+                                           burst=self.settings.filter_rate_limit_burst,
+                                           per=self.settings.filter_rate_limit_per,
+                                           bypass_level=bypass_level))
+        if self.settings.filter_sampling_rate is not None:
+            filters.append(SamplingFilter(rate=self.settings.filter_sampling_rate, bypass_level=bypass_level))
+        if not filters:
+            return []
+        return [FilterChain(filters)]
+
+    def create_formatter(self, formatter: LogFormats, text_format: str, json_fields: Optional[list[str]]) -> logging.Formatter:
+        """
+        Create the formatter of a handler.
+
+        :param formatter: Text or JSON lines.
+        :param text_format: Format string for text.
+        :param json_fields: JSON fields for JSON lines.
+        :return: logging.Formatter
+        """
+
+        if formatter == LogFormats.JSON:
+            return JsonFormatter(fields=json_fields, extra=self.settings.json_extra, encoder=self.settings.json_encoder)
+        return logging.Formatter(text_format)
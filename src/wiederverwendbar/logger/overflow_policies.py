@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class OverflowPolicies(str, Enum):
+    """
+    Overflow policies of bounded log queues
+    """
+
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    DROP_BELOW_LEVEL = "drop_below_level"
@@ -0,0 +1,148 @@
+import logging
+import multiprocessing
+import threading
+from logging.handlers import QueueHandler
+from typing import Any, Optional
+
+from wiederverwendbar.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+def _get_target_logger() -> logging.Logger:
+    # records of SubLoggers end at the LoggerSingleton, it has no parent
+    from wiederverwendbar.logger.singleton import LoggerSingleton
+
+    logger_singleton = Singleton.singleton_map.get(LoggerSingleton.__name__)
+    if logger_singleton is not None:
+        return logger_singleton
+    return logging.getLogger()
+
+
+def init_process_logging(queue: Any, level: int = logging.NOTSET) -> None:
+    """
+    Send all records of this process to a ProcessLogListener. Use it as initializer of process pools.
+
+    The handlers of the LoggerSingleton, or of the root logger if there is none, are replaced with one QueueHandler.
+    Inherited handlers are removed without closing them, they belong to the parent process.
+
+    :param queue: Queue of the ProcessLogListener.
+    :param level: Level of the LoggerSingleton or root logger in this process. NOTSET keeps the current level.
+    :return: None
+    """
+
+    target_logger = _get_target_logger()
+    for handler in list(target_logger.handlers):
+        target_logger.removeHandler(handler)
+    target_logger.addHandler(QueueHandler(queue))
+    if level != logging.NOTSET:
+        target_logger.setLevel(level)
+
+
+class ProcessLogListener:
+    """
+    Handles the records of child processes in the parent process
+
+    Child processes send their records with init_process_logging over a multiprocessing queue.
+    A listener thread passes them to the logger of the same name in this process, so only the parent owns the handlers and files.
+
+    Usage:
+        with ProcessLogListener() as listener:
+            with multiprocessing.Pool(4, **listener.pool_kwargs()) as pool:
+                ...
+    """
+
+    _sentinel = None
+
+    def __init__(self,
+                 queue: Optional[Any] = None,
+                 context: Optional[Any] = None,
+                 level: int = logging.NOTSET):
+        """
+        Create a new ProcessLogListener.
+
+        :param queue: Queue to listen to. Default is a new queue of the multiprocessing context.
+        :param context: Multiprocessing context of the default queue. Default is the default context.
+        :param level: Level of the loggers in the child processes, passed to init_process_logging.
+        """
+
+        if queue is None:
+            if context is None:
+                context = multiprocessing.get_context()
+            queue = context.Queue(-1)
+        self.queue = queue
+        self.level = level
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ProcessLogListener":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """
+        Start the listener thread.
+
+        :return: None
+        """
+
+        if self.running:
+            raise RuntimeError(f"{self.__class__.__name__} already started.")
+        self._thread = threading.Thread(name=self.__class__.__name__, target=self._listen, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Handle all queued records and stop the listener thread.
+
+        :return: None
+        """
+
+        if not self.running:
+            return
+        self.queue.put(self._sentinel)
+        self._thread.join()
+        self._thread = None
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                record = self.queue.get()
+            except (EOFError, OSError):
+                return
+            if record is self._sentinel:
+                return
+            try:
+                self.handle(record)
+            except Exception:
+                logger.exception(f"Could not handle record of logger '{record.name}' from process {record.process}.")
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Handle a record of a child process.
+
+        :param record: LogRecord instance.
+        :return: None
+        """
+
+        if record.name == "root":
+            target_logger = logging.getLogger()
+        else:
+            target_logger = logging.getLogger(record.name)
+        # the level was checked in the child process already
+        target_logger.handle(record)
+
+    def pool_kwargs(self) -> dict[str, Any]:
+        """
+        Keyword arguments for multiprocessing.Pool or concurrent.futures.ProcessPoolExecutor to install init_process_logging in the workers.
+
+        :return: dict with initializer and initargs
+        """
+
+        return {"initializer": init_process_logging, "initargs": (self.queue, self.level)}
@@ -3,12 +3,17 @@ import logging
 from pathlib import Path
 from typing import Any, Optional, Union
 
-from pydantic import field_validator
+from pydantic import field_validator, ValidationInfo
 
 from wiederverwendbar.console import OutFiles
 from wiederverwendbar.default import Default
+from wiederverwendbar.logger.archive_codecs import ArchiveCodecs
 from wiederverwendbar.logger.file_modes import FileModes
+from wiederverwendbar.logger.filters.rate_limit_filter import RATE_LIMIT_PER_ANNOTATION
+from wiederverwendbar.logger.formatters.json_formatter import JSON_ENCODER_ANNOTATION, JSON_FIELDS
+from wiederverwendbar.logger.log_formats import LogFormats
 from wiederverwendbar.logger.log_levels import LogLevels
+from wiederverwendbar.logger.overflow_policies import OverflowPolicies
 from wiederverwendbar.printable_settings import PrintableSettings, Field
 
 
@@ -17,6 +22,9 @@ class LoggerSettings(PrintableSettings):
     console: bool = Field(default=True, title="Console Logging", description="Whether to log to the console")
     console_level: Union[Default, LogLevels] = Field(default=Default(), title="Console Log Level", description="The log level for the console")
     console_format: str = Field(default="%(name)s - %(message)s", title="Console Log Format", description="The log format for the console")
+    console_formatter: LogFormats = Field(default=LogFormats.TEXT, title="Console Formatter", description="Whether to log text with the console format or JSON lines")
+    console_json_fields: Optional[list[str]] = Field(default=None, title="Console JSON Fields",
+                                                     description="The JSON fields for the console. Default is timestamp, level, logger and message")
     console_width: int = Field(default=80, title="Console Width", ge=0, description="The width of the console")
     console_outfile: OutFiles = Field(default=OutFiles.STDOUT, title="Console Outfile", description="The console outfile")
     console_rich_markup: bool = Field(default=True, title="Rich Markup", description="Whether to use rich markup in the console")
@@ -27,12 +35,45 @@ class LoggerSettings(PrintableSettings):
     file_path: Optional[Path] = Field(default=None, title="Log File Path", description="The path of the log file")
     file_level: Union[Default, LogLevels] = Field(default=Default(), title="File Log Level", description="The log level for the file")
     file_format: str = Field(default="%(asctime)s - %(name)s - %(levelname)s - %(message)s", title="File Log Format", description="The log format for the file")
+    file_formatter: LogFormats = Field(default=LogFormats.TEXT, title="File Formatter", description="Whether to log text with the file format or JSON lines")
+    file_json_fields: Optional[list[str]] = Field(default=None, title="File JSON Fields",
+                                                  description="The JSON fields for the file. Default is timestamp, level, logger and message")
     file_mode: FileModes = Field(default=FileModes.a, title="File Mode", description="The file mode")
     file_max_bytes: int = Field(default=1024 * 1024 * 10, title="Max File Size", ge=1024, description="The maximum size of the log file. Default is 10MB")
     file_backup_count: int = Field(default=5, title="Backup Log Files", description="The number of backup log files to keep")
     file_encoding: str = Field(default="utf-8", title="File Encoding", description="The encoding of the log file")
     file_delay: bool = Field(default=False, title="Delay File Logging", description="Whether to delay the file logging")
     file_archive_backup_count: int = Field(default=5, title="Backup Log Archives", ge=0, description="The number of backup log archives to keep")
+    file_archive_codec: ArchiveCodecs = Field(default=ArchiveCodecs.GZ, title="Archive Codec", description="The compression codec of the log archives")
+    file_archive_compression_level: Optional[int] = Field(default=None, title="Archive Compression Level", ge=0, le=9,
+                                                          description="The compression level of the log archives. Default is the codec default")
+    file_archive_in_background: bool = Field(default=False, title="Archive in Background", description="Whether to archive the log files in a background thread")
+    file_buffered: bool = Field(default=False, title="Buffered File Logging",
+                                description="Whether to buffer the file records in memory and write them in chunks from a writer thread")
+    file_buffer_size: int = Field(default=1024 * 1024, title="File Buffer Size", ge=1, description="The number of buffered characters which triggers a write. Default is 1M")
+    file_flush_interval: float = Field(default=1.0, title="File Flush Interval", gt=0, description="The maximum seconds a record stays in the file buffer")
+    file_fsync_interval: Optional[float] = Field(default=5.0, title="File Fsync Interval", gt=0,
+                                                 description="The seconds between syncs of the log file to disk. None for no periodical sync")
+    file_fsync_level: LogLevels = Field(default=LogLevels.ERROR, title="File Fsync Level", description="Records with this level or above are synced to disk immediately")
+    json_extra: bool = Field(default=True, title="JSON Extra Fields", description="Whether to add the extra attributes of the records to the JSON lines")
+    json_encoder: JSON_ENCODER_ANNOTATION = Field(default="auto", title="JSON Encoder",
+                                                  description="The JSON encoder. 'auto' uses orjson or msgspec if installed, otherwise json")
+    filter_rate_limit: Optional[float] = Field(default=None, title="Rate Limit", gt=0,
+                                               description="The maximum records per second per logger or message template. None for no rate limit")
+    filter_rate_limit_burst: Optional[int] = Field(default=None, title="Rate Limit Burst", ge=1,
+                                                   description="The maximum records at once per logger or message template. Default is the rate limit")
+    filter_rate_limit_per: RATE_LIMIT_PER_ANNOTATION = Field(default="template", title="Rate Limit Per", description="Whether to rate limit per logger or per message template")
+    filter_sampling_rate: Optional[float] = Field(default=None, title="Sampling Rate", ge=0, le=1,
+                                                  description="The probability of a record to be logged. None for no sampling")
+    filter_bypass_level: LogLevels = Field(default=LogLevels.WARNING, title="Filter Bypass Level",
+                                           description="Records with this level or above are not rate limited, sampled or suppressed as duplicates")
+    filter_duplicate_window: Optional[float] = Field(default=None, title="Duplicate Window", gt=0,
+                                                     description="The seconds in which similar records are suppressed. None for no duplicate suppression")
+    queue: bool = Field(default=False, title="Queue Logging", description="Whether to pass records through a queue to a listener thread, which calls the handlers")
+    queue_size: int = Field(default=10000, title="Queue Size", ge=1, description="The maximum number of queued records")
+    queue_overflow_policy: OverflowPolicies = Field(default=OverflowPolicies.BLOCK, title="Queue Overflow Policy", description="What happens if the queue is full")
+    queue_overflow_level: LogLevels = Field(default=LogLevels.WARNING, title="Queue Overflow Level",
+                                            description="Records below this level are dropped if the queue is full and the overflow policy is 'drop_below_level'")
 
     def model_post_init(self, context: Any, /):
         if type(self.level) is Default:
@@ -50,6 +91,22 @@ class LoggerSettings(PrintableSettings):
             value = logging.getLevelName(value)
         return value
 
+    @field_validator("console_json_fields", "file_json_fields")
+    def validate_json_fields(cls, value: Optional[list[str]]) -> Optional[list[str]]:
+        if value is not None:
+            for field in value:
+                if field not in JSON_FIELDS:
+                    raise ValueError(f"Unknown JSON field '{field}'. Available fields: {', '.join(JSON_FIELDS)}")
+        return value
+
+    @field_validator("file_archive_compression_level")
+    def validate_file_archive_compression_level(cls, value: Optional[int], info: ValidationInfo) -> Optional[int]:
+        # the codec is validated before, it's missing if it is invalid
+        file_archive_codec = info.data.get("file_archive_codec")
+        if file_archive_codec is not None:
+            file_archive_codec.check_compression_level(value)
+        return value
+
     @field_validator("file_encoding")
     def validate_file_encoding(cls, value):
         # check if encoding is available
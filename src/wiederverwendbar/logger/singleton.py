@@ -1,5 +1,7 @@
 import contextlib
 import logging
+import re
+from typing import Optional
 
 from wiederverwendbar.logger.logger import Logger
 from wiederverwendbar.logger.settings import LoggerSettings
@@ -23,13 +25,33 @@ class LoggerSingleton(Logger, metaclass=Singleton, order=LOGGER_SINGLETON_ORDER)
 
         self.ignored_loggers_equal = ignored_loggers_equal
         self.ignored_loggers_like = ignored_loggers_like
+        self._compiled_loggers_equal: Optional[list[str]] = None
+        self._compiled_loggers_like: Optional[list[str]] = None
+        self._ignored_pattern: Optional[re.Pattern] = None
+        self._ignored_cache: dict[str, bool] = {}
 
         if use_sub_logger:
             logging.setLoggerClass(SubLogger)
             self.configure()
 
+    def _compile_ignored(self):
+        # one pattern for all ignored loggers: whole names for equal, substrings for like
+        self._compiled_loggers_equal = self.ignored_loggers_equal[:]
+        self._compiled_loggers_like = self.ignored_loggers_like[:]
+        alternatives = [f"^{re.escape(name)}\\Z" for name in self._compiled_loggers_equal]
+        alternatives += [re.escape(part) for part in self._compiled_loggers_like]
+        self._ignored_pattern = re.compile("|".join(alternatives)) if alternatives else None
+        self._ignored_cache = {}
+
     def is_ignored(self, logger_name: str) -> bool:
-        return logger_name in self.ignored_loggers_equal or any([ignored in logger_name for ignored in self.ignored_loggers_like])
+        # the lists may be changed in place, compile again if they differ from the copies of the last compile
+        if self.ignored_loggers_equal != self._compiled_loggers_equal or self.ignored_loggers_like != self._compiled_loggers_like:
+            self._compile_ignored()
+        ignored = self._ignored_cache.get(logger_name)
+        if ignored is None:
+            ignored = self._ignored_pattern is not None and self._ignored_pattern.search(logger_name) is not None
+            self._ignored_cache[logger_name] = ignored
+        return ignored
 
     def configure(self):
         for logger in logging.Logger.manager.loggerDict.values():
@@ -40,15 +62,31 @@ class LoggerSingleton(Logger, metaclass=Singleton, order=LOGGER_SINGLETON_ORDER)
     def configure_logger(self, logger: logging.Logger):
         if self.is_ignored(logger.name):
             return
-        logger.setLevel(self.level)
+        if logger.manager.loggerDict.get(logger.name) is logger:
+            logger.setLevel(self.level)
+        else:
+            # logger is still being created, no cached level of another logger depends on it yet
+            logger.level = self.level
         logger.parent = self
 
 
+_logger_singleton: Optional[LoggerSingleton] = None
+
+
+def _get_logger_singleton() -> LoggerSingleton:
+    # skip the Singleton lookup as long as the cached instance is still registered
+    global _logger_singleton
+    instance = _logger_singleton
+    if instance is None or Singleton.singleton_map.get(LoggerSingleton.__name__) is not instance:
+        instance = _logger_singleton = LoggerSingleton()
+    return instance
+
+
 class SubLogger(logging.Logger):
     def __init__(self, name: str, level=logging.NOTSET):
         self._init = False
         super().__init__(name, level)
-        LoggerSingleton().configure_logger(self)
+        _get_logger_singleton().configure_logger(self)
         self._init = True
 
     def __setattr__(self, key, value):
@@ -59,8 +97,9 @@ class SubLogger(logging.Logger):
 
     @property
     def init(self):
-        if hasattr(self, "name"):
-            if LoggerSingleton().is_ignored(self.name):
+        name = self.__dict__.get("name")
+        if name is not None:
+            if _get_logger_singleton().is_ignored(name):
                 return False
         return getattr(self, "_init", False)
 
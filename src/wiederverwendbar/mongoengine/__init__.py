@@ -4,7 +4,11 @@ from wiederverwendbar.mongoengine.fields import (BooleanAlsoField,
                                                  IPv4NetworkField,
                                                  PortField,
                                                  WithInstanceField)
-from wiederverwendbar.mongoengine.logger import (MongoengineLogDocument,
+from wiederverwendbar.mongoengine.logger import (LOG_COMPRESSION_ANNOTATION,
+                                                 encode_log_entries,
+                                                 decode_log_entries,
+                                                 log_entries_count,
+                                                 MongoengineLogDocument,
                                                  MongoengineLogFormatter,
                                                  MongoengineLogHandler,
                                                  MongoengineLogStreamer,
@@ -1,3 +1,7 @@
+from wiederverwendbar.mongoengine.logger.codec import (LOG_COMPRESSION_ANNOTATION,
+                                                        encode_log_entries,
+                                                        decode_log_entries,
+                                                        log_entries_count)
 from wiederverwendbar.mongoengine.logger.documets import (MongoengineLogDocument)
 from wiederverwendbar.mongoengine.logger.formatters import (MongoengineLogFormatter)
 from wiederverwendbar.mongoengine.logger.handlers import (MongoengineLogHandler)
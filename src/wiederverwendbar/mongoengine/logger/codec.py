@@ -0,0 +1,107 @@
+import lzma
+import struct
+import zlib
+from typing import Any, Literal, Optional
+
+from bson import encode as bson_encode, decode as bson_decode
+
+try:
+    from compression import zstd  # Python >= 3.14
+except ModuleNotFoundError:
+    try:
+        import zstandard as zstd
+    except ModuleNotFoundError:
+        zstd = None
+
+LOG_COMPRESSION_ANNOTATION = Literal["none", "zlib", "lzma", "zstd"]
+
+# header: magic, version, codec, number of entries
+_HEADER = struct.Struct(">4sBBI")
+_MAGIC = b"WLOG"
+_VERSION = 1
+_CODEC_IDS = {"none": 0, "zlib": 1, "lzma": 2, "zstd": 3}
+_CODEC_NAMES = {codec_id: name for name, codec_id in _CODEC_IDS.items()}
+
+
+def _compress(compression: str, data: bytes, level: Optional[int]) -> bytes:
+    if compression == "none":
+        return data
+    if compression == "zlib":
+        return zlib.compress(data, -1 if level is None else level)
+    if compression == "lzma":
+        return lzma.compress(data, preset=level)
+    if zstd is None:
+        raise RuntimeError("Log compression 'zstd' requires Python >= 3.14 or the 'zstandard' package.")
+    if level is None:
+        return zstd.compress(data)
+    return zstd.compress(data, level)
+
+
+def _decompress(compression: str, data: bytes) -> bytes:
+    if compression == "none":
+        return data
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "lzma":
+        return lzma.decompress(data)
+    if zstd is None:
+        raise RuntimeError("Log compression 'zstd' requires Python >= 3.14 or the 'zstandard' package.")
+    return zstd.decompress(data)
+
+
+def check_log_compression(compression: str) -> None:
+    """
+    Check if a log compression is known and available.
+
+    :param compression: Compression name.
+    :return: None
+    """
+
+    if compression not in _CODEC_IDS:
+        raise ValueError(f"Unknown log compression '{compression}'.")
+    if compression == "zstd" and zstd is None:
+        raise RuntimeError("Log compression 'zstd' requires Python >= 3.14 or the 'zstandard' package.")
+
+
+def encode_log_entries(entries: list[dict[str, Any]], compression: LOG_COMPRESSION_ANNOTATION = "zlib", level: Optional[int] = None) -> bytes:
+    """
+    Encode log entries into a binary blob. The entries are BSON encoded and compressed.
+
+    :param entries: Log entries.
+    :param compression: Compression name.
+    :param level: Compression level, None for the codec default.
+    :return: Blob with header.
+    """
+
+    check_log_compression(compression)
+    payload = _compress(compression, bson_encode({"entries": entries}), level)
+    return _HEADER.pack(_MAGIC, _VERSION, _CODEC_IDS[compression], len(entries)) + payload
+
+
+def decode_log_entries(blob: bytes) -> list[dict[str, Any]]:
+    """
+    Decode a blob created by encode_log_entries.
+
+    :param blob: Blob with header.
+    :return: Log entries.
+    """
+
+    magic, version, codec_id, count = _HEADER.unpack_from(blob)
+    if magic != _MAGIC:
+        raise ValueError("Blob is not an encoded log batch.")
+    if version != _VERSION:
+        raise ValueError(f"Unsupported log batch version '{version}'.")
+    if codec_id not in _CODEC_NAMES:
+        raise ValueError(f"Unknown log compression id '{codec_id}'.")
+    return bson_decode(_decompress(_CODEC_NAMES[codec_id], blob[_HEADER.size:]))["entries"]
+
+
+def log_entries_count(blob: bytes) -> int:
+    """
+    Get the number of entries of a blob without decoding it.
+
+    :param blob: Blob with header.
+    :return: Number of entries.
+    """
+
+    return _HEADER.unpack_from(blob)[3]
@@ -1,14 +1,25 @@
+import heapq
 from datetime import datetime
+from typing import Any, Optional, Sequence
 
-from mongoengine import Document, DateTimeField, StringField, ListField, DictField
+from bson import ObjectId
+from mongoengine import Document, DateTimeField, StringField, ListField, DictField, IntField, BinaryField
 from mongoengine.base import TopLevelDocumentMetaclass
 
+from wiederverwendbar.mongoengine.logger.codec import decode_log_entries, log_entries_count
+
 
 class MongoengineLogDocumentMeta(TopLevelDocumentMetaclass):
     ...
 
 
 class MongoengineLogDocument(Document, metaclass=MongoengineLogDocumentMeta):
+    """
+    Document which stores a batch of log entries.
+
+    Entries can be searched with query_entries. The entries are filtered server-side by an aggregation pipeline.
+    """
+
     meta = {"collection": "log",
             "allow_inheritance": True,
             'index_cls': False,
@@ -16,8 +27,184 @@ class MongoengineLogDocument(Document, metaclass=MongoengineLogDocumentMeta):
                 {
                     "fields": ["timestamp"],
                     "expireAfterSeconds": 10 * 60 * 24 * 30  # 30 days
+                },
+                {
+                    "fields": ["last_timestamp"],
+                    "sparse": True
                 }
             ]}
 
     timestamp: datetime = DateTimeField(required=True)
     entries: list[dict] = ListField(DictField(), required=True)
+
+    # timestamp of the first entry, documents are written after their entries
+    first_timestamp: Optional[datetime] = DateTimeField()
+
+    # only used by bucket documents
+    last_timestamp: Optional[datetime] = DateTimeField()
+    entry_count: Optional[int] = IntField()
+    entry_size: Optional[int] = IntField()
+
+    # only used by compressed documents, levels and logger names of the entries are stored to filter them server-side
+    blob: Optional[bytes] = BinaryField()
+    entry_levels: Optional[list[str]] = ListField(StringField(), default=None)
+    entry_logger_names: Optional[list[str]] = ListField(StringField(), default=None)
+
+    def get_entries(self) -> list[dict[str, Any]]:
+        """
+        Get the log entries of the document, compressed entries are decoded.
+
+        :return: Log entries.
+        """
+
+        if self.blob is not None:
+            return decode_log_entries(self.blob)
+        return self.entries
+
+    @classmethod
+    def ensure_query_indexes(cls, search_fields: Sequence[str] = ()) -> None:
+        """
+        Create the compound indexes used by query_entries. The indexes are created once per class and search fields.
+
+        :param search_fields: Raw field names of the search filter, for example 'owner'.
+        :return: None
+        """
+
+        search_fields = tuple(search_fields)
+        created = cls.__dict__.get("_query_indexes")
+        if created is None:
+            created = set()
+            cls._query_indexes = created
+        if search_fields in created:
+            return
+        prefix = [(field, 1) for field in search_fields]
+        collection = cls._get_collection()
+        if prefix:
+            # without a prefix, the ttl index on timestamp is used
+            collection.create_index(prefix + [("timestamp", 1)])
+        collection.create_index(prefix + [("first_timestamp", 1)])
+        collection.create_index(prefix + [("entries.level", 1), ("timestamp", 1)])
+        collection.create_index(prefix + [("entries.logger_name", 1), ("timestamp", 1)])
+        created.add(search_fields)
+
+    @classmethod
+    def query_entries(cls,
+                      search: Optional[dict] = None,
+                      levels: Optional[Sequence[str]] = None,
+                      logger_names: Optional[Sequence[str]] = None,
+                      begin: Optional[datetime] = None,
+                      end: Optional[datetime] = None,
+                      limit: int = 100,
+                      cursor: Optional[str] = None,
+                      max_blob_documents: int = 100) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """
+        Search log entries. Entries are returned in insertion order.
+
+        Compressed documents (blob) are selected server-side by their first timestamp, levels and logger names,
+        their entries are decoded and filtered client-side. At most max_blob_documents are decoded per call,
+        if more would be needed, fewer entries than limit are returned together with a cursor.
+
+        :param search: Mongoengine filter of the documents, for example {'owner': owner_id}.
+        :param levels: Only entries with one of these level names.
+        :param logger_names: Only entries of these loggers.
+        :param begin: Only entries created at or after begin.
+        :param end: Only entries created before end.
+        :param limit: Maximum number of entries.
+        :param cursor: Cursor returned by the previous call, to get the next page.
+        :param max_blob_documents: Maximum number of compressed documents to decode.
+        :return: Entries and the cursor of the next page, None if there are no more entries.
+        """
+
+        if search is None:
+            search = {}
+        if limit < 1:
+            raise ValueError(f"Limit must be greater than 0, got '{limit}'.")
+        if max_blob_documents < 1:
+            raise ValueError(f"Max blob documents must be greater than 0, got '{max_blob_documents}'.")
+        search_match = dict(cls.objects(**search)._query)
+        cls.ensure_query_indexes([field for field in search_match if not field.startswith("$") and field != "_cls"])
+
+        # filter documents, uses the indexes, conditions are combined with the search by $and, it may use $or and _id itself
+        conditions = []
+        entry_conditions = []
+        blob_conditions = [{"blob": {"$ne": None}}]
+        entry_match = {}
+        if levels is not None:
+            entry_conditions.append({"entries.level": {"$in": list(levels)}})
+            # documents without the field are older than it
+            blob_conditions.append({"entry_levels": {"$in": [*levels, None]}})
+            entry_match["entries.level"] = {"$in": list(levels)}
+        if logger_names is not None:
+            entry_conditions.append({"entries.logger_name": {"$in": list(logger_names)}})
+            blob_conditions.append({"entry_logger_names": {"$in": [*logger_names, None]}})
+            entry_match["entries.logger_name"] = {"$in": list(logger_names)}
+        if begin is not None:
+            # documents are written after their entries, buckets are updated until last_timestamp
+            conditions.append({"$or": [{"timestamp": {"$gte": begin}}, {"last_timestamp": {"$gte": begin}}]})
+            entry_match.setdefault("entries.timestamp", {})["$gte"] = begin.timestamp()
+        if end is not None:
+            conditions.append({"first_timestamp": {"$not": {"$gte": end}}})
+            entry_match.setdefault("entries.timestamp", {})["$lt"] = end.timestamp()
+        after_id, after_index = None, None
+        if cursor is not None:
+            after_id, after_index = cursor.split(":")
+            after_id, after_index = ObjectId(after_id), int(after_index)
+            conditions.append({"_id": {"$gte": after_id}})
+            entry_match["$or"] = [{"_id": {"$gt": after_id}}, {"_id": after_id, "index": {"$gt": after_index}}]
+
+        # unwind and filter entries server-side
+        document_match = {"$and": [search_match, *conditions, *entry_conditions]}
+        pipeline = [{"$match": document_match},
+                    {"$sort": {"_id": 1}},
+                    {"$project": {"entries": 1}},
+                    {"$unwind": {"path": "$entries", "includeArrayIndex": "index"}}]
+        if entry_match:
+            pipeline.append({"$match": entry_match})
+        pipeline.append({"$limit": limit + 1})
+        results = [(result["_id"], result["index"], result["entries"]) for result in cls._get_collection().aggregate(pipeline)]
+
+        # decode and filter entries of compressed documents client-side
+        blob_results = []
+        blob_match = {"$and": [search_match, *conditions, *blob_conditions]}
+        decoded = 0
+        last_decoded = None
+        bound = None
+        for document in cls._get_collection().find(blob_match, {"blob": 1}).sort("_id", 1):
+            if document["_id"] == after_id and after_index >= log_entries_count(document["blob"]) - 1:
+                # returned completely by the previous call
+                continue
+            if decoded == max_blob_documents:
+                # the results are complete up to the last decoded document
+                bound = last_decoded
+                break
+            decoded += 1
+            decoded_entries = decode_log_entries(document["blob"])
+            last_decoded = (document["_id"], len(decoded_entries) - 1)
+            for index, entry in enumerate(decoded_entries):
+                if after_id is not None and document["_id"] == after_id and index <= after_index:
+                    continue
+                if levels is not None and entry.get("level") not in levels:
+                    continue
+                if logger_names is not None and entry.get("logger_name") not in logger_names:
+                    continue
+                if begin is not None and entry.get("timestamp", 0) < begin.timestamp():
+                    continue
+                if end is not None and entry.get("timestamp", 0) >= end.timestamp():
+                    continue
+                blob_results.append((document["_id"], index, entry))
+            if len(blob_results) > limit:
+                break
+        if blob_results:
+            results = list(heapq.merge(results, blob_results, key=lambda result: (result[0], result[1])))
+        if bound is not None:
+            results = [result for result in results if (result[0], result[1]) <= bound]
+
+        entries = [entry for _, _, entry in results[:limit]]
+        if len(results) > limit:
+            document_id, index, _ = results[limit - 1]
+            next_cursor = f"{document_id}:{index}"
+        elif bound is not None:
+            next_cursor = f"{bound[0]}:{bound[1]}"
+        else:
+            next_cursor = None
+        return entries, next_cursor
@@ -1,8 +1,74 @@
 import logging
+from typing import Any, Callable, Optional, Sequence
+
+from wiederverwendbar.logger.formatters.field_plan import RECORD_PROPERTIES, compile_field_plan
+
+# entry field -> LogRecord attribute, message is built with LogRecord.getMessage()
+ENTRY_FIELDS = {
+    'timestamp': 'created',
+    'level': 'levelname',
+    'thread': 'thread',
+    'thread_name': 'threadName',
+    'message': None,
+    'logger_name': 'name',
+    'file_name': 'pathname',
+    'module': 'module',
+    'method': 'funcName',
+    'line_number': 'lineno'
+}
+# thread names are left out, the default names are unique per thread
+INTERNED_ENTRY_FIELDS = frozenset({'level', 'logger_name', 'file_name', 'module', 'method'})
+INTERNED_STRINGS_LIMIT = 10000
 
 
 class MongoengineLogFormatter(logging.Formatter):
-    DEFAULT_PROPERTIES = logging.LogRecord('', 0, '', 0, '', (), (None, None, None), '').__dict__.keys()
+    DEFAULT_PROPERTIES = RECORD_PROPERTIES
+
+    def __init__(self,
+                 fields: Optional[Sequence[str]] = None,
+                 extra: bool = True,
+                 exception: bool = True,
+                 intern_strings: bool = False,
+                 **kwargs):
+        """
+        Create a new MongoengineLogFormatter.
+
+        Strings of records created in this process are already shared with the logger and code objects.
+        Interning helps if records are created elsewhere, for example unpickled from a queue.
+
+        :param fields: Entry fields to store, see ENTRY_FIELDS. None for all fields.
+        :param extra: Add contextual extra attributes of the record.
+        :param exception: Add exception information if present.
+        :param intern_strings: Intern repeated strings like logger and module names.
+        :param kwargs: Keyword arguments of logging.Formatter.
+        """
+
+        super().__init__(**kwargs)
+        if fields is None:
+            fields = list(ENTRY_FIELDS)
+        for field in fields:
+            if field not in ENTRY_FIELDS:
+                raise ValueError(f"Unknown entry field '{field}'.")
+
+        # precompiled field plan
+        self._interned: dict[Any, Any] = {}
+        entry_fields = []
+        for field in fields:
+            attribute = ENTRY_FIELDS[field]
+            if attribute is None:
+                value = "record.getMessage()"
+            elif intern_strings and field in INTERNED_ENTRY_FIELDS:
+                value = f"(_interned.get(record.{attribute}) or _intern(record.{attribute}))"
+            else:
+                value = f"record.{attribute}"
+            entry_fields.append((field, value))
+        self._format: Callable[[logging.LogRecord], dict] = compile_field_plan(
+            fields=entry_fields,
+            optional_fields=[('exception', "record.exc_info is not None", "_exception(record)")] if exception else (),
+            extra=extra,
+            namespace={"_interned": self._interned,
+                       "_intern": self._intern,
+                       "_exception": self.format_exception})
 
     def format(self, record) -> dict:
         """
@@ -12,36 +78,27 @@ class MongoengineLogFormatter(logging.Formatter):
         :return: dict
         """
 
-        # standard entry
-        entry = {
-            'timestamp': record.created,
-            'level': record.levelname,
-            'thread': record.thread,
-            'thread_name': record.threadName,
-            'message': record.getMessage(),
-            'logger_name': record.name,
-            'file_name': record.pathname,
-            'module': record.module,
-            'method': record.funcName,
-            'line_number': record.lineno
-        }
+        return self._format(record)
+
+    def _intern(self, value: Any) -> Any:
+        # bounded, dynamic logger names would grow it forever
+        if len(self._interned) < INTERNED_STRINGS_LIMIT:
+            return self._interned.setdefault(value, value)
+        return value
+
+    def format_exception(self, record: logging.LogRecord) -> dict:
+        """
+        Formats the exception information of a LogRecord.
 
-        # add exception information if present
-        if record.exc_info is not None:
-            entry.update({
-                'exception': {
-                    'message': str(record.exc_info[1]),
-                    'code': 0,
-                    'stack_trace': self.formatException(record.exc_info)
-                }
-            })
-
-        # add extra information
-        if len(self.DEFAULT_PROPERTIES) != len(record.__dict__):
-            contextual_extra = set(record.__dict__).difference(
-                set(self.DEFAULT_PROPERTIES))
-            if contextual_extra:
-                for key in contextual_extra:
-                    entry[key] = record.__dict__[key]
-
-        return entry
+        :param record: LogRecord instance with exc_info.
+        :return: dict
+        """
+
+        # cache the formatted traceback like logging.Formatter does
+        if not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        return {
+            'message': str(record.exc_info[1]),
+            'code': 0,
+            'stack_trace': record.exc_text
+        }
@@ -1,24 +1,228 @@
 import atexit as _atexit
 import logging as _logging
+import sys as _sys
 import threading as _threading
+import time as _time
+import traceback as _traceback
+import weakref as _weakref
+from collections import deque as _deque
+from datetime import datetime as _datetime, timedelta as _timedelta, timezone as _timezone
+from heapq import heappop as _heappop, heappush as _heappush
 from itertools import count as _count
-from typing import Optional as _Optional
+from typing import Any as _Any, Literal as _Literal, Optional as _Optional
+
+from bson import encode as _bson_encode
 
 from wiederverwendbar.functions.datetime import local_now as _local_now
+from wiederverwendbar.mongoengine.logger.codec import LOG_COMPRESSION_ANNOTATION as _LOG_COMPRESSION_ANNOTATION, \
+    check_log_compression as _check_log_compression, encode_log_entries as _encode_log_entries
 from wiederverwendbar.mongoengine.logger.documets import MongoengineLogDocument as _MongoengineLogDocument
 from wiederverwendbar.mongoengine.logger.formatters import MongoengineLogFormatter as _MongoengineLogFormatter
 
 _counter = _count().__next__
 _counter() # skip 0
 
+OVERFLOW_POLICY_ANNOTATION = _Literal["block", "drop_oldest", "drop_below_level"]
+WRITER_THREADS = 2
+
+
+class _MongoengineLogFlusher:
+    """
+    Process-wide flusher for MongoengineLogHandler.
+
+    One thread flushes all registered handlers on their schedules. The schedules are kept in a deadline heap,
+    so the number of threads doesn't depend on the number of handlers. Handlers are referenced weakly.
+    Unregistered handlers are dropped from the heap when their next deadline is reached.
+    """
+
+    def __init__(self):
+        self._condition = _threading.Condition()
+        self._heap: list[tuple[float, int]] = []
+        self._registrations: dict[int, tuple[_weakref.ref, float]] = {}
+        self._thread: _Optional[_threading.Thread] = None
+        self._atexit_registered: bool = False
+
+    def register(self, handler: "MongoengineLogHandler", interval: float) -> int:
+        """
+        Register a handler for periodical flushing.
+
+        :param handler: Handler to flush.
+        :param interval: Time in seconds between two flushes.
+        :return: Registration key, used for unregister.
+        """
+
+        key = _counter()
+        with self._condition:
+            self._registrations[key] = (_weakref.ref(handler), interval)
+            deadline = _time.monotonic() + interval
+            _heappush(self._heap, (deadline, key))
+            if not self._atexit_registered:
+                _atexit.register(self.close_all)
+                self._atexit_registered = True
+            if self._thread is None:
+                self._thread = _threading.Thread(name=f"{MongoengineLogHandler.__name__}-flusher", target=self._loop, daemon=True)
+                self._thread.start()
+            elif self._heap[0][1] == key:
+                # new earliest deadline -> wake up the flusher
+                self._condition.notify()
+        return key
+
+    def unregister(self, key: int) -> None:
+        """
+        Unregister a handler.
+
+        :param key: Registration key.
+        :return: None
+        """
+
+        with self._condition:
+            self._registrations.pop(key, None)
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+                    deadline, key = self._heap[0]
+                    timeout = deadline - _time.monotonic()
+                    if timeout > 0:
+                        self._condition.wait(timeout)
+                        continue
+                    _heappop(self._heap)
+                    registration = self._registrations.get(key)
+                    if registration is None:
+                        continue  # unregistered
+                    handler = registration[0]()
+                    if handler is None:
+                        del self._registrations[key]  # garbage collected
+                        continue
+                    _heappush(self._heap, (max(deadline + registration[1], _time.monotonic()), key))
+                    break
+
+            # flush outside the lock, so slow writes don't block registrations
+            try:
+                handler._flush_periodically()
+            except Exception:
+                if _logging.raiseExceptions and _sys.stderr:
+                    _traceback.print_exc(file=_sys.stderr)
+            del handler
+
+    def close_all(self) -> None:
+        """
+        Close all registered handlers. Called at exit.
+
+        :return: None
+        """
+
+        with self._condition:
+            handlers = [registration[0]() for registration in self._registrations.values()]
+        for handler in handlers:
+            if handler is not None:
+                handler.close()
+
+
+class _MongoengineLogWriterPool:
+    """
+    Process-wide writer threads for asynchronous MongoengineLogHandler.
+
+    Handlers with queued records to write are put into a ready queue, which is served by at most WRITER_THREADS threads.
+    A handler is in the ready queue or written by one thread at most once at a time, so its batches are written in order.
+    """
+
+    def __init__(self, size: int):
+        self._size: int = size
+        self._condition = _threading.Condition()
+        self._ready: _deque["MongoengineLogHandler"] = _deque()
+        self._threads: list[_threading.Thread] = []
+        self._busy: int = 0
+        self._local = _threading.local()
+
+    @property
+    def in_writer(self) -> bool:
+        """
+        Whether the current thread is a writer thread.
+        """
+
+        return getattr(self._local, "writer", False)
+
+    def submit(self, handler: "MongoengineLogHandler") -> None:
+        """
+        Put a handler into the ready queue. The caller ensures, that the handler isn't queued already.
+
+        :param handler: Handler with queued records.
+        :return: None
+        """
+
+        with self._condition:
+            self._ready.append(handler)
+            # start threads on demand, if no idle thread is left
+            if len(self._threads) < self._size and len(self._ready) > len(self._threads) - self._busy:
+                thread = _threading.Thread(name=f"{MongoengineLogHandler.__name__}-writer-{len(self._threads) + 1}", target=self._loop, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+
+    def _loop(self) -> None:
+        self._local.writer = True
+        while True:
+            with self._condition:
+                while not self._ready:
+                    self._condition.wait()
+                handler = self._ready.popleft()
+                self._busy += 1
+            try:
+                handler._write_queued()
+            except Exception:
+                if _logging.raiseExceptions and _sys.stderr:
+                    _traceback.print_exc(file=_sys.stderr)
+            finally:
+                with self._condition:
+                    self._busy -= 1
+            del handler
+
+
+_flusher = _MongoengineLogFlusher()
+_writer_pool = _MongoengineLogWriterPool(WRITER_THREADS)
+
+
 class MongoengineLogHandler(_logging.Handler):
+    """
+    Log handler which stores buffered log records as MongoengineLogDocument.
+
+    In asynchronous mode, emit only puts the record into a bounded queue. The writer threads, shared by all handlers of the process,
+    format the queued records and write them in batches with pymongo insert_many, bypassing the mongoengine validation.
+    Records emitted by a writer thread itself, for example logs of pymongo while writing, are dropped and counted in dropped_while_writing.
+    If the queue is full, the overflow policy decides what happens:
+        - block: emit waits until the writer has taken the queued records
+        - drop_oldest: the oldest queued record is dropped
+        - drop_below_level: the new record is dropped if its level is below overflow_level, otherwise emit waits
+
+    If bucket_max_entries is set, entries are pushed into bucket documents instead of creating one document per flush.
+    A bucket is selected by the document_kwargs and is filled until it reaches bucket_max_entries, bucket_max_bytes (BSON size of the entries)
+    or is older than bucket_span seconds, then a new bucket is created by upsert.
+
+    If compression is set, the entries of a document are stored as compressed blob (see encode_log_entries) instead of the entries list.
+    Compression can't be combined with the bucketed layout.
+    """
+
     def __init__(self,
                  level=_logging.NOTSET,
                  document: _Optional[type[_MongoengineLogDocument]] = None,
                  document_kwargs: _Optional[dict] = None,
                  buffer_size: _Optional[int] = None,
                  buffer_periodical_flush_timing: _Optional[float] = None,
-                 buffer_early_flush_level: _Optional[int] = None):
+                 buffer_early_flush_level: _Optional[int] = None,
+                 asynchronous: bool = False,
+                 queue_size: _Optional[int] = None,
+                 overflow_policy: _Optional[OVERFLOW_POLICY_ANNOTATION] = None,
+                 overflow_level: _Optional[int] = None,
+                 bucket_max_entries: _Optional[int] = None,
+                 bucket_max_bytes: _Optional[int] = None,
+                 bucket_span: _Optional[float] = None,
+                 compression: _Optional[_LOG_COMPRESSION_ANNOTATION] = None,
+                 compression_level: _Optional[int] = None):
         super().__init__(level=level)
         self.formatter: _MongoengineLogFormatter = _MongoengineLogFormatter()
         if document is None:
@@ -37,32 +241,246 @@ class MongoengineLogHandler(_logging.Handler):
         if buffer_early_flush_level is None:
             buffer_early_flush_level = _logging.CRITICAL
         self._buffer_early_flush_level: int = buffer_early_flush_level
-        self._buffer_timer_thread: _Optional[_threading.Thread] = None
         self._buffer_lock: _threading.Lock = _threading.Lock()
-        self._stopper: _Optional[callable] = None
+        self._flusher_key: _Optional[int] = None
+
+        # asynchronous mode
+        self._asynchronous: bool = asynchronous
+        if queue_size is None:
+            queue_size = 10000
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be greater than 0, got '{queue_size}'.")
+        self._queue_size: int = queue_size
+        if overflow_policy is None:
+            overflow_policy = "block"
+        if overflow_policy not in ("block", "drop_oldest", "drop_below_level"):
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}'.")
+        self._overflow_policy: OVERFLOW_POLICY_ANNOTATION = overflow_policy
+        if overflow_level is None:
+            overflow_level = _logging.WARNING
+        self._overflow_level: int = overflow_level
+        self._queue: _deque[_logging.LogRecord] = _deque()
+        self._queue_condition: _threading.Condition = _threading.Condition()
+        self._queue_enqueued: int = 0
+        self._queue_processed: int = 0
+        self._queue_write_now: bool = False
+        self._queue_scheduled: bool = False
+        self._queue_closing: bool = False
+        self._dropped_oldest: int = 0
+        self._dropped_below_level: int = 0
+        self._dropped_while_writing: int = 0
+        self._document_template: _Optional[dict[str, _Any]] = None
+
+        # bucketed layout
+        if bucket_max_entries is not None and bucket_max_entries < 1:
+            raise ValueError(f"Bucket max entries must be greater than 0, got '{bucket_max_entries}'.")
+        self._bucket_max_entries: _Optional[int] = bucket_max_entries
+        if bucket_max_bytes is None:
+            bucket_max_bytes = 1024 * 1024
+        self._bucket_max_bytes: int = bucket_max_bytes
+        if bucket_span is None:
+            bucket_span = 60 * 60.0
+        self._bucket_span: float = bucket_span
+
+        # compressed blobs
+        if compression is not None:
+            _check_log_compression(compression)
+            if bucket_max_entries is not None:
+                raise ValueError("Compression can't be combined with the bucketed layout.")
+        self._compression: _Optional[_LOG_COMPRESSION_ANNOTATION] = compression
+        self._compression_level: _Optional[int] = compression_level
 
-        # setup periodical flush
         if self._buffer_periodical_flush_timing:
-            # clean exit event
-            _atexit.register(self.close)
+            # setup periodical flush, in asynchronous mode it only hands the queue over to the writer threads
+            self._flusher_key = _flusher.register(self, self._buffer_periodical_flush_timing)
 
-            # call at interval function
-            def call_repeatedly(interval, func, *args):
-                stopped = _threading.Event()
+    @property
+    def asynchronous(self) -> bool:
+        return self._asynchronous
 
-                # actual thread function
-                def loop():
-                    while not stopped.wait(interval):  # the first call is in `interval` secs
-                        func(*args)
+    @property
+    def bucketed(self) -> bool:
+        return self._bucket_max_entries is not None
 
-                timer_thread = _threading.Thread(name=f"{self.__class__.__name__}-{_counter()}", target=loop, daemon=True)
-                timer_thread.start()
-                return stopped.set, timer_thread
+    @property
+    def compression(self) -> _Optional[_LOG_COMPRESSION_ANNOTATION]:
+        return self._compression
 
-            # launch thread
-            self._stopper, self._buffer_timer_thread = call_repeatedly(self._buffer_periodical_flush_timing, self.flush)
+    @property
+    def dropped_oldest(self) -> int:
+        """
+        Number of records dropped by the drop_oldest overflow policy.
+        """
+
+        return self._dropped_oldest
+
+    @property
+    def dropped_below_level(self) -> int:
+        """
+        Number of records dropped by the drop_below_level overflow policy.
+        """
+
+        return self._dropped_below_level
+
+    @property
+    def dropped_while_writing(self) -> int:
+        """
+        Number of records dropped, because they were emitted by a writer thread.
+        """
+
+        return self._dropped_while_writing
+
+    @property
+    def dropped(self) -> int:
+        """
+        Number of all dropped records.
+        """
+
+        return self._dropped_oldest + self._dropped_below_level + self._dropped_while_writing
+
+    def _schedule_write(self) -> None:
+        # called with the queue condition held
+        if not self._queue_scheduled:
+            self._queue_scheduled = True
+            _writer_pool.submit(self)
+
+    def _enqueue(self, record: _logging.LogRecord) -> None:
+        in_writer = _writer_pool.in_writer
+        with self._queue_condition:
+            if in_writer:
+                # records logged while writing could wait for the writer itself
+                self._dropped_while_writing += 1
+                return
+            if self._queue_closing:
+                return
+            while len(self._queue) >= self._queue_size:
+                if self._overflow_policy == "drop_oldest":
+                    self._queue.popleft()
+                    self._dropped_oldest += 1
+                    self._queue_processed += 1
+                    break
+                if self._overflow_policy == "drop_below_level" and record.levelno < self._overflow_level:
+                    self._dropped_below_level += 1
+                    return
+                self._queue_write_now = True
+                self._schedule_write()
+                self._queue_condition.wait()
+                if self._queue_closing:
+                    return
+            self._queue.append(record)
+            self._queue_enqueued += 1
+            if len(self._queue) >= self._buffer_size or record.levelno >= self._buffer_early_flush_level:
+                self._queue_write_now = True
+                self._schedule_write()
+
+    def _write_queued(self) -> None:
+        # called by a writer thread
+        with self._queue_condition:
+            records = list(self._queue)
+            self._queue.clear()
+            self._queue_write_now = False
+            self._queue_condition.notify_all()  # wake up blocked emits
+
+        try:
+            if records:
+                self._write(records)
+        finally:
+            with self._queue_condition:
+                self._queue_processed += len(records)
+                self._queue_scheduled = False
+                if self._queue and (self._queue_write_now or self._queue_closing or len(self._queue) >= self._buffer_size):
+                    self._schedule_write()
+                self._queue_condition.notify_all()  # wake up waiting flushes
+
+    def _flush_periodically(self) -> None:
+        # called by the flusher thread, which must not wait for the writer threads
+        if not self._asynchronous:
+            self.flush()
+            return
+        with self._queue_condition:
+            if self._queue:
+                self._queue_write_now = True
+                self._schedule_write()
+
+    def _write(self, records: list[_logging.LogRecord]) -> None:
+        formated_records = []
+        for record in records:
+            try:
+                formated_records.append(self.formatter.format(record))
+            except Exception:
+                self.handleError(record)
+        if len(formated_records) == 0:
+            return
+        try:
+            if self.bucketed:
+                self._push_to_bucket(formated_records)
+            else:
+                self._insert_documents(formated_records)
+        except Exception:
+            self.handleError(records[0])
+
+    def _get_document_template(self) -> dict[str, _Any]:
+        if self._document_template is None:
+            # raw document with the static fields, timestamp and entries are set per document
+            self._document_template = self._document(timestamp=_local_now(), entries=[], **self._document_kwargs).to_mongo().to_dict()
+        return dict(self._document_template)
+
+    @staticmethod
+    def _first_timestamp(entries: list[dict[str, _Any]]) -> _Optional[_datetime]:
+        # entries without a timestamp field can't be bounded by query_entries
+        try:
+            return _datetime.fromtimestamp(min(entry["timestamp"] for entry in entries), tz=_timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _insert_documents(self, entries: list[dict[str, _Any]]) -> None:
+        timestamp = _local_now()
+        documents = []
+        for i in range(0, len(entries), self._buffer_size):
+            chunk = entries[i:i + self._buffer_size]
+            document = self._get_document_template()
+            document["timestamp"] = timestamp
+            first_timestamp = self._first_timestamp(chunk)
+            if first_timestamp is not None:
+                document["first_timestamp"] = first_timestamp
+            if self._compression is None:
+                document["entries"] = chunk
+            else:
+                document["blob"] = _encode_log_entries(chunk, compression=self._compression, level=self._compression_level)
+                # summary of the entries, query_entries filters compressed documents with it
+                for field, summary_field in (("level", "entry_levels"), ("logger_name", "entry_logger_names")):
+                    if all(field in entry for entry in chunk):
+                        document[summary_field] = sorted({entry[field] for entry in chunk})
+            documents.append(document)
+        self._document._get_collection().insert_many(documents, ordered=False)
+
+    def _push_to_bucket(self, entries: list[dict[str, _Any]]) -> None:
+        collection = self._document._get_collection()
+        bucket_filter = self._get_document_template()
+        del bucket_filter["timestamp"], bucket_filter["entries"]
+        now = _local_now()
+        for i in range(0, len(entries), self._bucket_max_entries):
+            chunk = entries[i:i + self._bucket_max_entries]
+            size = len(_bson_encode({"entries": chunk}))
+            on_insert = {"timestamp": now}
+            first_timestamp = self._first_timestamp(chunk)
+            if first_timestamp is not None:
+                on_insert["first_timestamp"] = first_timestamp
+            collection.update_one({**bucket_filter,
+                                   "timestamp": {"$gt": now - _timedelta(seconds=self._bucket_span)},
+                                   "entry_count": {"$lte": self._bucket_max_entries - len(chunk)},
+                                   "entry_size": {"$lte": self._bucket_max_bytes - size}},
+                                  {"$push": {"entries": {"$each": chunk}},
+                                   "$inc": {"entry_count": len(chunk), "entry_size": size},
+                                   "$set": {"last_timestamp": now},
+                                   "$setOnInsert": on_insert},
+                                  upsert=True)
 
     def emit(self, record: _logging.LogRecord) -> None:
+        if self._asynchronous:
+            self._enqueue(record)
+            return
+
         with self._buffer_lock:
             self._buffer.append(record)
 
@@ -70,6 +488,20 @@ class MongoengineLogHandler(_logging.Handler):
             self.flush()
 
     def flush(self):
+        if self._asynchronous:
+            # wait until the writer threads have processed all records queued so far
+            with self._queue_condition:
+                target = self._queue_enqueued
+                if self._queue_processed >= target:
+                    return
+                self._queue_write_now = True
+                self._schedule_write()
+                if _writer_pool.in_writer:
+                    return  # the writer threads must not wait for each other
+                while self._queue_processed < target:
+                    self._queue_condition.wait()
+            return
+
         if len(self._buffer) == 0:
             return
 
@@ -83,7 +515,11 @@ class MongoengineLogHandler(_logging.Handler):
                     self.handleError(record)
                 if len(formated_records) == 0:
                     continue
-            if len(formated_records) > 0:
+            if len(formated_records) > 0 and self.bucketed:
+                self._push_to_bucket(formated_records)
+            elif len(formated_records) > 0 and self._compression is not None:
+                self._insert_documents(formated_records)
+            elif len(formated_records) > 0:
                 # create document
                 document = self._document(timestamp=_local_now(),
                                           entries=formated_records,
@@ -102,12 +538,17 @@ class MongoengineLogHandler(_logging.Handler):
 
     def close(self) -> None:
         """
-        Clean quit logging. Flush buffer. Stop the periodical thread if needed.
+        Clean quit logging. Flush buffer or queue. Unregister from the periodical flusher if needed.
 
         :return: None
         """
 
-        if self._stopper:
-            self._stopper()
+        if self._asynchronous:
+            with self._queue_condition:
+                self._queue_closing = True
+                self._queue_condition.notify_all()  # wake up blocked emits
+        if self._flusher_key is not None:
+            _flusher.unregister(self._flusher_key)
+            self._flusher_key = None
         self.flush()
         super().close()
@@ -1,21 +1,43 @@
 import atexit
 import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Optional
+from typing import Any, Literal, Optional
 
-from wiederverwendbar.functions.datetime import local_now
+from pymongo.errors import PyMongoError
+
+from wiederverwendbar.functions.datetime import local_now, to_local
+from wiederverwendbar.mongoengine.logger.codec import decode_log_entries
 from wiederverwendbar.mongoengine.logger.documets import MongoengineLogDocument
 
+STREAM_MODE_ANNOTATION = Literal["poll", "change_stream"]
+
 
 class MongoengineLogStreamer(threading.Thread):
+    """
+    Thread which streams log entries of a MongoengineLogDocument collection.
+
+    Modes:
+        - poll: query new documents every stream_rate seconds
+        - change_stream: new documents are pushed by a MongoDB change stream (requires a replica set).
+          After a connection error, the stream is resumed from the last resume token.
+
+    Set bucketed for documents written by a MongoengineLogHandler with bucket_max_entries.
+    Buckets are read by their last_timestamp and only the entries after the already streamed ones are fetched.
+    Of a bucket seen for the first time, only the entries with a timestamp after the stream timestamp are streamed.
+    Bucketed streaming is only supported in poll mode.
+    """
+
     def __init__(self,
                  log_document: type[MongoengineLogDocument],
                  search: Optional[dict] = None,
                  to: Optional[callable] = None,
                  name: Optional[str] = None,
                  begin: Optional[datetime] = None,
-                 stream_rate: Optional[float] = None):
+                 stream_rate: Optional[float] = None,
+                 mode: Optional[STREAM_MODE_ANNOTATION] = None,
+                 bucketed: bool = False):
         if name is None:
             name = self.__class__.__name__
         super().__init__(name=name, daemon=True)
@@ -35,12 +57,27 @@ class MongoengineLogStreamer(threading.Thread):
             raise TypeError(f"Expected 'callable', got '{type(to)}'.")
         self._to = to
         if begin is None:
+            # MongoDB stores milliseconds, documents written in the current millisecond must not be older than begin
             begin = local_now()
+            begin = begin.replace(microsecond=begin.microsecond // 1000 * 1000)
         self._timestamp = begin
         if stream_rate is None:
             stream_rate = 0.001
         self._stream_rate = stream_rate
-        self._buffer: list[dict] = []
+        if mode is None:
+            mode = "poll"
+        if mode not in ("poll", "change_stream"):
+            raise ValueError(f"Unknown stream mode '{mode}'.")
+        self._mode: STREAM_MODE_ANNOTATION = mode
+        if bucketed and mode != "poll":
+            raise ValueError(f"Bucketed streaming is only supported in 'poll' mode, got '{mode}'.")
+        self._bucketed: bool = bucketed
+        self._bucket_offsets: dict[Any, int] = {}
+        self._bucket_last_timestamps: dict[Any, datetime] = {}
+        self._resume_token: Optional[dict] = None
+        self._fetched_ids: set = set()
+        self._boundary_ids: set = set()
+        self._buffer: deque[dict] = deque()
         self._stopper = threading.Event()
 
         atexit.register(self.close)
@@ -65,6 +102,15 @@ class MongoengineLogStreamer(threading.Thread):
         with self._lock:
             self._timestamp = value
 
+    @property
+    def mode(self) -> STREAM_MODE_ANNOTATION:
+        return self._mode
+
+    @property
+    def resume_token(self) -> Optional[dict]:
+        with self._lock:
+            return self._resume_token
+
     @property
     def stream_rate(self) -> float:
         with self._lock:
@@ -75,24 +121,123 @@ class MongoengineLogStreamer(threading.Thread):
         with self._lock:
             self._stream_rate = value
 
-    def _fetch(self) -> bool:
-        entries = []
-        for log_document in self._log_document.objects(timestamp__gt=self.timestamp, **self._search):
-            log_document: MongoengineLogDocument
-            for entry in log_document.entries:
-                entries.append(entry)
-            self.timestamp = log_document.timestamp
-        with self._lock:
+    def _fetch_buckets(self) -> bool:
+        # last_timestamp is compared with gte, entries pushed at the same time are not lost, the offsets prevent duplicates
+        queryset = self._log_document.objects(last_timestamp__gte=self.timestamp, **self._search).order_by("last_timestamp")
+        for bucket in queryset.as_pymongo().only("last_timestamp", "entry_count"):
+            offset = self._bucket_offsets.get(bucket["_id"])
+            first_sight = offset is None
+            if first_sight:
+                offset = 0
+            if offset >= bucket["entry_count"]:
+                continue
+            entries = self._log_document.objects(id=bucket["_id"]).fields(slice__entries=[offset, bucket["entry_count"] - offset]).as_pymongo().first()["entries"]
+            self._bucket_offsets[bucket["_id"]] = offset + len(entries)
+            if first_sight:
+                # the bucket may have been filled before, skip the entries older than the stream
+                begin = self.timestamp.timestamp()
+                entries = [entry for entry in entries if entry.get("timestamp", begin) >= begin]
             self._buffer.extend(entries)
-            return bool(self._buffer)
+            self._bucket_last_timestamps[bucket["_id"]] = timestamp = to_local(bucket["last_timestamp"])
+            self.timestamp = timestamp
+
+        # buckets older than the stream are not queried anymore
+        timestamp = self.timestamp
+        for bucket_id in [bucket_id for bucket_id, last_timestamp in self._bucket_last_timestamps.items() if last_timestamp < timestamp]:
+            del self._bucket_offsets[bucket_id], self._bucket_last_timestamps[bucket_id]
+        return bool(self._buffer)
+
+    def _fetch(self) -> bool:
+        if self._bucketed:
+            return self._fetch_buckets()
+        # timestamp is compared with gte, documents written in the same millisecond are not lost,
+        # the ids of the documents with the last timestamp prevent duplicates
+        ids = set()
+        boundary_ids = set(self._boundary_ids)
+        queryset = self._log_document.objects(timestamp__gte=self.timestamp, **self._search).order_by("timestamp")
+        for log_document in queryset.only("timestamp", "entries", "blob").as_pymongo():
+            ids.add(log_document["_id"])
+            if log_document["_id"] in self._boundary_ids:
+                continue
+            self._buffer.extend(_raw_entries(log_document))
+            timestamp = to_local(log_document["timestamp"])
+            if timestamp != self.timestamp:
+                boundary_ids = set()
+                self.timestamp = timestamp
+            boundary_ids.add(log_document["_id"])
+        self._boundary_ids = boundary_ids
+        self._fetched_ids = ids
+        return bool(self._buffer)
 
     def _stream(self):
-        with self._lock:
-            while self._buffer:
-                entry = self._buffer.pop(0)
-                self._to(entry)
+        while self._buffer:
+            self._to(self._buffer.popleft())
+
+    def _change_stream_pipeline(self) -> list[dict[str, Any]]:
+        match = {"operationType": "insert"}
+        for key, value in self._log_document.objects(**self._search)._query.items():
+            if key.startswith("$"):
+                raise ValueError(f"Top level operator '{key}' is not supported in change stream mode.")
+            match[f"fullDocument.{key}"] = value
+        return [{"$match": match},
+                {"$project": {"fullDocument._id": 1, "fullDocument.timestamp": 1, "fullDocument.entries": 1, "fullDocument.blob": 1}}]
+
+    def _watch(self):
+        return self._log_document._get_collection().watch(pipeline=self._change_stream_pipeline(),
+                                                          resume_after=self.resume_token,
+                                                          max_await_time_ms=max(int(self.stream_rate * 1000), 100))
+
+    def _stream_changes(self, change_stream, skip_ids: set) -> bool:
+        pushed = False
+        while True:
+            change = change_stream.try_next()
+            if change is None:
+                return pushed
+            with self._lock:
+                self._resume_token = change_stream.resume_token
+            log_document = change["fullDocument"]
+            if log_document["_id"] in skip_ids:
+                continue  # already fetched by the initial query
+            if log_document["timestamp"] is not None:
+                self.timestamp = to_local(log_document["timestamp"])
+            self._buffer.extend(_raw_entries(log_document))
+            pushed = True
+
+    def _run_change_stream(self):
+        change_stream = None
+        skip_ids = set()
+        while not self._stopper.is_set():
+            try:
+                if change_stream is None:
+                    change_stream = self._watch()
+                    if self.resume_token is None:
+                        # open the stream first, so no document is lost between the initial query and the stream
+                        self._fetch()
+                        skip_ids = self._fetched_ids
+                        self._stream()
+                self._stream_changes(change_stream, skip_ids)
+                self._stream()
+            except PyMongoError:
+                # reconnect and resume from the last resume token
+                if change_stream is not None:
+                    try:
+                        change_stream.close()
+                    except PyMongoError:
+                        ...
+                    change_stream = None
+                self._stopper.wait(self.stream_rate)
+        if change_stream is not None:
+            try:
+                self._stream_changes(change_stream, skip_ids)  # fetch the last entries
+            finally:
+                change_stream.close()
+            self._stream()
 
     def run(self):
+        if self._mode == "change_stream":
+            self._run_change_stream()
+            return
+
         while not self._stopper.is_set():
             self._fetch()
             self._stream()
@@ -105,6 +250,13 @@ class MongoengineLogStreamer(threading.Thread):
         self._stopper.set()
 
 
+def _raw_entries(log_document: dict) -> list[dict]:
+    # entries of a raw document, compressed entries are decoded
+    if log_document.get("blob") is not None:
+        return decode_log_entries(log_document["blob"])
+    return log_document.get("entries", [])
+
+
 def mongoengine_log_stream_print(entry: dict):
     if "message" in entry:
         print(entry["message"])
@@ -1,19 +1,32 @@
+from functools import wraps
+
+
 class PostInit:
-    def __new__(cls, *args, **kwargs):
-        # get __init__ method
-        __init__ = cls.__init__
+    """
+    Calls __post_init__ after the __init__ of the instantiated class has finished.
+
+    __init__ is wrapped once per class at class creation. Only the wrapper of the instantiated class calls __post_init__,
+    the wrappers of the base classes called by super().__init__ don't.
+    """
 
-        # wrap __init__ method
-        def post_init(self, *a, **kw):
-            __init__(self, *a, **kw)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
 
-            # check if __post_init__ method exists
-            if hasattr(self, "__post_init__"):
+        # wrap the own __init__ method or an inherited one which isn't wrapped yet, like object.__init__
+        __init__ = cls.__dict__.get("__init__", cls.__init__)
+        if "__init__" not in cls.__dict__ and getattr(__init__, "__post_init_wrapped__", False):
+            return
+
+        @wraps(__init__)
+        def post_init(self, *args, **kwargs):
+            __init__(self, *args, **kwargs)
+
+            # only the outermost __init__ calls __post_init__
+            if type(self).__init__ is post_init:
                 self.__post_init__()
 
+        post_init.__post_init_wrapped__ = True
         cls.__init__ = post_init
 
-        return super().__new__(cls)
-
     def __post_init__(self):
         ...
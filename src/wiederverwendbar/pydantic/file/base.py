@@ -1,15 +1,23 @@
+import hashlib
+import importlib.metadata
 import logging
+import marshal
 import os
+import pickle
+import stat
 import sys
+import threading
+import weakref
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from pathlib import Path
-from typing import Any, Literal, Union, Mapping
+from typing import Any, Callable, Literal, Optional, Union, Mapping
 
 from warnings import warn
 from typing_extensions import Self  # ToDo: Remove when Python 3.10 support is dropped
 
 from pydantic import BaseModel, PrivateAttr, ValidationError
+from wiederverwendbar import __version__ as wiederverwendbar_version
 from wiederverwendbar.pydantic.validation_error_make_pretty_lines import validation_error_make_pretty_lines
 from wiederverwendbar.warnings import FileNotFoundWarning
 
@@ -24,6 +32,50 @@ DEFAULT_FILE_DIR = Path(os.getcwd())
 FILE_MUST_EXIST_ANNOTATION = Union[bool, Literal["yes_print", "yes_raise", "no_print", "no_warn", "no_ignore"]]
 FILE_ON_ERROR_ANNOTATION = Literal["print", "raise"]
 FILE_SAVE_ON_LOAD_ANNOTATION = Literal["if_not_exist", "no"]
+FILE_RELOAD_CALLBACK_ANNOTATION = Callable[["BaseFile", dict[str, tuple[Any, Any]]], None]
+
+# (class, path) -> (file key, parse options, frozen parsed data)
+_load_cache: dict[tuple[type, Path], tuple[tuple, tuple, tuple[str, Any]]] = {}
+_load_cache_lock = threading.Lock()
+# reloads of all instances, a reload of the watcher and a manual reload don't interleave
+_reload_lock = threading.RLock()
+_SNAPSHOT_VERSION = 3
+_snapshot_fingerprints: dict[type, str] = {}
+
+
+def _package_version(distribution: str) -> str:
+    try:
+        return importlib.metadata.version(distribution)
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _render_option(option: Any) -> str:
+    # identify classes and functions by their name, the repr contains the memory address which changes every process
+    if isinstance(option, type) or callable(option) and hasattr(option, "__qualname__"):
+        rendered = f"{getattr(option, '__module__', None)}.{option.__qualname__}"
+        code = getattr(option, "__code__", None)
+        if code is not None:
+            rendered += f"@{code.co_filename}:{code.co_firstlineno}"
+        return rendered
+    if isinstance(option, (tuple, list)):
+        return f"({', '.join(_render_option(item) for item in option)})"
+    return repr(option)
+
+
+def _freeze_data(data: dict[str, Any]) -> tuple[str, Any]:
+    # cached data must not be shared with the instances, marshal copies plain data much faster than deepcopy
+    try:
+        return "m", marshal.dumps(data)
+    except ValueError:
+        return "d", deepcopy(data)
+
+
+def _thaw_data(frozen: tuple[str, Any]) -> dict[str, Any]:
+    kind, value = frozen
+    if kind == "m":
+        return marshal.loads(value)
+    return deepcopy(value)
 
 
 class BaseFile(BaseModel, ABC):
@@ -49,6 +101,10 @@ class BaseFile(BaseModel, ABC):
         file_exclude_unset = False
         file_exclude_defaults = False
         file_exclude_none = False
+        file_cache = True
+        file_cache_hash = False
+        file_snapshot = False
+        file_snapshot_suffix = ".snapshot"
 
     class _InstanceConfig:
         """
@@ -76,6 +132,13 @@ class BaseFile(BaseModel, ABC):
             file_exclude_unset (bool): Whether to exclude unset fields when saving.
             file_exclude_defaults (bool): Whether to exclude fields with default values when saving.
             file_exclude_none (bool): Whether to exclude fields with None values when saving.
+            file_cache (bool): Whether to reuse a copy of the parsed content of an unchanged file, only validation runs again.
+                A file is unchanged if path, mtime, size and the options to parse it, like encoding, are equal.
+                A reload of an unchanged file returns early, unless fields were assigned since the last load.
+            file_cache_hash (bool): Whether a file is only unchanged if the SHA-256 hash of its content is equal too.
+            file_snapshot (bool): Whether to keep the parsed content in a sidecar file and use it instead of parsing the unchanged file in the next process.
+                The snapshot is only used for the same parsing code, parser versions and parse options. It may be pickled, so it must be as trusted as the file itself.
+            file_snapshot_suffix (str): Suffix appended to the file name for the snapshot.
         """
 
         file_dir: str | Path
@@ -99,6 +162,10 @@ class BaseFile(BaseModel, ABC):
         file_exclude_unset: bool
         file_exclude_defaults: bool
         file_exclude_none: bool
+        file_cache: bool
+        file_cache_hash: bool
+        file_snapshot: bool
+        file_snapshot_suffix: str
 
         def __init__(self,
                      cls: type["BaseFile"],
@@ -162,12 +229,22 @@ class BaseFile(BaseModel, ABC):
             return file_path.absolute()
 
     _config: dict[str, Any] = PrivateAttr(default_factory=dict)
+    _reload_callbacks: list[FILE_RELOAD_CALLBACK_ANNOTATION] = PrivateAttr(default_factory=list)
+    _watcher: Optional[threading.Thread] = PrivateAttr(default=None)
+    _watcher_stop: Optional[threading.Event] = PrivateAttr(default=None)
+    _loaded_state: Optional[tuple] = PrivateAttr(default=None)
 
     @property
     def config(self) -> _InstanceConfig:
         return self._InstanceConfig(cls=self.__class__,
                                     instance_config=self._config)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        # changed in memory, the next reload reads the file again
+        if not name.startswith("_"):
+            self._loaded_state = None
+        super().__setattr__(name, value)
+
     @classmethod
     def _create(cls, data: dict[str, Any], config: _InstanceConfig, error_message: str) -> Self:
         try:
@@ -228,8 +305,185 @@ class BaseFile(BaseModel, ABC):
     def _to_dict(cls, content: str, config: _InstanceConfig) -> dict:
         ...
 
+    @classmethod
+    def _parse_options(cls, config: _InstanceConfig) -> tuple:
+        # config which changes the parsed data of the same file, subclasses add their decode options
+        return config.file_encoding, config.file_newline
+
+    @classmethod
+    def _file_key(cls, config: _InstanceConfig) -> Optional[tuple]:
+        # identifies the file content, None if the file doesn't exist
+        try:
+            file_stat = config.file_path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        key = (file_stat.st_mtime_ns, file_stat.st_size)
+        if config.file_cache_hash:
+            key += (hashlib.sha256(config.file_path.read_bytes()).hexdigest(),)
+        return key
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        Remove the cached file contents of this class and its subclasses.
+
+        :return: None
+        """
+
+        with _load_cache_lock:
+            for key in [key for key in _load_cache if issubclass(key[0], cls)]:
+                del _load_cache[key]
+
+    @classmethod
+    def _state_key(cls, config: _InstanceConfig) -> Optional[tuple]:
+        # identifies the loaded values, None if they can't be reused
+        if not config.file_cache:
+            return None
+        file_key = cls._file_key(config=config)
+        if file_key is None:
+            return None
+        return config.file_path, file_key, cls._parse_options(config=config), deepcopy(config.file_overwrite)
+
+    @classmethod
+    def _get_cached(cls, config: _InstanceConfig, file_key: tuple) -> Optional[dict[str, Any]]:
+        with _load_cache_lock:
+            cached = _load_cache.get((cls, config.file_path))
+        if cached is None or cached[0] != file_key or cached[1] != cls._parse_options(config=config):
+            return None
+        return _thaw_data(cached[2])
+
+    @classmethod
+    def _set_cached(cls, config: _InstanceConfig, file_key: tuple, data: dict[str, Any]) -> None:
+        frozen = _freeze_data(data)
+        with _load_cache_lock:
+            _load_cache[(cls, config.file_path)] = (file_key, cls._parse_options(config=config), frozen)
+
+    @classmethod
+    def _snapshot_path(cls, config: _InstanceConfig) -> Path:
+        file_path = config.file_path
+        return file_path.with_name(file_path.name + config.file_snapshot_suffix)
+
+    @classmethod
+    def _parser_packages(cls) -> tuple[str, ...]:
+        # distributions the subclass parses with, the standard library is covered by the python version
+        return ()
+
+    @classmethod
+    def _snapshot_fingerprint(cls) -> str:
+        # a snapshot is only valid for the same parsing code and versions, the parse options are checked per snapshot
+        fingerprint = _snapshot_fingerprints.get(cls)
+        if fingerprint is None:
+            digest = hashlib.sha256(f"{_SNAPSHOT_VERSION}:{cls.__module__}.{cls.__qualname__}:{sys.version}:{wiederverwendbar_version}".encode())
+            for distribution in cls._parser_packages():
+                digest.update(f":{distribution}={_package_version(distribution)}".encode())
+            for name in sorted(dir(cls)):
+                if name not in ("_read_file", "_parse") and not name.startswith("_to_dict"):
+                    continue
+                method = getattr(cls, name)
+                code = getattr(getattr(method, "__func__", method), "__code__", None)
+                if code is not None:
+                    digest.update(name.encode() + marshal.dumps(code))
+            fingerprint = digest.hexdigest()
+            _snapshot_fingerprints[cls] = fingerprint
+        return fingerprint
+
+    @classmethod
+    def _read_snapshot(cls, config: _InstanceConfig, file_key: tuple) -> Optional[dict[str, Any]]:
+        snapshot_path = cls._snapshot_path(config)
+        try:
+            with snapshot_path.open(mode="rb") as file:
+                header = file.read(1)
+                if header == b"m":
+                    snapshot = marshal.load(file)
+                elif header == b"p":
+                    snapshot = pickle.load(file)
+                else:
+                    return None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable snapshot '{snapshot_path}': {e}")
+            return None
+        if (not isinstance(snapshot, dict)
+                or snapshot.get("fingerprint") != cls._snapshot_fingerprint()
+                or snapshot.get("file_key") != list(file_key)
+                or snapshot.get("options") != _render_option(cls._parse_options(config=config))):
+            logger.debug(f"Ignoring outdated snapshot '{snapshot_path}'.")
+            return None
+        return snapshot["data"]
+
+    @classmethod
+    def _write_snapshot(cls, config: _InstanceConfig, file_key: tuple, data: dict[str, Any]) -> None:
+        snapshot_path = cls._snapshot_path(config)
+        snapshot = {"fingerprint": cls._snapshot_fingerprint(),
+                    "file_key": list(file_key),
+                    "options": _render_option(cls._parse_options(config=config)),
+                    "data": data}
+        # marshal is faster and can't run code on load, pickle only for other types, like datetime from YAML
+        try:
+            content = b"m" + marshal.dumps(snapshot)
+        except ValueError:
+            try:
+                content = b"p" + pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                logger.debug(f"Can't write snapshot '{snapshot_path}': {e}")
+                return
+        # write atomically, a concurrent load reads the old or the new snapshot
+        temp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            temp_path.write_bytes(content)
+            os.replace(temp_path, snapshot_path)
+        except OSError as e:
+            logger.debug(f"Can't write snapshot '{snapshot_path}': {e}")
+            temp_path.unlink(missing_ok=True)
+
+    def delete_snapshot(self, **extra_config: Any) -> None:
+        """
+        Delete the snapshot of the file if it exists.
+
+        :param extra_config: Instance config to override.
+        :return: None
+        """
+
+        config = self._InstanceConfig(cls=self.__class__, instance_config={**self._config, **extra_config})
+        self._snapshot_path(config).unlink(missing_ok=True)
+
     @classmethod
     def _load(cls, config: _InstanceConfig) -> dict[str, Any]:
+        # stat before reading, a change while reading makes the next key differ
+        file_key = cls._file_key(config=config) if config.file_cache or config.file_snapshot else None
+        data = None
+        if file_key is not None and config.file_cache:
+            data = cls._get_cached(config=config, file_key=file_key)
+            if data is not None:
+                logger.debug(f"Using cached content of {config}.")
+        if data is None and file_key is not None and config.file_snapshot:
+            data = cls._read_snapshot(config=config, file_key=file_key)
+            if data is not None:
+                logger.debug(f"Using snapshot of {config}.")
+                if config.file_cache:
+                    cls._set_cached(config=config, file_key=file_key, data=data)
+
+        # read and parse file
+        if data is None:
+            data = cls._parse(config=config)
+            if file_key is not None:
+                if config.file_cache:
+                    cls._set_cached(config=config, file_key=file_key, data=data)
+                if config.file_snapshot:
+                    cls._write_snapshot(config=config, file_key=file_key, data=data)
+
+        # overwrite data, the data is a copy of the cached data, validating it again is cheaper than copying a cached instance
+        if config.file_overwrite is not None:
+            for key, value in config.file_overwrite.items():
+                data[key] = value
+
+        return data
+
+    @classmethod
+    def _parse(cls, config: _InstanceConfig) -> dict[str, Any]:
         # read file
         logger.debug(f"Reading {config} ...")
         try:
@@ -272,11 +526,6 @@ class BaseFile(BaseModel, ABC):
             logger.debug(f"No content in {config} ...")
             data = {}
 
-        # overwrite data
-        if config.file_overwrite is not None:
-            for key, value in config.file_overwrite.items():
-                data[key] = value
-
         return data
 
     @classmethod
@@ -286,7 +535,8 @@ class BaseFile(BaseModel, ABC):
 
         logger.debug(f"Loading {config} ...")
 
-        # call internal load method
+        # call internal load method, the state is taken before, a change while loading makes the next state differ
+        state = cls._state_key(config=config)
         data = cls._load(config=config)
 
         # validate and create instance
@@ -294,6 +544,7 @@ class BaseFile(BaseModel, ABC):
 
         # set instance config
         instance._config = instance_config
+        instance._loaded_state = state
 
         logger.debug(f"Loading {config} ... Done")
 
@@ -315,20 +566,132 @@ class BaseFile(BaseModel, ABC):
             extra_config[key] = value
         config = self._InstanceConfig(cls=self.__class__, instance_config=extra_config)
 
-        logger.debug(f"Reloading {config} ...")
+        with _reload_lock:
+            # unchanged file, keep the current values
+            state = self._state_key(config=config)
+            if state is not None and state == self._loaded_state:
+                logger.debug(f"Reloading {config} ... Unchanged")
+                return
+
+            logger.debug(f"Reloading {config} ...")
+
+            # call internal load method
+            data = self._load(config=config)
+
+            # validate and create temporary instance
+            instance = self._create(data=data, config=config, error_message=f"Reloading error in {config}")
+
+            # update self in one step, other threads see the old or the new values
+            changed = {}
+            values = dict(self.__dict__)
+            for field_name in self.__class__.model_fields.keys():
+                old_value = values[field_name]
+                value = instance.__dict__[field_name]
+                if old_value != value:
+                    changed[field_name] = (old_value, value)
+                    values[field_name] = value
+            if changed:
+                object.__setattr__(self, "__dict__", values)
+            object.__setattr__(self, "__pydantic_fields_set__", set(instance.__pydantic_fields_set__))
+            self._loaded_state = state
+
+            logger.debug(f"Reloading {config} ... Done")
+
+            # notify callbacks
+            if changed:
+                for callback in list(self._reload_callbacks):
+                    try:
+                        callback(self, changed)
+                    except Exception as e:
+                        logger.exception(f"Reload callback of {config} failed: {e}")
+
+    def add_reload_callback(self, callback: FILE_RELOAD_CALLBACK_ANNOTATION) -> None:
+        """
+        Add a callback which is called after a reload changed fields.
 
-        # call internal load method
-        data = self._load(config=config)
+        :param callback: Callable with the instance and a dict of the changed fields to (old value, new value).
+        :return: None
+        """
 
-        # validate and create temporary instance
-        instance = self._create(data=data, config=config, error_message=f"Reloading error in {config}")
+        self._reload_callbacks.append(callback)
 
-        # update self
-        for field_name in self.__class__.model_fields.keys():
-            value = getattr(instance, field_name)
-            setattr(self, field_name, value)
+    def remove_reload_callback(self, callback: FILE_RELOAD_CALLBACK_ANNOTATION) -> None:
+        """
+        Remove a reload callback.
+
+        :param callback: Callable added with add_reload_callback.
+        :return: None
+        """
 
-        logger.debug(f"Reloading {config} ... Done")
+        self._reload_callbacks.remove(callback)
+
+    @property
+    def watching(self) -> bool:
+        return self._watcher is not None and self._watcher.is_alive()
+
+    def watch(self, interval: float = 1.0) -> None:
+        """
+        Start a background thread which reloads the file if it changed. The reload callbacks get the changed fields.
+        Errors while reloading are logged and the current values are kept.
+
+        :param interval: Seconds between checks of the file.
+        :return: None
+        """
+
+        if self.watching:
+            raise RuntimeError(f"{self.config} is already watched.")
+        stop = threading.Event()
+        self._watcher_stop = stop
+        self._watcher = threading.Thread(name=f"{self.__class__.__name__}-watcher",
+                                         target=self._watch,
+                                         args=(weakref.ref(self), stop, interval),
+                                         daemon=True)
+        self._watcher.start()
+
+    def unwatch(self) -> None:
+        """
+        Stop the background thread started by watch.
+
+        :return: None
+        """
+
+        if not self.watching:
+            return
+        self._watcher_stop.set()
+        if self._watcher is not threading.current_thread():
+            self._watcher.join()
+        self._watcher = None
+        self._watcher_stop = None
+
+    @staticmethod
+    def _watch(ref: "weakref.ReferenceType[BaseFile]", stop: threading.Event, interval: float) -> None:
+        # only a weak reference, so a forgotten instance can be collected and the thread ends
+        def get_stat(instance: BaseFile) -> Optional[tuple[int, int]]:
+            try:
+                file_stat = instance.config.file_path.stat()
+            except OSError:
+                return None
+            return file_stat.st_mtime_ns, file_stat.st_size
+
+        instance = ref()
+        if instance is None:
+            return
+        last_stat = get_stat(instance)
+        del instance
+        while not stop.wait(interval):
+            instance = ref()
+            if instance is None:
+                return
+            current_stat = get_stat(instance)
+            if current_stat is not None and current_stat != last_stat:
+                last_stat = current_stat
+                try:
+                    instance.reload(file_on_reading_error="raise",
+                                    file_on_to_dict_error="raise",
+                                    file_on_validation_error="raise")
+                except Exception as e:
+                    logger.error(f"Watching {instance.config} failed to reload: {e}")
+            del instance
 
     @abstractmethod
     def _from_dict(self, data: dict[str, Any], config: _InstanceConfig) -> str:
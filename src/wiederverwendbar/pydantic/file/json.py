@@ -65,6 +65,15 @@ class JsonFile(BaseFile):
     def config(self) -> _InstanceConfig:
         return super().config
 
+    @classmethod
+    def _parse_options(cls, config: _InstanceConfig) -> tuple:
+        return super()._parse_options(config=config) + (config.file_json_decoder_cls,
+                                                         config.file_json_decode_object_hook,
+                                                         config.file_json_decode_parse_float,
+                                                         config.file_json_decode_parse_int,
+                                                         config.file_json_decode_parse_constant,
+                                                         config.file_json_decode_object_pairs_hook)
+
     @classmethod
     def _to_dict(cls, content: str, config: _InstanceConfig) -> dict:
         data = json.loads(content,
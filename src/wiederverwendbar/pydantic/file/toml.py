@@ -35,6 +35,14 @@ class TomlFile(BaseFile):
     def config(self) -> _InstanceConfig:
         return super().config
 
+    @classmethod
+    def _parser_packages(cls) -> tuple[str, ...]:
+        return () if loads.__module__ == "tomllib" else ("pip",)
+
+    @classmethod
+    def _parse_options(cls, config: _InstanceConfig) -> tuple:
+        return super()._parse_options(config=config) + (config.file_toml_decode_parse_float,)
+
     @classmethod
     def _to_dict(cls, content: str, config: _InstanceConfig) -> dict:
         data = loads(content,
@@ -61,6 +61,14 @@ class XmlFile(BaseFile):
                 value = value["type"](value["item"])
         return key, value
 
+    @classmethod
+    def _parser_packages(cls) -> tuple[str, ...]:
+        return ("xmltodict",)
+
+    @classmethod
+    def _parse_options(cls, config: _InstanceConfig) -> tuple:
+        return super()._parse_options(config=config) + (config.file_xml_root, config.file_xml_custom_root)
+
     @classmethod
     def _to_dict(cls, content: str, config: _InstanceConfig) -> dict:
         data = parse(content, postprocessor=cls._to_dict_postprocessor)
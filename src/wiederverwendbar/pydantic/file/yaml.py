@@ -68,6 +68,14 @@ class YamlFile(BaseFile):
     def config(self) -> _InstanceConfig:
         return super().config
 
+    @classmethod
+    def _parser_packages(cls) -> tuple[str, ...]:
+        return ("PyYAML",)
+
+    @classmethod
+    def _parse_options(cls, config: _InstanceConfig) -> tuple:
+        return super()._parse_options(config=config) + (config.file_yaml_encode_loader,)
+
     @classmethod
     def _to_dict(cls, content: str, config: _InstanceConfig) -> dict:
         data = load(stream=content, Loader=config.file_yaml_encode_loader)
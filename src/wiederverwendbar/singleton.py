@@ -1,7 +1,8 @@
 import atexit
 import logging
+import threading
 from abc import ABCMeta
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
 from wiederverwendbar.functions.find_class_method import find_class_method
 
@@ -11,12 +12,23 @@ logger = logging.getLogger(__name__)
 class Singleton(ABCMeta):
     """
     Singleton metaclass
+
+    The registry keeps indexes by name, order and looked up type, so lookups don't scan or sort the map.
+    Initialization and deletion are synchronized with one reentrant lock.
+    An instance is published after its __init__ finished, lookups of other threads wait for it.
+    Lazy singletons register a factory, which is called on the first access.
     """
 
     singleton_map: dict[str, Any] = {}
     singleton_order: dict[str, int] = {}
     delete_all_on_exit = True
     delete_ordered_on_exit = True
+    _lock = threading.RLock()
+    _order_index: dict[int, str] = {}
+    _type_index: dict[Union[type, str], str] = {}
+    _ordered_map: Optional[dict[str, Any]] = None
+    _lazy_factories: dict[str, tuple[Optional[type], Callable[[], Any]]] = {}
+    _initializing: dict[str, Any] = {}
 
     def __new__(cls, name, bases, attrs, order: Optional[int] = None):
         # get __init__ method
@@ -26,20 +38,29 @@ class Singleton(ABCMeta):
 
         # wrap __init__ method
         def singleton__init__(self, *args, **kwargs):
-            _order = order
-            if _order is None:
-                _order = Singleton.get_next_order()
             self_name = self.__class__.__name__
-            if _order in Singleton.singleton_order.values():
-                raise RuntimeError(f"Singleton order {_order} already initialized. Use {self_name}() to get the instance.")
-            if self_name not in Singleton.singleton_map:
-                Singleton.singleton_map[self_name] = self
-                Singleton.singleton_order[self_name] = _order
+            with Singleton._lock:
+                _order = order
+                if _order is None:
+                    _order = Singleton.get_next_order()
+                if _order in Singleton._order_index:
+                    raise RuntimeError(f"Singleton order {_order} already initialized. Use {self_name}() to get the instance.")
+                if self_name in Singleton.singleton_map or self_name in Singleton._initializing:
+                    raise RuntimeError(f"Singleton {self_name} already initialized. Use {self_name}() to get the instance.")
+                # reserve name and order, the lock is held until __init__ finished, so only this thread sees the instance
+                Singleton._initializing[self_name] = self
+                Singleton._order_index[_order] = self_name
+                try:
+                    if __init__ is not None:
+                        __init__(self, *args, **kwargs)
+                except BaseException:
+                    del Singleton._initializing[self_name]
+                    if Singleton._order_index.get(_order) == self_name:
+                        del Singleton._order_index[_order]
+                    raise
+                del Singleton._initializing[self_name]
+                Singleton._register(self_name, self, _order)
                 logger.debug(f"Singleton '{self_name}' with order {_order} initialized.")
-                if __init__ is not None:
-                    __init__(self, *args, **kwargs)
-            else:
-                raise RuntimeError(f"Singleton {self_name} already initialized. Use {self_name}() to get the instance.")
 
         attrs["__singleton__"] = True
 
@@ -57,15 +78,96 @@ class Singleton(ABCMeta):
 
     def __call__(cls, *args, init: bool = False, **kwargs):
         if init:
-            if cls.__name__ not in Singleton.singleton_map:
+            with Singleton._lock:
+                if cls.__name__ in Singleton.singleton_map:
+                    raise RuntimeError(f"Singleton {cls.__name__} already initialized. Use {cls.__name__}() to get the instance.")
                 return super().__call__(*args, **kwargs)
-            else:
-                raise RuntimeError(f"Singleton {cls.__name__} already initialized. Use {cls.__name__}() to get the instance.")
-        else:
-            if cls.__name__ in Singleton.singleton_map:
-                return cls.get_by_name(cls.__name__)
-            else:
+        instance = Singleton.singleton_map.get(cls.__name__)
+        if instance is None:
+            instance = Singleton._init_lazy(cls.__name__)
+            if instance is None:
                 raise RuntimeError(f"Singleton {cls.__name__} not initialized. Call {cls.__name__}(init=True) first.")
+        return instance
+
+    def init_lazy(cls, *args, **kwargs) -> None:
+        """
+        Initialize the singleton with these arguments on the first access.
+
+        :param args: Arguments of the singleton.
+        :param kwargs: Keyword arguments of the singleton.
+        :return: None
+        """
+
+        Singleton.register_lazy(cls, lambda: cls(*args, init=True, **kwargs))
+
+    @classmethod
+    def _register(cls, name: str, instance: Any, order: int) -> None:
+        Singleton.singleton_map[name] = instance
+        Singleton.singleton_order[name] = order
+        Singleton._order_index[order] = name
+        Singleton._invalidate()
+
+    @classmethod
+    def _unregister(cls, name: str) -> None:
+        del Singleton.singleton_map[name]
+        order = Singleton.singleton_order.pop(name, None)
+        if Singleton._order_index.get(order) == name:
+            del Singleton._order_index[order]
+        Singleton._invalidate()
+
+    @classmethod
+    def _invalidate(cls) -> None:
+        Singleton._type_index.clear()
+        Singleton._ordered_map = None
+
+    @classmethod
+    def _init_lazy(cls, name: str) -> Any:
+        # the lock waits for an __init__ of another thread
+        with Singleton._lock:
+            # another thread may have initialized it meanwhile
+            instance = Singleton.singleton_map.get(name)
+            if instance is not None:
+                return instance
+            # looked up by its own __init__
+            instance = Singleton._initializing.get(name)
+            if instance is not None:
+                return instance
+            lazy = Singleton._lazy_factories.pop(name, None)
+            if lazy is None:
+                return None
+            logger.debug(f"Initialize lazy singleton '{name}'.")
+            try:
+                lazy[1]()
+            except BaseException:
+                # try again on the next access
+                Singleton._lazy_factories.setdefault(name, lazy)
+                raise
+            instance = Singleton.singleton_map.get(name)
+            if instance is None:
+                raise RuntimeError(f"Lazy factory of singleton {name} didn't initialize it.")
+            return instance
+
+    @classmethod
+    def register_lazy(cls, t: Union[type, str], factory: Callable[[], Any]) -> None:
+        """
+        Register a factory, which initializes the singleton on the first access.
+
+        :param t: Type or name of singleton
+        :param factory: Callable which initializes the singleton, for example lambda: MySingleton(init=True)
+        :return: None
+        """
+
+        if isinstance(t, str):
+            name, singleton_type = t, None
+        elif isinstance(t, type):
+            name, singleton_type = t.__name__, t
+        else:
+            raise TypeError(f"Type of 't' must be 'str' or 'type', not '{type(t)}'.")
+        with Singleton._lock:
+            if name in Singleton.singleton_map:
+                raise RuntimeError(f"Singleton {name} already initialized.")
+            Singleton._lazy_factories[name] = (singleton_type, factory)
+        logger.debug(f"Lazy singleton '{name}' registered.")
 
     @classmethod
     def get_all(cls, ordered: bool = True) -> dict[str, Any]:
@@ -77,7 +179,12 @@ class Singleton(ABCMeta):
         """
 
         if ordered:
-            singleton_map = {k: v for k, v in sorted(cls.singleton_map.items(), key=lambda item: cls.singleton_order[item[0]])}
+            ordered_map = Singleton._ordered_map
+            if ordered_map is None:
+                with Singleton._lock:
+                    ordered_map = {k: v for k, v in sorted(Singleton.singleton_map.items(), key=lambda item: Singleton.singleton_order[item[0]])}
+                    Singleton._ordered_map = ordered_map
+            singleton_map = dict(ordered_map)
         else:
             singleton_map = cls.singleton_map
 
@@ -92,9 +199,11 @@ class Singleton(ABCMeta):
         :return: SingletonInstance
         """
 
-        current = cls.get_all().get(name, None)
+        current = Singleton.singleton_map.get(name)
         if current is None:
-            raise RuntimeError(f"Singleton {name} not found.")
+            current = Singleton._init_lazy(name)
+            if current is None:
+                raise RuntimeError(f"Singleton {name} not found.")
         return current
 
     @classmethod
@@ -112,16 +221,42 @@ class Singleton(ABCMeta):
             searching_name = t.__name__
         else:
             raise TypeError(f"Type of 't' must be 'str' or 'type', not '{type(t)}'.")
+
+        # indexed result of an earlier search
+        name = Singleton._type_index.get(t)
+        if name is not None:
+            current = Singleton.singleton_map.get(name)
+            if current is not None:
+                return current
+
         for name, instance in cls.get_all().items():
+            found = False
             if isinstance(t, str):
                 # get all bases
                 bases = instance.__class__.__bases__
                 for base in bases:
                     if base.__name__ == searching_name:
-                        return instance
+                        found = True
+                        break
             elif isinstance(t, type):
                 if isinstance(instance, t):
-                    return instance
+                    found = True
+            if found:
+                Singleton._type_index[t] = name
+                return instance
+
+        # initialize a matching lazy singleton
+        for name, (singleton_type, _) in list(Singleton._lazy_factories.items()):
+            if singleton_type is None:
+                continue
+            if isinstance(t, str):
+                found = any(base.__name__ == searching_name for base in singleton_type.__bases__)
+            else:
+                found = issubclass(singleton_type, t)
+            if found:
+                current = Singleton._init_lazy(name)
+                if current is not None:
+                    return current
         raise RuntimeError(f"Singleton {searching_name} not found.")
 
     @classmethod
@@ -133,10 +268,10 @@ class Singleton(ABCMeta):
         :return: SingletonInstance
         """
 
-        for name, _order in cls.singleton_order.items():
-            if _order == order:
-                return cls.get_by_name(name)
-        raise RuntimeError(f"Singleton order {order} not found.")
+        name = Singleton._order_index.get(order)
+        if name is None:
+            raise RuntimeError(f"Singleton order {order} not found.")
+        return cls.get_by_name(name)
 
     @classmethod
     def get_next_order(cls) -> int:
@@ -146,10 +281,10 @@ class Singleton(ABCMeta):
         :return: Next order
         """
 
-        if len(cls.singleton_order) == 0:
+        if len(Singleton._order_index) == 0:
             return 1
         else:
-            return max(cls.singleton_order.values()) + 1
+            return max(Singleton._order_index) + 1
 
     @classmethod
     def delete_all(cls, ordered: Optional[bool] = None):
@@ -161,10 +296,11 @@ class Singleton(ABCMeta):
         if ordered is None:
             ordered = cls.delete_ordered_on_exit
 
-        singleton_names = list(cls.get_all(ordered=ordered).keys())
-        singleton_names.reverse()
-        for name in singleton_names:
-            cls.delete_by_name(name)
+        with Singleton._lock:
+            singleton_names = list(cls.get_all(ordered=ordered).keys())
+            singleton_names.reverse()
+            for name in singleton_names:
+                cls.delete_by_name(name)
 
     @classmethod
     def delete_by_name(cls, name: str):
@@ -174,11 +310,11 @@ class Singleton(ABCMeta):
         :param name: Name of singleton
         """
 
-        current = cls.get_all().get(name, None)
-        if current is None:
-            raise RuntimeError(f"Singleton {name} not found.")
-        logger.debug(f"Singleton '{name}' deleted.")
-        del cls.singleton_map[name]
+        with Singleton._lock:
+            if name not in Singleton.singleton_map:
+                raise RuntimeError(f"Singleton {name} not found.")
+            logger.debug(f"Singleton '{name}' deleted.")
+            Singleton._unregister(name)
 
     @classmethod
     def delete_by_type(cls, t: Union[type, str]):
@@ -188,11 +324,12 @@ class Singleton(ABCMeta):
         :param t: Type of singleton
         """
 
-        current = cls.get_by_type(t)
-        if current is None:
-            raise RuntimeError(f"Singleton {t} not found.")
-        logger.debug(f"Singleton '{current.__class__.__name__}' deleted.")
-        del cls.singleton_map[current.__class__.__name__]
+        with Singleton._lock:
+            current = cls.get_by_type(t)
+            if current is None:
+                raise RuntimeError(f"Singleton {t} not found.")
+            logger.debug(f"Singleton '{current.__class__.__name__}' deleted.")
+            Singleton._unregister(current.__class__.__name__)
 
     @classmethod
     def delete_by_order(cls, order: int):
@@ -202,11 +339,12 @@ class Singleton(ABCMeta):
         :param order: Order of singleton
         """
 
-        current = cls.get_by_order(order)
-        if current is None:
-            raise RuntimeError(f"Singleton order {order} not found.")
-        logger.debug(f"Singleton '{current.__class__.__name__}' deleted.")
-        del cls.singleton_map[current.__class__.__name__]
+        with Singleton._lock:
+            current = cls.get_by_order(order)
+            if current is None:
+                raise RuntimeError(f"Singleton order {order} not found.")
+            logger.debug(f"Singleton '{current.__class__.__name__}' deleted.")
+            Singleton._unregister(current.__class__.__name__)
 
 
 def _on_exit():